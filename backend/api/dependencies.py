@@ -8,12 +8,15 @@ from uuid import UUID
 from jose import JWTError, jwt
 from core.config import settings
 from db.supabase import supabase_client, supabase_admin_client
+from db.executor import run_blocking
 from db.repositories import (
     UserRepository,
     ContentRepository,
     JobRepository,
     OutputRepository,
-    AnalyticsRepository
+    AnalyticsRepository,
+    UsageRepository,
+    ImportRepository
 )
 from loguru import logger
 
@@ -49,7 +52,7 @@ async def get_current_user(
             raise credentials_exception
         
         # Get user from Supabase
-        response = supabase_client.auth.get_user(token)
+        response = await run_blocking(supabase_client.auth.get_user, token)
         if not response.user:
             raise credentials_exception
         
@@ -111,6 +114,16 @@ def get_analytics_repository() -> AnalyticsRepository:
     return AnalyticsRepository(supabase_admin_client)
 
 
+def get_usage_repository() -> UsageRepository:
+    """Get usage repository instance"""
+    return UsageRepository(supabase_admin_client)
+
+
+def get_import_repository() -> ImportRepository:
+    """Get import repository instance"""
+    return ImportRepository(supabase_admin_client)
+
+
 # Pagination helper
 
 class PaginationParams:
@@ -0,0 +1,85 @@
+"""
+ASGI middleware
+"""
+import json
+from typing import Iterable
+
+
+class BodyTooLargeError(Exception):
+    """Raised from receive() once a body passes the size limit"""
+
+
+class BodySizeLimitMiddleware:
+    """
+    Reject request bodies larger than max_bytes on the given path prefixes.
+    
+    A declared Content-Length over the limit is rejected before the body is
+    read; otherwise bytes are counted as they stream in and the request is
+    answered with 413 once the limit is passed, without buffering the rest.
+    """
+    
+    def __init__(self, app, max_bytes: int, paths: Iterable[str]):
+        self.app = app
+        self.max_bytes = max_bytes
+        self.paths = tuple(paths)
+    
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not scope["path"].startswith(self.paths):
+            await self.app(scope, receive, send)
+            return
+        
+        headers = dict(scope.get("headers") or [])
+        content_length = headers.get(b"content-length")
+        if content_length and content_length.isdigit() and int(content_length) > self.max_bytes:
+            await self._reject(send)
+            return
+        
+        received = 0
+        exceeded = False
+        response_started = False
+        
+        async def limited_receive():
+            nonlocal received, exceeded
+            message = await receive()
+            if message["type"] == "http.request":
+                received += len(message.get("body", b""))
+                if received > self.max_bytes:
+                    exceeded = True
+                    raise BodyTooLargeError()
+            return message
+        
+        async def guarded_send(message):
+            nonlocal response_started
+            # The app's own error response for the aborted body is replaced by a 413
+            if exceeded:
+                if not response_started:
+                    response_started = True
+                    await self._reject(send)
+                return
+            if message["type"] == "http.response.start":
+                response_started = True
+            await send(message)
+        
+        try:
+            await self.app(scope, limited_receive, guarded_send)
+        except Exception:
+            # Whatever the app raised while reading the aborted body
+            if not exceeded:
+                raise
+            if not response_started:
+                await self._reject(send)
+    
+    async def _reject(self, send):
+        body = json.dumps({
+            "detail": f"Request body too large. Max size: {self.max_bytes // (1024 * 1024)}MB"
+        }).encode()
+        await send({
+            "type": "http.response.start",
+            "status": 413,
+            "headers": [
+                (b"content-type", b"application/json"),
+                (b"content-length", str(len(body)).encode()),
+                (b"connection", b"close")
+            ]
+        })
+        await send({"type": "http.response.body", "body": body})
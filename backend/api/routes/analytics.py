@@ -1,19 +1,34 @@
 """
 Analytics endpoints
 """
+import asyncio
 from fastapi import APIRouter, Depends, HTTPException, status
 from uuid import UUID
+from datetime import datetime, timedelta
 from models.analytics import (
     UserAnalyticsSummary,
     OutputAnalyticsResponse,
-    AnalyticsUpdate
+    AnalyticsUpdate,
+    UsageSummaryResponse,
+    JobUsageResponse
+)
+from db.repositories import (
+    AnalyticsRepository,
+    OutputRepository,
+    UsageRepository,
+    JobRepository,
+    UserRepository
 )
-from db.repositories import AnalyticsRepository, OutputRepository
 from api.dependencies import (
     get_current_user,
     get_analytics_repository,
-    get_output_repository
+    get_output_repository,
+    get_usage_repository,
+    get_job_repository,
+    get_user_repository
 )
+from core.config import settings
+from services.llm import summarize_usage, group_usage, month_start
 from loguru import logger
 
 router = APIRouter()
@@ -113,3 +128,69 @@ async def update_output_analytics(
         "message": "Analytics updated successfully",
         "engagement_rate": analytics.get("engagement_rate")
     }
+
+
+@router.get("/usage", response_model=UsageSummaryResponse)
+async def get_usage_summary(
+    days: int = 30,
+    current_user: dict = Depends(get_current_user),
+    usage_repo: UsageRepository = Depends(get_usage_repository),
+    user_repo: UserRepository = Depends(get_user_repository)
+):
+    """Get user's LLM token usage by stage, model and job, with quota status"""
+    since = datetime.utcnow() - timedelta(days=max(1, min(days, 365)))
+    
+    # Summed in the database: raw rows would be truncated at PostgREST's max-rows
+    totals, by_stage, by_model, by_job, used, profile = await asyncio.gather(
+        usage_repo.get_totals(current_user["id"], since),
+        usage_repo.get_grouped_totals(current_user["id"], since, "stage"),
+        usage_repo.get_grouped_totals(current_user["id"], since, "model"),
+        usage_repo.get_grouped_totals(current_user["id"], since, "job_id", limit=10),
+        usage_repo.get_tokens_since(current_user["id"], month_start()),
+        user_repo.get_profile(current_user["id"])
+    )
+    top_jobs = [{"job_id": job_id, **job_totals} for job_id, job_totals in by_job.items()]
+    
+    tier = (profile or {}).get("subscription_tier") or "free"
+    quota = settings.token_quota(tier)
+    
+    return UsageSummaryResponse(
+        since=since,
+        totals=totals,
+        by_stage=by_stage,
+        by_model=by_model,
+        top_jobs=top_jobs,
+        quota={
+            "tier": tier,
+            "monthly_quota": quota or None,
+            "used_this_month": used,
+            "remaining": max(0, quota - used) if quota else None,
+            "enforced": settings.ENFORCE_TOKEN_QUOTAS
+        }
+    )
+
+
+@router.get("/usage/jobs/{job_id}", response_model=JobUsageResponse)
+async def get_job_usage(
+    job_id: UUID,
+    current_user: dict = Depends(get_current_user),
+    usage_repo: UsageRepository = Depends(get_usage_repository),
+    job_repo: JobRepository = Depends(get_job_repository)
+):
+    """Get LLM token usage for a job"""
+    job = await job_repo.get_by_id(job_id)
+    
+    if not job:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Job not found")
+    
+    if job["user_id"] != str(current_user["id"]):
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Access denied")
+    
+    records = await usage_repo.get_by_job(job_id)
+    
+    return JobUsageResponse(
+        job_id=job_id,
+        totals=summarize_usage(records),
+        by_stage=group_usage(records, "stage"),
+        calls=records
+    )
@@ -4,6 +4,7 @@ Authentication endpoints
 from fastapi import APIRouter, Depends, HTTPException, status
 from models.user import UserCreate, UserLogin, TokenResponse, UserResponse
 from db.supabase import supabase_client, supabase_admin_client
+from db.executor import execute, run_blocking
 from db.repositories import UserRepository
 from api.dependencies import get_user_repository, get_current_user
 from core.config import settings
@@ -22,7 +23,7 @@ async def register(
     """
     try:
         # Create user in Supabase Auth
-        response = supabase_client.auth.sign_up({
+        response = await run_blocking(supabase_client.auth.sign_up, {
             "email": user_data.email,
             "password": user_data.password,
             "options": {
@@ -41,11 +42,11 @@ async def register(
         
         # Create user profile using admin client to bypass RLS
         try:
-            supabase_admin_client.table("user_profiles").insert({
+            await execute(supabase_admin_client.table("user_profiles").insert({
                 "id": str(response.user.id),
                 "email": user_data.email,
                 "full_name": user_data.full_name
-            }).execute()
+            }))
             logger.info(f"User profile created for: {user_data.email}")
         except Exception as profile_error:
             logger.error(f"Failed to create user profile: {profile_error}")
@@ -98,7 +99,7 @@ async def login(user_data: UserLogin):
     Login user
     """
     try:
-        response = supabase_client.auth.sign_in_with_password({
+        response = await run_blocking(supabase_client.auth.sign_in_with_password, {
             "email": user_data.email,
             "password": user_data.password
         })
@@ -136,7 +137,7 @@ async def logout(current_user: dict = Depends(get_current_user)):
     Logout user
     """
     try:
-        supabase_client.auth.sign_out()
+        await run_blocking(supabase_client.auth.sign_out)
         logger.info(f"User logged out: {current_user['email']}")
         return {"message": "Successfully logged out"}
     except Exception as e:
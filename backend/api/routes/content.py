@@ -9,37 +9,80 @@ from models.content import (
     ContentListResponse,
     ContentTextCreate,
     ContentURLCreate,
+    ContentImportCreate,
+    ContentImportResponse,
     ContentUpdate
 )
-from db.repositories import ContentRepository, JobRepository
+from models.job import RegenerateMode
+from db.repositories import ContentRepository, JobRepository, ImportRepository
 from api.dependencies import (
     get_current_user,
     get_content_repository,
     get_job_repository,
+    get_import_repository,
     PaginationParams
 )
 from core.config import settings
+from services.dedup import compute_content_hash, split_sections
+from services.platforms import unsupported_platforms
+from services.simple_job_processor import simple_job_processor
 from loguru import logger
 
 router = APIRouter()
 
 
-@router.post("/upload", status_code=status.HTTP_201_CREATED)
+async def _previous_revision(
+    revision_of: Optional[UUID],
+    current_user: dict,
+    content_repo: ContentRepository
+) -> Optional[str]:
+    """Check that the content a submission revises exists and is the user's"""
+    if not revision_of:
+        return None
+    
+    previous = await content_repo.get_by_id(revision_of)
+    if not previous or previous.get("is_deleted") or previous["user_id"] != str(current_user["id"]):
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Previous revision not found"
+        )
+    return previous["id"]
+
+
+def _check_platforms(platforms: List[str]):
+    """Reject platforms with no registry entry before any work is queued for them"""
+    unsupported = unsupported_platforms(platforms)
+    if unsupported:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Unsupported platforms: {', '.join(unsupported)}"
+        )
+
+
+@router.post("/upload", status_code=status.HTTP_202_ACCEPTED)
 async def upload_content(
     file: UploadFile = File(...),
     title: Optional[str] = Form(None),
     platforms: str = Form(...),  # JSON string
     preferences: str = Form("{}"),  # JSON string
+    revision_of: Optional[UUID] = Form(None),
+    regenerate: RegenerateMode = Form(RegenerateMode.ALL),
     current_user: dict = Depends(get_current_user),
     content_repo: ContentRepository = Depends(get_content_repository),
     job_repo: JobRepository = Depends(get_job_repository)
 ):
     """
     Upload file for content repurposing
+    
+    The file is stored and the job queued; text extraction runs as the
+    job's first stage. Poll GET /jobs/{job_id} for progress.
     """
+    import asyncio
     import json
-    from services.extraction import extract_content_from_file
+    from services.extraction import raw_inputs, spool_upload, UploadTooLargeError
     
+    upload = None
+    raw_key = None
     try:
         # Validate file
         if not settings.is_allowed_extension(file.filename):
@@ -51,28 +94,36 @@ async def upload_content(
         # Parse JSON strings
         platforms_list = json.loads(platforms)
         preferences_dict = json.loads(preferences)
+        _check_platforms(platforms_list)
+        previous_revision_id = await _previous_revision(revision_of, current_user, content_repo)
         
-        # Read file
-        file_content = await file.read()
-        
-        if len(file_content) > settings.max_file_size_bytes:
+        # Stream the file to disk, enforcing the size limit as it is read
+        try:
+            upload = await spool_upload(file, settings.max_file_size_bytes, settings.UPLOAD_TMP_DIR)
+        except UploadTooLargeError:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail=f"File too large. Max size: {settings.MAX_FILE_SIZE_MB}MB"
             )
         
-        # Extract content
-        extracted = await extract_content_from_file(file_content, file.filename)
+        # Keep the raw file for the job's extraction stage
+        raw_key = raw_inputs.new_key(str(current_user["id"]), file.filename)
+        await asyncio.to_thread(raw_inputs.save, upload, raw_key)
         
-        # Create content record
+        # Create content record (text is filled in by the extraction stage)
         content = await content_repo.create({
             "user_id": str(current_user["id"]),
-            "title": title or extracted.get("title", file.filename),
-            "original_text": extracted["text"],
-            "source_type": extracted["source_type"],
-            "file_path": f"{current_user['id']}/{file.filename}",
-            "file_size_bytes": len(file_content),
-            "metadata": extracted.get("metadata", {})
+            "title": title or file.filename.rsplit('.', 1)[0] or file.filename,
+            "source_type": file.filename.rsplit('.', 1)[1].lower(),
+            "file_path": raw_key,
+            "file_size_bytes": upload.size,
+            "extraction_status": "pending",
+            "previous_revision_id": previous_revision_id,
+            "metadata": {
+                "filename": file.filename,
+                "sha256": upload.sha256,
+                "title_from_user": bool(title)
+            }
         })
         
         # Create job
@@ -81,6 +132,7 @@ async def upload_content(
             "user_id": str(current_user["id"]),
             "platforms": platforms_list,
             "user_preferences": preferences_dict,
+            "regenerate": regenerate.value,
             "status": "pending"
         })
         
@@ -90,15 +142,22 @@ async def upload_content(
             "content_id": content["id"],
             "job_id": job["id"],
             "status": "pending",
-            "message": "Content uploaded successfully. Processing started."
+            "message": "File received. Extraction and processing will run in the background."
         }
     
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Upload error: {e}")
+        if raw_key:
+            raw_inputs.delete(raw_key)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=str(e)
         )
+    finally:
+        if upload:
+            upload.cleanup()
 
 
 @router.post("/text", status_code=status.HTTP_201_CREATED)
@@ -111,12 +170,18 @@ async def create_text_content(
     """
     Submit text content directly
     """
+    _check_platforms(data.platforms)
+    previous_revision_id = await _previous_revision(data.revision_of, current_user, content_repo)
+    
     try:
         # Create content record
         content = await content_repo.create({
             "user_id": str(current_user["id"]),
             "title": data.title,
             "original_text": data.text,
+            "content_hash": compute_content_hash(data.text),
+            "sections": split_sections(data.text),
+            "previous_revision_id": previous_revision_id,
             "source_type": "text",
             "metadata": {
                 "word_count": len(data.text.split()),
@@ -130,11 +195,16 @@ async def create_text_content(
             "user_id": str(current_user["id"]),
             "platforms": data.platforms,
             "user_preferences": data.preferences,
+            "regenerate": data.regenerate.value,
             "status": "pending"
         })
         
         logger.info(f"Text content created: {content['id']}, Job created: {job['id']}")
         
+        # Analyze while the job waits for the processor to pick it up
+        if settings.SPECULATIVE_ANALYSIS:
+            simple_job_processor.start_speculative_analysis(content, job)
+        
         return {
             "content_id": content["id"],
             "job_id": job["id"],
@@ -149,7 +219,7 @@ async def create_text_content(
         )
 
 
-@router.post("/url", status_code=status.HTTP_201_CREATED)
+@router.post("/url", status_code=status.HTTP_202_ACCEPTED)
 async def create_url_content(
     data: ContentURLCreate,
     current_user: dict = Depends(get_current_user),
@@ -158,21 +228,28 @@ async def create_url_content(
 ):
     """
     Submit URL for content extraction
+    
+    The page is fetched and extracted as the job's first stage. Poll
+    GET /jobs/{job_id} for progress.
     """
-    from services.extraction import extract_content_from_url
+    if not data.url.lower().startswith(("http://", "https://")):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="URL must be http(s)"
+        )
+    _check_platforms(data.platforms)
+    previous_revision_id = await _previous_revision(data.revision_of, current_user, content_repo)
     
     try:
-        # Extract content from URL
-        extracted = await extract_content_from_url(data.url)
-        
-        # Create content record
+        # Create content record (text is filled in by the extraction stage)
         content = await content_repo.create({
             "user_id": str(current_user["id"]),
-            "title": data.title or extracted.get("title", "Untitled"),
-            "original_text": extracted["text"],
+            "title": data.title or data.url[:500],
             "source_type": "url",
             "source_url": data.url,
-            "metadata": extracted.get("metadata", {})
+            "extraction_status": "pending",
+            "previous_revision_id": previous_revision_id,
+            "metadata": {"title_from_user": bool(data.title)}
         })
         
         # Create job
@@ -181,6 +258,7 @@ async def create_url_content(
             "user_id": str(current_user["id"]),
             "platforms": data.platforms,
             "user_preferences": data.preferences,
+            "regenerate": data.regenerate.value,
             "status": "pending"
         })
         
@@ -200,6 +278,79 @@ async def create_url_content(
         )
 
 
+@router.post("/import", status_code=status.HTTP_202_ACCEPTED)
+async def import_content(
+    data: ContentImportCreate,
+    current_user: dict = Depends(get_current_user),
+    import_repo: ImportRepository = Depends(get_import_repository)
+):
+    """
+    Import every entry of a sitemap or RSS/Atom feed
+    
+    Entries are fetched and extracted in the background; poll
+    GET /content/import/{import_id} for progress.
+    """
+    from services.bulk_import import bulk_importer
+    
+    if not data.url.lower().startswith(("http://", "https://")):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Import URL must be http(s)"
+        )
+    _check_platforms(data.platforms)
+    
+    try:
+        record = await import_repo.create({
+            "user_id": str(current_user["id"]),
+            "source_url": data.url,
+            "status": "pending",
+            "platforms": data.platforms,
+            "user_preferences": data.preferences,
+            "max_entries": min(data.max_entries, settings.IMPORT_MAX_ENTRIES)
+        })
+    except Exception as e:
+        logger.error(f"Import creation error: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=str(e)
+        )
+    
+    bulk_importer.start(record)
+    logger.info(f"Import started: {record['id']} ({data.url})")
+    
+    return {
+        "import_id": record["id"],
+        "status": "pending",
+        "max_entries": record["max_entries"]
+    }
+
+
+@router.get("/import/{import_id}", response_model=ContentImportResponse)
+async def get_import(
+    import_id: UUID,
+    current_user: dict = Depends(get_current_user),
+    import_repo: ImportRepository = Depends(get_import_repository)
+):
+    """
+    Get bulk import status and progress
+    """
+    record = await import_repo.get_by_id(import_id)
+    
+    if not record:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Import not found"
+        )
+    
+    if record["user_id"] != str(current_user["id"]):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Access denied"
+        )
+    
+    return ContentImportResponse(**record)
+
+
 @router.get("/{content_id}", response_model=ContentResponse)
 async def get_content(
     content_id: UUID,
@@ -4,6 +4,7 @@ Health check endpoints
 from fastapi import APIRouter, Depends
 from core.config import settings
 from db.supabase import supabase_client
+from db.executor import execute, run_blocking
 from datetime import datetime
 from loguru import logger
 
@@ -38,7 +39,7 @@ async def detailed_health_check():
     
     # Check database
     try:
-        response = supabase_client.table("content").select("id").limit(1).execute()
+        response = await execute(supabase_client.table("content").select("id").limit(1))
         health_status["services"]["database"] = "healthy"
     except Exception as e:
         logger.error(f"Database health check failed: {e}")
@@ -47,7 +48,7 @@ async def detailed_health_check():
     
     # Check storage
     try:
-        buckets = supabase_client.storage.list_buckets()
+        buckets = await run_blocking(supabase_client.storage.list_buckets)
         health_status["services"]["storage"] = "healthy"
     except Exception as e:
         logger.error(f"Storage health check failed: {e}")
@@ -63,11 +64,19 @@ async def detailed_health_check():
         health_status["services"]["job_processor"] = "error"
         health_status["status"] = "degraded"
     
-    # Check Groq API (optional - don't fail if not available)
+    # Check Groq API via the LLM client's circuit breakers
     try:
-        from groq import Groq
-        client = Groq(api_key=settings.GROQ_API_KEY)
-        health_status["services"]["groq"] = "configured"
+        from services.llm import llm_client
+        circuits = llm_client.get_circuit_states()
+        routed_models = {settings.GROQ_MODEL, *settings.LLM_MODEL_ROUTES.values()}
+        all_closed = all(
+            circuits.get(model, {}).get("state", "closed") == "closed"
+            for model in routed_models
+        )
+        health_status["services"]["groq"] = "healthy" if all_closed else "degraded"
+        health_status["services"]["llm_circuits"] = circuits
+        if not all_closed:
+            health_status["status"] = "degraded"
     except Exception as e:
         logger.warning(f"Groq health check failed: {e}")
         health_status["services"]["groq"] = "unknown"
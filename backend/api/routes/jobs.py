@@ -71,7 +71,7 @@ async def cancel_job(
     if job["user_id"] != str(current_user["id"]):
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Access denied")
     
-    if job["status"] not in ["pending", "processing"]:
+    if job["status"] not in ["pending", "extracting", "processing"]:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Can only cancel pending or processing jobs"
@@ -99,7 +99,7 @@ async def delete_job(
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Access denied")
     
     # Only allow deletion of completed, failed, or cancelled jobs
-    if job["status"] in ["pending", "processing"]:
+    if job["status"] in ["pending", "extracting", "processing"]:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Cannot delete pending or processing jobs. Cancel them first."
@@ -0,0 +1,121 @@
+"""
+Throughput of batched vs per-job content analysis
+
+Runs `analyze_content` over many short texts against a simulated provider
+with a fixed per-request overhead, per-token costs and a provider-side
+concurrency cap, once per job and once with ANALYSIS_BATCHING enabled.
+
+Usage (from backend/, with the usual .env in place):
+    python -m benchmarks.bench_analysis_batching --docs 500
+"""
+import argparse
+import asyncio
+import json
+import re
+import time
+import types
+
+from core.config import settings
+from services.llm import llm_client
+from services.simple_job_processor import SimpleJobProcessor
+
+_DOCUMENT_RE = re.compile(r'<document id="(\d+)">')
+
+SAMPLE_TEXT = (
+    "Remote teams that write things down ship faster. We moved our weekly planning "
+    "to a shared document, asked every owner to post a short written update before "
+    "the meeting and cut the meeting itself to fifteen minutes of questions. "
+)
+
+
+class SimulatedProvider:
+    """Chat completions endpoint with request overhead and token costs"""
+    
+    def __init__(self, overhead_ms: float, prefill_ms_per_1k: float, decode_ms_per_token: float, concurrency: int):
+        self.overhead = overhead_ms / 1000
+        self.prefill_per_token = prefill_ms_per_1k / 1000 / 1000
+        self.decode_per_token = decode_ms_per_token / 1000
+        self.slots = asyncio.Semaphore(concurrency)
+        self.requests = 0
+    
+    async def create(self, model, messages, **kwargs):
+        prompt = messages[0]["content"]
+        ids = [int(i) for i in _DOCUMENT_RE.findall(prompt)]
+        analysis = {
+            "key_insights": ["Written updates", "Shorter meetings", "Clear owners"],
+            "tone": "professional",
+            "audience": "engineering managers",
+            "content_type": "case-study"
+        }
+        if ids:
+            text = json.dumps({"results": [{"id": i, **analysis} for i in ids]})
+        else:
+            text = json.dumps(analysis)
+        
+        prompt_tokens = len(prompt) // 4
+        completion_tokens = len(text) // 4
+        async with self.slots:
+            self.requests += 1
+            await asyncio.sleep(
+                self.overhead
+                + prompt_tokens * self.prefill_per_token
+                + completion_tokens * self.decode_per_token
+            )
+        
+        return types.SimpleNamespace(
+            choices=[types.SimpleNamespace(message=types.SimpleNamespace(content=text))],
+            usage=types.SimpleNamespace(prompt_tokens=prompt_tokens, completion_tokens=completion_tokens)
+        )
+
+
+async def run(docs: int, batching: bool, args) -> dict:
+    provider = SimulatedProvider(args.overhead_ms, args.prefill_ms, args.decode_ms, args.provider_concurrency)
+    llm_client.client = types.SimpleNamespace(chat=types.SimpleNamespace(completions=provider))
+    settings.ANALYSIS_BATCHING = batching
+    settings.ANALYSIS_BATCH_MAX_ITEMS = args.batch_size
+    settings.ANALYSIS_BATCH_MAX_WAIT_MS = args.wait_ms
+    processor = SimpleJobProcessor()
+    
+    # Distinct texts so single-flight can't collapse them
+    texts = [f"Document {i}. {SAMPLE_TEXT}" for i in range(docs)]
+    jobs = asyncio.Semaphore(args.jobs)
+    
+    async def analyze(text: str):
+        async with jobs:
+            return await processor.analyze_content(text)
+    
+    started = time.perf_counter()
+    results = await asyncio.gather(*(analyze(text) for text in texts))
+    elapsed = time.perf_counter() - started
+    
+    assert all(r["content_type"] == "case-study" for r in results)
+    return {
+        "mode": "batched" if batching else "per-job",
+        "docs": docs,
+        "seconds": round(elapsed, 2),
+        "docs_per_second": round(docs / elapsed, 1),
+        "upstream_requests": provider.requests
+    }
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--docs", type=int, default=200)
+    parser.add_argument("--jobs", type=int, default=32, help="concurrent jobs")
+    parser.add_argument("--batch-size", type=int, default=8)
+    parser.add_argument("--wait-ms", type=int, default=50)
+    parser.add_argument("--overhead-ms", type=float, default=250, help="fixed cost per request")
+    parser.add_argument("--prefill-ms", type=float, default=20, help="ms per 1k prompt tokens")
+    parser.add_argument("--decode-ms", type=float, default=2, help="ms per completion token")
+    parser.add_argument("--provider-concurrency", type=int, default=4)
+    args = parser.parse_args()
+    
+    baseline = await run(args.docs, False, args)
+    batched = await run(args.docs, True, args)
+    for result in (baseline, batched):
+        print(result)
+    print(f"speedup: {baseline['seconds'] / batched['seconds']:.2f}x")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,101 @@
+"""
+Concurrent repository calls: blocking execute() vs the DB thread pool
+
+Serves a fake PostgREST endpoint with a fixed per-request latency, points a
+real supabase-py client at it and runs many concurrent
+ContentRepository.get_by_id calls, once with execute() called on the event
+loop (the old behaviour) and once through the bounded DB thread pool. Also
+measures how late a 10ms ticker on the loop runs while the calls are in
+flight.
+
+Usage (from backend/, with the usual .env in place):
+    python -m benchmarks.bench_db_concurrency --calls 200 --latency-ms 50
+"""
+import argparse
+import asyncio
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from supabase import create_client
+
+from core.config import settings
+from db.executor import shutdown_db_executor
+from db.repositories import ContentRepository
+
+
+def serve(latency: float) -> ThreadingHTTPServer:
+    """PostgREST stand-in answering every GET with one row after `latency` seconds"""
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+        
+        def do_GET(self):
+            time.sleep(latency)
+            body = json.dumps([{"id": "00000000-0000-0000-0000-000000000000", "title": "bench"}]).encode()
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+        
+        def log_message(self, *args):
+            pass
+    
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+async def run(repo: ContentRepository, calls: int, blocking: bool) -> dict:
+    if blocking:
+        # What every repository method did before: execute() on the loop
+        async def direct(query):
+            return query.execute()
+        repo._execute = direct
+    
+    lags = []
+    done = asyncio.Event()
+    
+    async def ticker():
+        while not done.is_set():
+            started = time.perf_counter()
+            await asyncio.sleep(0.01)
+            lags.append(time.perf_counter() - started - 0.01)
+    
+    tick = asyncio.create_task(ticker())
+    started = time.perf_counter()
+    await asyncio.gather(*(repo.get_by_id("00000000-0000-0000-0000-000000000000") for _ in range(calls)))
+    elapsed = time.perf_counter() - started
+    done.set()
+    await tick
+    
+    return {
+        "mode": "blocking" if blocking else f"pool ({settings.DB_MAX_CONCURRENCY} threads)",
+        "calls": calls,
+        "seconds": round(elapsed, 3),
+        "calls_per_second": round(calls / elapsed, 1),
+        "max_loop_lag_ms": round(max(lags or [0]) * 1000, 1)
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--calls", type=int, default=200, help="concurrent get_by_id calls")
+    parser.add_argument("--latency-ms", type=float, default=50, help="simulated DB round trip")
+    args = parser.parse_args()
+    
+    server = serve(args.latency_ms / 1000)
+    url = f"http://127.0.0.1:{server.server_address[1]}"
+    client = create_client(url, settings.SUPABASE_SERVICE_KEY)
+    
+    for blocking in (True, False):
+        print(asyncio.run(run(ContentRepository(client), args.calls, blocking)))
+    
+    shutdown_db_executor()
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,108 @@
+"""
+BeautifulSoup vs lxml main-content extraction
+
+Times `parse_html` with HTML_PARSER=bs4 and HTML_PARSER=lxml over a corpus
+of saved pages (*.html in --corpus) or, without one, synthetic article
+pages wrapped in navigation, sidebars, comments and footers. Reports pages
+per second, peak Python heap during parsing and how much of the article
+text each path recovered (synthetic pages only).
+
+Usage (from backend/, with the usual .env in place):
+    python -m benchmarks.bench_html_extraction --corpus ~/saved-pages
+    python -m benchmarks.bench_html_extraction --pages 200
+"""
+import argparse
+import glob
+import os
+import time
+import tracemalloc
+from typing import List, Optional, Tuple
+
+from core.config import settings
+from services.extraction.webpage import parse_html
+
+ARTICLE_SENTENCES = [
+    "Teams that document decisions in writing spend less time re-litigating them later.",
+    "We replaced our weekly status meeting with a short written update, and the meeting shrank to fifteen minutes.",
+    "Owners post their update before Monday noon, so questions can be answered asynchronously.",
+    "The biggest change was cultural, not technical: people started reading before they talked.",
+]
+
+
+def synthetic_page(index: int, paragraphs: int = 40) -> Tuple[bytes, List[str]]:
+    """An article page with realistic boilerplate around it"""
+    article = [
+        f"{ARTICLE_SENTENCES[(index + i) % 4]} {ARTICLE_SENTENCES[(index + i + 1) % 4]} (part {i})"
+        for i in range(paragraphs)
+    ]
+    nav = "".join(f'<li><a href="/section/{i}">Section {i}</a></li>' for i in range(40))
+    sidebar = "".join(f'<div class="related-item"><a href="/post/{i}">Related post {i}</a></div>' for i in range(30))
+    comments = "".join(
+        f'<div class="comment"><p>Comment {i}: great read, thanks for sharing this with everyone.</p></div>'
+        for i in range(50)
+    )
+    scripts = "".join(f"<script>var tracking{i} = {{id: {i}, data: '{'x' * 200}'}};</script>" for i in range(20))
+    body = "".join(f"<p>{text}</p>" for text in article)
+    html = f"""<!doctype html><html><head><title>Post {index}</title>{scripts}
+        <style>body {{ font-family: sans-serif; }}</style></head>
+        <body><header><nav><ul>{nav}</ul></nav></header>
+        <div class="layout"><div class="main-column"><div class="post-body entry-content">
+        <h1>Post {index}</h1>{body}</div>
+        <div id="comments">{comments}</div></div>
+        <aside class="sidebar">{sidebar}</aside></div>
+        <footer><p>Copyright, privacy policy, terms of service, cookie settings.</p></footer>
+        </body></html>"""
+    return html.encode("utf-8"), article
+
+
+def run(parser: str, pages: List[Tuple[bytes, Optional[List[str]]]]) -> dict:
+    settings.HTML_PARSER = parser
+    recalls, noise = [], []
+    
+    tracemalloc.start()
+    started = time.perf_counter()
+    for body, expected in pages:
+        result = parse_html(body, None, "https://example.com/")
+        if expected:
+            text = result["text"]
+            recalls.append(sum(1 for paragraph in expected if paragraph in text) / len(expected))
+            noise.append(text.count("Comment ") + text.count("Related post"))
+    elapsed = time.perf_counter() - started
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    
+    stats = {
+        "parser": parser,
+        "pages": len(pages),
+        "pages_per_second": round(len(pages) / elapsed, 1),
+        "peak_python_heap_mb": round(peak / 1024 / 1024, 1)
+    }
+    if recalls:
+        stats["article_recall"] = round(sum(recalls) / len(recalls), 3)
+        stats["boilerplate_blocks_per_page"] = round(sum(noise) / len(noise), 1)
+    return stats
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--corpus", help="directory of saved .html pages")
+    parser.add_argument("--pages", type=int, default=200, help="synthetic pages when no corpus is given")
+    args = parser.parse_args()
+    
+    if args.corpus:
+        pages = []
+        for path in sorted(glob.glob(os.path.join(os.path.expanduser(args.corpus), "*.htm*"))):
+            with open(path, "rb") as f:
+                pages.append((f.read(), None))
+    else:
+        pages = [synthetic_page(i) for i in range(args.pages)]
+    
+    baseline = run("bs4", pages)
+    fast = run("lxml", pages)
+    for stats in (baseline, fast):
+        print(stats)
+    print(f"speedup: {fast['pages_per_second'] / baseline['pages_per_second']:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
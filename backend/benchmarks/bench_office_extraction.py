@@ -0,0 +1,122 @@
+"""
+python-docx/python-pptx vs streaming zip/iterparse extraction
+
+Generates a large DOCX (paragraphs, tables, a header) and a large PPTX
+(slides with tables and speaker notes), or uses the files given, and times
+the legacy object-model extractors against the streaming ones. Each run
+happens in a fresh child process so its peak RSS reflects only that
+extractor. Also reports whether table cells and notes made it into the text.
+
+Usage (from backend/, with the usual .env in place):
+    python -m benchmarks.bench_office_extraction
+    python -m benchmarks.bench_office_extraction --paragraphs 20000 --slides 500
+    python -m benchmarks.bench_office_extraction --docx big.docx --pptx deck.pptx
+"""
+import argparse
+import os
+import resource
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import get_context
+
+PARAGRAPH = "Quarterly planning went smoother once every team wrote its goals down before the kickoff meeting"
+
+
+def make_docx(path: str, paragraphs: int):
+    """A long report with a header and a table every 50 paragraphs"""
+    from docx import Document
+    
+    doc = Document()
+    doc.sections[0].header.paragraphs[0].text = "Confidential planning report"
+    for i in range(paragraphs):
+        doc.add_paragraph(f"{PARAGRAPH} (paragraph {i}).")
+        if i % 50 == 49:
+            table = doc.add_table(rows=4, cols=3)
+            for r, row in enumerate(table.rows):
+                for c, cell in enumerate(row.cells):
+                    cell.text = f"table-cell-{i}-{r}-{c}"
+    doc.save(path)
+
+
+def make_pptx(path: str, slides: int):
+    """A deck where every slide has a title, bullets, a small table and speaker notes"""
+    from pptx import Presentation
+    from pptx.util import Inches
+    
+    prs = Presentation()
+    for i in range(slides):
+        slide = prs.slides.add_slide(prs.slide_layouts[1])
+        slide.shapes.title.text = f"Slide {i}: planning"
+        slide.placeholders[1].text = "\n".join(f"{PARAGRAPH} ({i}.{b})" for b in range(5))
+        table = slide.shapes.add_table(3, 3, Inches(1), Inches(5), Inches(6), Inches(1)).table
+        for r in range(3):
+            for c in range(3):
+                table.cell(r, c).text = f"table-cell-{i}-{r}-{c}"
+        slide.notes_slide.notes_text_frame.text = f"speaker-note-{i}: remember to pause here."
+    prs.save(path)
+
+
+def _run(kind: str, parser: str, path: str) -> dict:
+    """Extract once in this (fresh) process and report time and peak RSS"""
+    from services.extraction import _extract_from_docx, _extract_from_pptx
+    from services.extraction.ooxml import extract_docx, extract_pptx
+    import docx  # noqa: F401  (import cost isn't part of the measurement)
+    import pptx  # noqa: F401
+    
+    extractors = {
+        ("docx", "legacy"): _extract_from_docx,
+        ("docx", "stream"): extract_docx,
+        ("pptx", "legacy"): _extract_from_pptx,
+        ("pptx", "stream"): extract_pptx,
+    }
+    baseline_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    started = time.perf_counter()
+    result = extractors[(kind, parser)](path, os.path.basename(path))
+    elapsed = time.perf_counter() - started
+    peak_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    
+    text = result["text"]
+    return {
+        "file": kind,
+        "parser": parser,
+        "seconds": round(elapsed, 3),
+        "peak_rss_growth_mb": round((peak_rss - baseline_rss) / 1024, 1),
+        "characters": len(text),
+        "table_cells": text.count("table-cell-"),
+        "speaker_notes": text.count("speaker-note-")
+    }
+
+
+def run(kind: str, parser: str, path: str) -> dict:
+    with ProcessPoolExecutor(max_workers=1, mp_context=get_context("spawn")) as pool:
+        return pool.submit(_run, kind, parser, path).result()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--docx", help="existing .docx to extract")
+    parser.add_argument("--pptx", help="existing .pptx to extract")
+    parser.add_argument("--paragraphs", type=int, default=10000, help="paragraphs in the generated DOCX")
+    parser.add_argument("--slides", type=int, default=300, help="slides in the generated PPTX")
+    args = parser.parse_args()
+    
+    with tempfile.TemporaryDirectory() as tmp:
+        docx_path = args.docx or os.path.join(tmp, "bench.docx")
+        pptx_path = args.pptx or os.path.join(tmp, "bench.pptx")
+        if not args.docx:
+            make_docx(docx_path, args.paragraphs)
+        if not args.pptx:
+            make_pptx(pptx_path, args.slides)
+        
+        for kind, path in (("docx", docx_path), ("pptx", pptx_path)):
+            print(f"{kind}: {os.path.getsize(path) / 1024 / 1024:.1f} MB")
+            legacy = run(kind, "legacy", path)
+            stream = run(kind, "stream", path)
+            for stats in (legacy, stream):
+                print(stats)
+            print(f"{kind} speedup: {legacy['seconds'] / stream['seconds']:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
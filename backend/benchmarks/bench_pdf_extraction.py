@@ -0,0 +1,106 @@
+"""
+Serial vs page-parallel PDF extraction
+
+Generates synthetic text PDFs (10, 100 and 500 pages by default) and times
+`extract_pdf` with the whole document in one task versus split into
+PDF_PAGES_PER_TASK page ranges across the extraction pool.
+
+Usage (from backend/, with the usual .env in place):
+    python -m benchmarks.bench_pdf_extraction --pages 10 100 500 --workers 8
+"""
+import argparse
+import asyncio
+import os
+import tempfile
+import time
+
+from core.config import settings
+from services.extraction.pdf import extract_pdf
+from services.extraction.pool import shutdown_extraction_pool
+
+WORDS = (
+    "quarterly revenue grew across every region while operating costs held flat "
+    "as the team consolidated vendors and moved reporting to a shared platform"
+).split()
+
+
+def make_pdf(path: str, pages: int, lines_per_page: int = 45):
+    """Write a minimal multi-page PDF with Helvetica text lines"""
+    objects = [
+        b"<< /Type /Catalog /Pages 2 0 R >>",
+        None,  # page tree, filled in once page ids are known
+        b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>",
+    ]
+    page_ids = []
+    for page in range(pages):
+        lines = []
+        for line in range(lines_per_page):
+            words = [WORDS[(page * 7 + line * 3 + i) % len(WORDS)] for i in range(12)]
+            lines.append(f"({' '.join(words)}) Tj 0 -15 Td")
+        stream = ("BT /F1 10 Tf 50 750 Td " + " ".join(lines) + " ET").encode()
+        objects.append(b"<< /Length %d >>\nstream\n%s\nendstream" % (len(stream), stream))
+        content_id = len(objects)
+        objects.append(
+            b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] "
+            b"/Resources << /Font << /F1 3 0 R >> >> /Contents %d 0 R >>" % content_id
+        )
+        page_ids.append(len(objects))
+    kids = b" ".join(b"%d 0 R" % i for i in page_ids)
+    objects[1] = b"<< /Type /Pages /Kids [%s] /Count %d >>" % (kids, pages)
+    
+    with open(path, "wb") as out:
+        out.write(b"%PDF-1.4\n")
+        offsets = []
+        for number, body in enumerate(objects, 1):
+            offsets.append(out.tell())
+            out.write(b"%d 0 obj\n%s\nendobj\n" % (number, body))
+        xref = out.tell()
+        out.write(b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1))
+        for offset in offsets:
+            out.write(b"%010d 00000 n \n" % offset)
+        out.write(b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objects) + 1, xref))
+
+
+async def time_extraction(path: str, pages_per_task: int) -> float:
+    settings.PDF_PAGES_PER_TASK = pages_per_task
+    started = time.perf_counter()
+    result = await extract_pdf(path, os.path.basename(path))
+    elapsed = time.perf_counter() - started
+    assert result["metadata"]["page_count"] > 0
+    return elapsed
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--pages", type=int, nargs="+", default=[10, 100, 500])
+    parser.add_argument("--workers", type=int, default=os.cpu_count())
+    parser.add_argument("--pages-per-task", type=int, default=settings.PDF_PAGES_PER_TASK)
+    args = parser.parse_args()
+    
+    settings.EXTRACTION_WORKERS = args.workers
+    settings.PDF_MAX_PAGES = 0
+    # A serial 500-page run can exceed the default per-task timeout
+    settings.EXTRACTION_TIMEOUT_SECONDS = 3600
+    print(f"workers={args.workers} pages_per_task={args.pages_per_task}")
+    
+    with tempfile.TemporaryDirectory() as directory:
+        # Warm the pool so worker start-up isn't counted
+        warmup = os.path.join(directory, "warmup.pdf")
+        make_pdf(warmup, args.workers)
+        await time_extraction(warmup, 1)
+        
+        for pages in args.pages:
+            path = os.path.join(directory, f"synthetic-{pages}.pdf")
+            make_pdf(path, pages)
+            serial = await time_extraction(path, pages)
+            parallel = await time_extraction(path, args.pages_per_task)
+            print(
+                f"{pages:>4} pages: serial {serial:6.2f}s  parallel {parallel:6.2f}s  "
+                f"speedup {serial / parallel:.2f}x"
+            )
+    
+    shutdown_extraction_pool()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
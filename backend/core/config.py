@@ -3,7 +3,7 @@ Application configuration using Pydantic settings
 """
 from pydantic_settings import BaseSettings
 from pydantic import Field
-from typing import List
+from typing import Dict, List
 import os
 
 
@@ -33,12 +33,36 @@ class Settings(BaseSettings):
     SUPABASE_KEY: str = Field(..., description="Supabase anon key")
     SUPABASE_SERVICE_KEY: str = Field(..., description="Supabase service key")
     SUPABASE_JWT_SECRET: str = Field(..., description="Supabase JWT secret")
+    # Threads running the blocking PostgREST round trips (max concurrent DB calls);
+    # keep within the client's 20 keep-alive connections
+    DB_MAX_CONCURRENCY: int = 16
     
     # Groq API
     GROQ_API_KEY: str = Field(..., description="Groq API key")
     GROQ_MODEL: str = "llama3-8b-8192"
     GROQ_TEMPERATURE: float = 0.7
     GROQ_MAX_TOKENS: int = 2000
+    GROQ_FALLBACK_MODEL: str = ""
+    # Per-stage model routing ("analysis" or a platform name -> model);
+    # stages not listed use GROQ_MODEL
+    LLM_MODEL_ROUTES: Dict[str, str] = {}
+    LLM_TIMEOUT_SECONDS: float = 30.0
+    LLM_MAX_RETRIES: int = 1
+    CIRCUIT_BREAKER_FAILURE_THRESHOLD: int = 5
+    CIRCUIT_BREAKER_RECOVERY_SECONDS: float = 30.0
+    LLM_CONCURRENCY_INITIAL: int = 8
+    LLM_CONCURRENCY_MIN: int = 1
+    LLM_CONCURRENCY_MAX: int = 64
+    LLM_AIMD_BACKOFF: float = 0.5
+    LLM_AIMD_LATENCY_FACTOR: float = 3.0
+    LLM_HEDGING_ENABLED: bool = False
+    LLM_HEDGE_PERCENTILE: float = 0.95
+    LLM_HEDGE_MAX_RATE: float = 0.1
+    LLM_HEDGE_MIN_SAMPLES: int = 20
+    
+    # Token quotas per subscription tier, per calendar month (0 = unlimited)
+    TOKEN_QUOTAS: Dict[str, int] = {"free": 200000, "pro": 2000000, "enterprise": 0}
+    ENFORCE_TOKEN_QUOTAS: bool = False
     
     # Rate Limiting
     RATE_LIMIT_PER_MINUTE: int = 60
@@ -47,11 +71,56 @@ class Settings(BaseSettings):
     # File Upload
     MAX_FILE_SIZE_MB: int = 50
     ALLOWED_EXTENSIONS: List[str] = ["pdf", "docx", "pptx", "txt"]
+    UPLOAD_TMP_DIR: str = ""  # empty = system temp dir
+    RAW_INPUT_DIR: str = ""  # uploads awaiting extraction; empty = <temp dir>/raw-inputs
+    RAW_INPUT_RETENTION_HOURS: int = 24  # uploads kept after a transient extraction failure are swept after this
+    EXTRACTION_WORKERS: int = 0  # 0 = one per CPU
+    EXTRACTION_TIMEOUT_SECONDS: int = 60
+    EXTRACTION_MAX_TASKS_PER_WORKER: int = 100
+    EXTRACTION_CPU_SECONDS: int = 60  # CPU time per task before the worker is killed; 0 = no limit
+    EXTRACTION_MEMORY_MB: int = 1024  # address space per worker; 0 = no limit
+    PDF_PAGES_PER_TASK: int = 25
+    PDF_MAX_PAGES: int = 1000  # 0 = no cap
+    OFFICE_PARSER: str = "stream"  # stream (zip + iterparse) or legacy (python-docx/python-pptx)
+    EXTRACTION_CACHE_ENABLED: bool = True
+    EXTRACTION_CACHE_MEMORY_MB: int = 64
+    EXTRACTION_CACHE_DIR: str = ""  # empty = memory tier only
+    EXTRACTION_CACHE_DISK_MB: int = 1024
+    
+    # Outbound HTTP (URL extraction)
+    HTTP_MAX_CONNECTIONS: int = 100
+    HTTP_MAX_CONNECTIONS_PER_HOST: int = 8
+    HTTP_KEEPALIVE_SECONDS: int = 30
+    HTTP_DNS_CACHE_SECONDS: int = 300
+    HTTP_CONNECT_TIMEOUT_SECONDS: int = 10
+    HTTP_TIMEOUT_SECONDS: int = 30
+    URL_MAX_RESPONSE_MB: int = 10
+    URL_CACHE_ENABLED: bool = True
+    URL_CACHE_MEMORY_MB: int = 64
+    HTML_PARSER: str = "lxml"  # lxml (readability-style scoring) or bs4
+    
+    # Bulk sitemap/feed imports
+    IMPORT_CONCURRENCY: int = 16  # pages fetched at once across all sites
+    IMPORT_PER_DOMAIN_CONCURRENCY: int = 2
+    IMPORT_PER_DOMAIN_DELAY_MS: int = 500  # minimum gap between requests to one host
+    IMPORT_BATCH_SIZE: int = 50  # content/job rows per insert
+    IMPORT_MAX_ENTRIES: int = 1000
     
     # Processing
     MAX_CONCURRENT_JOBS: int = 5
     JOB_TIMEOUT_SECONDS: int = 300
     RETRY_MAX_ATTEMPTS: int = 3
+    PLATFORM_CONCURRENCY: int = 4
+    SPECULATIVE_ANALYSIS: bool = True
+    SPECULATIVE_ANALYSIS_TTL_SECONDS: int = 120
+    ANALYSIS_BATCHING: bool = False
+    ANALYSIS_BATCH_MAX_ITEMS: int = 8
+    ANALYSIS_BATCH_MAX_WAIT_MS: int = 50
+    ANALYSIS_BATCH_MAX_CHARS: int = 1500
+    
+    # Near-duplicate detection (MinHash similarity)
+    NEAR_DUPLICATE_REUSE_THRESHOLD: float = 0.9
+    NEAR_DUPLICATE_WARM_START_THRESHOLD: float = 0.6
     
     # Sentry (Optional)
     SENTRY_DSN: str = ""
@@ -75,6 +144,14 @@ class Settings(BaseSettings):
         """Convert MB to bytes"""
         return self.MAX_FILE_SIZE_MB * 1024 * 1024
     
+    def model_for(self, stage: str) -> str:
+        """Model routed to a stage (analysis or platform name)"""
+        return self.LLM_MODEL_ROUTES.get(stage) or self.GROQ_MODEL
+    
+    def token_quota(self, tier: str) -> int:
+        """Monthly token quota for a subscription tier (0 = unlimited)"""
+        return self.TOKEN_QUOTAS.get(tier, self.TOKEN_QUOTAS.get("free", 0))
+    
     def is_allowed_extension(self, filename: str) -> bool:
         """Check if file extension is allowed"""
         if "." not in filename:
@@ -36,6 +36,9 @@ CREATE TABLE IF NOT EXISTS public.content (
     title TEXT NOT NULL CHECK (length(title) > 0 AND length(title) <= 500),
     source_type TEXT NOT NULL CHECK (source_type IN ('pdf', 'docx', 'ppt', 'url', 'text')),
     original_text TEXT,
+    content_hash TEXT,
+    minhash_signature BIGINT[],
+    lsh_bands TEXT[],
     source_url TEXT,
     file_path TEXT,
     file_size_bytes BIGINT,
@@ -52,6 +55,26 @@ CREATE INDEX IF NOT EXISTS idx_content_source_type ON public.content(source_type
 CREATE INDEX IF NOT EXISTS idx_content_created_at ON public.content(created_at DESC);
 CREATE INDEX IF NOT EXISTS idx_content_is_deleted ON public.content(is_deleted);
 
+-- SHA-256 of normalized original_text, used to reuse outputs for identical submissions
+ALTER TABLE public.content ADD COLUMN IF NOT EXISTS content_hash TEXT;
+CREATE INDEX IF NOT EXISTS idx_content_user_hash ON public.content(user_id, content_hash);
+
+-- MinHash signature and LSH band keys for near-duplicate analysis reuse
+ALTER TABLE public.content ADD COLUMN IF NOT EXISTS minhash_signature BIGINT[];
+ALTER TABLE public.content ADD COLUMN IF NOT EXISTS lsh_bands TEXT[];
+CREATE INDEX IF NOT EXISTS idx_content_lsh_bands ON public.content USING gin(lsh_bands);
+
+-- Uploads and URLs are extracted by the job pipeline; original_text stays NULL until then
+ALTER TABLE public.content ADD COLUMN IF NOT EXISTS extraction_status TEXT NOT NULL DEFAULT 'completed'
+    CHECK (extraction_status IN ('pending', 'extracting', 'completed', 'failed'));
+ALTER TABLE public.content ADD COLUMN IF NOT EXISTS extraction_error TEXT;
+
+-- Content-defined sections ({hash, heading, start, end}) and the revision this content replaces,
+-- so a new revision re-analyzes and regenerates only what changed
+ALTER TABLE public.content ADD COLUMN IF NOT EXISTS sections JSONB DEFAULT '[]'::jsonb;
+ALTER TABLE public.content ADD COLUMN IF NOT EXISTS previous_revision_id UUID REFERENCES public.content(id) ON DELETE SET NULL;
+CREATE INDEX IF NOT EXISTS idx_content_previous_revision_id ON public.content(previous_revision_id);
+
 -- =====================================================
 -- 3. JOBS TABLE
 -- =====================================================
@@ -84,6 +107,15 @@ CREATE INDEX IF NOT EXISTS idx_jobs_created_at ON public.jobs(created_at DESC);
 CREATE INDEX IF NOT EXISTS idx_jobs_is_deleted ON public.jobs(is_deleted);
 CREATE INDEX IF NOT EXISTS idx_jobs_title ON public.jobs(title);
 
+-- 'extracting': the first pipeline stage, turning an upload or URL into text
+ALTER TABLE public.jobs DROP CONSTRAINT IF EXISTS jobs_status_check;
+ALTER TABLE public.jobs ADD CONSTRAINT jobs_status_check
+    CHECK (status IN ('pending', 'extracting', 'processing', 'completed', 'failed', 'cancelled'));
+
+-- 'changed': on a revision, reuse the previous revision's output for platforms whose inputs are unchanged
+ALTER TABLE public.jobs ADD COLUMN IF NOT EXISTS regenerate TEXT NOT NULL DEFAULT 'all'
+    CHECK (regenerate IN ('all', 'changed'));
+
 -- =====================================================
 -- 4. OUTPUTS TABLE
 -- =====================================================
@@ -140,6 +172,99 @@ CREATE INDEX IF NOT EXISTS idx_analytics_output_id ON public.analytics(output_id
 CREATE INDEX IF NOT EXISTS idx_analytics_date ON public.analytics(date DESC);
 CREATE INDEX IF NOT EXISTS idx_analytics_platform ON public.analytics(platform);
 
+-- =====================================================
+-- 5b. LLM USAGE TABLE
+-- =====================================================
+-- One row per upstream LLM call, for token/cost accounting
+CREATE TABLE IF NOT EXISTS public.llm_usage (
+    id UUID PRIMARY KEY DEFAULT uuid_generate_v4(),
+    job_id UUID REFERENCES public.jobs(id) ON DELETE CASCADE,
+    user_id UUID NOT NULL REFERENCES auth.users(id) ON DELETE CASCADE,
+    stage TEXT NOT NULL,
+    model TEXT NOT NULL,
+    prompt_tokens INTEGER NOT NULL DEFAULT 0,
+    completion_tokens INTEGER NOT NULL DEFAULT 0,
+    total_tokens INTEGER NOT NULL DEFAULT 0,
+    latency_ms INTEGER,
+    created_at TIMESTAMP WITH TIME ZONE DEFAULT NOW()
+);
+
+-- Indexes
+CREATE INDEX IF NOT EXISTS idx_llm_usage_job_id ON public.llm_usage(job_id);
+CREATE INDEX IF NOT EXISTS idx_llm_usage_user_created ON public.llm_usage(user_id, created_at DESC);
+CREATE INDEX IF NOT EXISTS idx_llm_usage_stage ON public.llm_usage(stage);
+
+-- Usage totals summed in the database, overall or per stage/model/job (largest first).
+-- Quota checks and summaries must not read raw rows: PostgREST caps responses at max-rows.
+CREATE OR REPLACE FUNCTION public.llm_usage_totals(
+    p_user_id UUID,
+    p_since TIMESTAMP WITH TIME ZONE,
+    p_group_by TEXT DEFAULT NULL,
+    p_limit INTEGER DEFAULT NULL
+)
+RETURNS TABLE (
+    group_key TEXT,
+    calls BIGINT,
+    prompt_tokens BIGINT,
+    completion_tokens BIGINT,
+    total_tokens BIGINT,
+    latency_ms BIGINT
+)
+LANGUAGE sql STABLE
+AS $$
+    SELECT
+        CASE p_group_by
+            WHEN 'stage' THEN u.stage
+            WHEN 'model' THEN u.model
+            WHEN 'job_id' THEN u.job_id::TEXT
+        END AS group_key,
+        COUNT(*) AS calls,
+        COALESCE(SUM(u.prompt_tokens), 0) AS prompt_tokens,
+        COALESCE(SUM(u.completion_tokens), 0) AS completion_tokens,
+        COALESCE(SUM(u.total_tokens), 0) AS total_tokens,
+        COALESCE(SUM(u.latency_ms), 0) AS latency_ms
+    FROM public.llm_usage u
+    WHERE u.user_id = p_user_id
+      AND u.created_at >= p_since
+    GROUP BY 1
+    ORDER BY 5 DESC
+    LIMIT p_limit;
+$$;
+
+-- =====================================================
+-- 5c. CONTENT IMPORTS TABLE
+-- =====================================================
+-- One row per bulk import of a sitemap or feed, with progress counters
+CREATE TABLE IF NOT EXISTS public.content_imports (
+    id UUID PRIMARY KEY DEFAULT uuid_generate_v4(),
+    user_id UUID NOT NULL REFERENCES auth.users(id) ON DELETE CASCADE,
+    source_url TEXT NOT NULL,
+    status TEXT NOT NULL DEFAULT 'pending' CHECK (status IN ('pending', 'discovering', 'importing', 'completed', 'failed')),
+    platforms TEXT[] NOT NULL,
+    user_preferences JSONB DEFAULT '{}'::jsonb,
+    max_entries INTEGER NOT NULL DEFAULT 200,
+    total_entries INTEGER DEFAULT 0,
+    processed_entries INTEGER DEFAULT 0,
+    created_entries INTEGER DEFAULT 0,
+    skipped_entries INTEGER DEFAULT 0,
+    failed_entries INTEGER DEFAULT 0,
+    errors JSONB DEFAULT '[]'::jsonb,
+    error_message TEXT,
+    started_at TIMESTAMP WITH TIME ZONE,
+    completed_at TIMESTAMP WITH TIME ZONE,
+    created_at TIMESTAMP WITH TIME ZONE DEFAULT NOW(),
+    updated_at TIMESTAMP WITH TIME ZONE DEFAULT NOW()
+);
+
+-- Indexes
+CREATE INDEX IF NOT EXISTS idx_content_imports_user_created ON public.content_imports(user_id, created_at DESC);
+CREATE INDEX IF NOT EXISTS idx_content_imports_status ON public.content_imports(status);
+
+-- Content created by an import points back at it
+ALTER TABLE public.content ADD COLUMN IF NOT EXISTS import_id UUID REFERENCES public.content_imports(id) ON DELETE SET NULL;
+CREATE INDEX IF NOT EXISTS idx_content_import_id ON public.content(import_id);
+CREATE INDEX IF NOT EXISTS idx_content_user_source_url ON public.content(user_id, source_url);
+
 -- =====================================================
 -- 6. TRIGGERS FOR UPDATED_AT
 -- =====================================================
@@ -169,6 +294,9 @@ CREATE TRIGGER update_outputs_updated_at BEFORE UPDATE ON public.outputs
 CREATE TRIGGER update_analytics_updated_at BEFORE UPDATE ON public.analytics
     FOR EACH ROW EXECUTE FUNCTION update_updated_at_column();
 
+CREATE TRIGGER update_content_imports_updated_at BEFORE UPDATE ON public.content_imports
+    FOR EACH ROW EXECUTE FUNCTION update_updated_at_column();
+
 -- =====================================================
 -- 7. ROW LEVEL SECURITY (RLS)
 -- =====================================================
@@ -179,6 +307,8 @@ ALTER TABLE public.content ENABLE ROW LEVEL SECURITY;
 ALTER TABLE public.jobs ENABLE ROW LEVEL SECURITY;
 ALTER TABLE public.outputs ENABLE ROW LEVEL SECURITY;
 ALTER TABLE public.analytics ENABLE ROW LEVEL SECURITY;
+ALTER TABLE public.llm_usage ENABLE ROW LEVEL SECURITY;
+ALTER TABLE public.content_imports ENABLE ROW LEVEL SECURITY;
 
 -- User Profiles Policies
 CREATE POLICY "Users can view their own profile"
@@ -257,6 +387,16 @@ CREATE POLICY "Users can update their own analytics"
     ON public.analytics FOR UPDATE
     USING (auth.uid() = user_id);
 
+-- LLM Usage Policies
+CREATE POLICY "Users can view their own llm usage"
+    ON public.llm_usage FOR SELECT
+    USING (auth.uid() = user_id);
+
+-- Content Imports Policies
+CREATE POLICY "Users can view their own content imports"
+    ON public.content_imports FOR SELECT
+    USING (auth.uid() = user_id);
+
 -- =====================================================
 -- 8. HELPFUL VIEWS
 -- =====================================================
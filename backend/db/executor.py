@@ -0,0 +1,62 @@
+"""
+Bounded thread pool for database round trips
+
+supabase-py's query builders only have a blocking execute(). Repositories
+build queries on the event loop and run just the HTTP round trip here, so
+concurrent requests and jobs overlap their database latency instead of
+stalling the loop one call at a time. The pool size caps concurrent DB calls
+per process; calls beyond it wait in the executor's queue.
+"""
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Optional
+from loguru import logger
+
+from core.config import settings
+
+_executor: Optional[ThreadPoolExecutor] = None
+_in_flight = 0
+
+
+def get_db_executor() -> ThreadPoolExecutor:
+    """Shared DB thread pool, created on first use"""
+    global _executor
+    if _executor is None:
+        _executor = ThreadPoolExecutor(
+            max_workers=settings.DB_MAX_CONCURRENCY,
+            thread_name_prefix="db"
+        )
+        logger.info(f"Started DB thread pool with {settings.DB_MAX_CONCURRENCY} threads")
+    return _executor
+
+
+async def run_blocking(fn: Callable[..., Any], *args: Any) -> Any:
+    """Run a blocking Supabase call (query, RPC, auth lookup) on the DB thread pool"""
+    global _in_flight
+    _in_flight += 1
+    try:
+        return await asyncio.get_running_loop().run_in_executor(get_db_executor(), fn, *args)
+    finally:
+        _in_flight -= 1
+
+
+async def execute(query: Any) -> Any:
+    """Run a built PostgREST query (or RPC) and return its response"""
+    return await run_blocking(query.execute)
+
+
+def get_db_stats() -> dict:
+    """Get DB pool statistics"""
+    return {
+        "threads": settings.DB_MAX_CONCURRENCY,
+        "in_flight": _in_flight,
+        "queued": max(0, _in_flight - settings.DB_MAX_CONCURRENCY)
+    }
+
+
+def shutdown_db_executor():
+    """Stop the DB threads (application shutdown)"""
+    global _executor
+    if _executor is not None:
+        _executor.shutdown(wait=False, cancel_futures=True)
+        _executor = None
@@ -7,6 +7,8 @@ from .content_repository import ContentRepository
 from .job_repository import JobRepository
 from .output_repository import OutputRepository
 from .analytics_repository import AnalyticsRepository
+from .usage_repository import UsageRepository
+from .import_repository import ImportRepository
 
 __all__ = [
     "BaseRepository",
@@ -15,4 +17,6 @@ __all__ = [
     "JobRepository",
     "OutputRepository",
     "AnalyticsRepository",
+    "UsageRepository",
+    "ImportRepository",
 ]
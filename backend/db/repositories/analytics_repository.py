@@ -21,12 +21,11 @@ class AnalyticsRepository(BaseRepository):
         Get analytics for an output
         """
         try:
-            response = (
+            response = await self._execute(
                 self.table.select("*")
                 .eq("output_id", str(output_id))
                 .order("created_at", desc=True)
                 .limit(1)
-                .execute()
             )
             if response.data:
                 return response.data[0]
@@ -6,6 +6,8 @@ from uuid import UUID
 from supabase import Client
 from loguru import logger
 
+from db.executor import execute
+
 T = TypeVar('T')
 
 
@@ -19,12 +21,19 @@ class BaseRepository(Generic[T]):
         self.table_name = table_name
         self.table = client.table(table_name)
     
+    async def _execute(self, query: Any) -> Any:
+        """
+        Run a built query on the DB thread pool; supabase-py's execute()
+        blocks, so it must not run on the event loop
+        """
+        return await execute(query)
+    
     async def create(self, data: Dict[str, Any]) -> Dict[str, Any]:
         """
         Create a new record
         """
         try:
-            response = self.table.insert(data).execute()
+            response = await self._execute(self.table.insert(data))
             if response.data:
                 logger.info(f"Created record in {self.table_name}: {response.data[0].get('id')}")
                 return response.data[0]
@@ -33,12 +42,27 @@ class BaseRepository(Generic[T]):
             logger.error(f"Error creating record in {self.table_name}: {e}")
             raise
     
+    async def create_many(self, records: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Insert a batch of records in one request
+        """
+        if not records:
+            return []
+        try:
+            response = await self._execute(self.table.insert(records))
+            data = response.data if response.data else []
+            logger.debug(f"Created {len(data)} records in {self.table_name}")
+            return data
+        except Exception as e:
+            logger.error(f"Error creating records in {self.table_name}: {e}")
+            raise
+    
     async def get_by_id(self, id: UUID) -> Optional[Dict[str, Any]]:
         """
         Get record by ID
         """
         try:
-            response = self.table.select("*").eq("id", str(id)).execute()
+            response = await self._execute(self.table.select("*").eq("id", str(id)))
             if response.data:
                 return response.data[0]
             return None
@@ -71,7 +95,7 @@ class BaseRepository(Generic[T]):
             # Apply pagination
             query = query.range(offset, offset + limit - 1)
             
-            response = query.execute()
+            response = await self._execute(query)
             return response.data if response.data else []
         except Exception as e:
             logger.error(f"Error getting records from {self.table_name}: {e}")
@@ -82,7 +106,7 @@ class BaseRepository(Generic[T]):
         Update a record
         """
         try:
-            response = self.table.update(data).eq("id", str(id)).execute()
+            response = await self._execute(self.table.update(data).eq("id", str(id)))
             if response.data:
                 logger.info(f"Updated record in {self.table_name}: {id}")
                 return response.data[0]
@@ -96,13 +120,28 @@ class BaseRepository(Generic[T]):
         Delete a record (hard delete)
         """
         try:
-            response = self.table.delete().eq("id", str(id)).execute()
+            response = await self._execute(self.table.delete().eq("id", str(id)))
             logger.info(f"Deleted record from {self.table_name}: {id}")
             return True
         except Exception as e:
             logger.error(f"Error deleting record from {self.table_name}: {e}")
             raise
     
+    async def delete_many(self, ids: List[UUID]) -> int:
+        """
+        Delete a batch of records by id in one request (hard delete)
+        """
+        if not ids:
+            return 0
+        try:
+            response = await self._execute(self.table.delete().in_("id", [str(id) for id in ids]))
+            deleted = len(response.data or [])
+            logger.info(f"Deleted {deleted} records from {self.table_name}")
+            return deleted
+        except Exception as e:
+            logger.error(f"Error deleting records from {self.table_name}: {e}")
+            raise
+    
     async def soft_delete(self, id: UUID) -> Dict[str, Any]:
         """
         Soft delete a record (set is_deleted to true)
@@ -120,7 +159,7 @@ class BaseRepository(Generic[T]):
                 for key, value in filters.items():
                     query = query.eq(key, value)
             
-            response = query.execute()
+            response = await self._execute(query)
             return response.count if response.count else 0
         except Exception as e:
             logger.error(f"Error counting records in {self.table_name}: {e}")
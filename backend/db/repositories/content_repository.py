@@ -34,7 +34,7 @@ class ContentRepository(BaseRepository):
             
             query = query.order("created_at", desc=True).range(offset, offset + limit - 1)
             
-            response = query.execute()
+            response = await self._execute(query)
             return response.data if response.data else []
         except Exception as e:
             logger.error(f"Error getting content by user: {e}")
@@ -50,7 +50,7 @@ class ContentRepository(BaseRepository):
             if source_type:
                 query = query.eq("source_type", source_type)
             
-            response = query.execute()
+            response = await self._execute(query)
             return response.count if response.count else 0
         except Exception as e:
             logger.error(f"Error counting content: {e}")
@@ -62,6 +62,83 @@ class ContentRepository(BaseRepository):
         """
         return await self.update(content_id, {"analysis": analysis})
     
+    async def get_by_hash(
+        self,
+        user_id: UUID,
+        content_hash: str,
+        exclude_id: Optional[UUID] = None,
+        limit: int = 10
+    ) -> List[Dict[str, Any]]:
+        """
+        Get user's content with the same normalized text hash
+        """
+        try:
+            query = (
+                self.table.select("*")
+                .eq("user_id", str(user_id))
+                .eq("content_hash", content_hash)
+                .eq("is_deleted", False)
+            )
+            
+            if exclude_id:
+                query = query.neq("id", str(exclude_id))
+            
+            response = await self._execute(query.order("created_at", desc=True).limit(limit))
+            return response.data if response.data else []
+        except Exception as e:
+            logger.error(f"Error getting content by hash: {e}")
+            raise
+    
+    async def get_analyzed_by_bands(
+        self,
+        user_id: UUID,
+        bands: List[str],
+        exclude_id: Optional[UUID] = None,
+        limit: int = 20
+    ) -> List[Dict[str, Any]]:
+        """
+        Get user's analyzed content sharing at least one LSH band
+        """
+        try:
+            query = (
+                self.table.select("id, analysis, minhash_signature")
+                .eq("user_id", str(user_id))
+                .eq("is_deleted", False)
+                .ov("lsh_bands", bands)
+                .not_.is_("analysis", "null")
+            )
+            
+            if exclude_id:
+                query = query.neq("id", str(exclude_id))
+            
+            response = await self._execute(query.order("created_at", desc=True).limit(limit))
+            return response.data if response.data else []
+        except Exception as e:
+            logger.error(f"Error getting content by LSH bands: {e}")
+            raise
+    
+    async def get_existing_source_urls(self, user_id: UUID, urls: List[str]) -> List[str]:
+        """
+        Which of the given source URLs the user already has content for
+        """
+        if not urls:
+            return []
+        try:
+            found = []
+            # Keep the IN list (and the request URL) to a sane length
+            for start in range(0, len(urls), 100):
+                response = await self._execute(
+                    self.table.select("source_url")
+                    .eq("user_id", str(user_id))
+                    .eq("is_deleted", False)
+                    .in_("source_url", urls[start:start + 100])
+                )
+                found.extend(row["source_url"] for row in response.data or [])
+            return found
+        except Exception as e:
+            logger.error(f"Error getting existing source URLs: {e}")
+            raise
+    
     async def search_content(
         self,
         user_id: UUID,
@@ -73,14 +150,13 @@ class ContentRepository(BaseRepository):
         """
         try:
             # Note: This is a simple search. For production, use PostgreSQL full-text search
-            response = (
+            response = await self._execute(
                 self.table.select("*")
                 .eq("user_id", str(user_id))
                 .eq("is_deleted", False)
                 .ilike("title", f"%{search_term}%")
                 .order("created_at", desc=True)
                 .limit(limit)
-                .execute()
             )
             return response.data if response.data else []
         except Exception as e:
@@ -0,0 +1,44 @@
+"""
+Import repository for bulk content imports
+"""
+from typing import Dict, Any, List
+from uuid import UUID
+from supabase import Client
+from .base import BaseRepository
+from loguru import logger
+
+
+class ImportRepository(BaseRepository):
+    """
+    Repository for sitemap/feed import records
+    """
+    
+    def __init__(self, client: Client):
+        super().__init__(client, "content_imports")
+    
+    async def get_by_user(self, user_id: UUID, limit: int = 20, offset: int = 0) -> List[Dict[str, Any]]:
+        """
+        Get a user's imports, newest first
+        """
+        try:
+            response = await self._execute(
+                self.table.select("*")
+                .eq("user_id", str(user_id))
+                .order("created_at", desc=True)
+                .range(offset, offset + limit - 1)
+            )
+            return response.data if response.data else []
+        except Exception as e:
+            logger.error(f"Error getting imports by user: {e}")
+            raise
+    
+    async def count_by_user(self, user_id: UUID) -> int:
+        """
+        Count a user's imports
+        """
+        try:
+            response = await self._execute(self.table.select("id", count="exact").eq("user_id", str(user_id)))
+            return response.count if response.count else 0
+        except Exception as e:
+            logger.error(f"Error counting imports: {e}")
+            raise
@@ -42,7 +42,7 @@ class JobRepository(BaseRepository):
             
             query = query.order("created_at", desc=True).range(offset, offset + limit - 1)
             
-            response = query.execute()
+            response = await self._execute(query)
             return response.data if response.data else []
         except Exception as e:
             logger.error(f"Error getting jobs by user: {e}")
@@ -53,17 +53,39 @@ class JobRepository(BaseRepository):
         Get all jobs for a content
         """
         try:
-            response = (
+            response = await self._execute(
                 self.table.select("*")
                 .eq("content_id", str(content_id))
                 .order("created_at", desc=True)
-                .execute()
             )
             return response.data if response.data else []
         except Exception as e:
             logger.error(f"Error getting jobs by content: {e}")
             raise
     
+    async def get_completed_by_contents(
+        self,
+        content_ids: List[str],
+        limit: int = 20
+    ) -> List[Dict[str, Any]]:
+        """
+        Get completed jobs for any of the given contents, newest first
+        """
+        if not content_ids:
+            return []
+        try:
+            response = await self._execute(
+                self.table.select("*")
+                .in_("content_id", [str(cid) for cid in content_ids])
+                .eq("status", "completed")
+                .order("completed_at", desc=True)
+                .limit(limit)
+            )
+            return response.data if response.data else []
+        except Exception as e:
+            logger.error(f"Error getting completed jobs by content: {e}")
+            raise
+    
     async def update_status(
         self,
         job_id: UUID,
@@ -117,12 +139,11 @@ class JobRepository(BaseRepository):
         Get pending jobs for processing
         """
         try:
-            response = (
+            response = await self._execute(
                 self.table.select("*")
                 .eq("status", "pending")
                 .order("created_at", desc=False)
                 .limit(limit)
-                .execute()
             )
             return response.data if response.data else []
         except Exception as e:
@@ -134,11 +155,11 @@ class JobRepository(BaseRepository):
         Get job with content details
         """
         try:
-            response = (
+            response = await self._execute(
                 self.client.rpc(
                     "get_job_with_content",
                     {"job_id": str(job_id)}
-                ).execute()
+                )
             )
             if response.data:
                 return response.data[0]
@@ -172,7 +193,7 @@ class JobRepository(BaseRepository):
             if status:
                 query = query.eq("status", status)
             
-            response = query.execute()
+            response = await self._execute(query)
             return response.count if response.count else 0
         except Exception as e:
             logger.error(f"Error counting jobs: {e}")
@@ -21,11 +21,10 @@ class OutputRepository(BaseRepository):
         Get all outputs for a job
         """
         try:
-            response = (
+            response = await self._execute(
                 self.table.select("*")
                 .eq("job_id", str(job_id))
                 .order("created_at", desc=False)
-                .execute()
             )
             return response.data if response.data else []
         except Exception as e:
@@ -54,7 +53,7 @@ class OutputRepository(BaseRepository):
             
             query = query.order("created_at", desc=True).range(offset, offset + limit - 1)
             
-            response = query.execute()
+            response = await self._execute(query)
             return response.data if response.data else []
         except Exception as e:
             logger.error(f"Error getting outputs by user: {e}")
@@ -65,11 +64,10 @@ class OutputRepository(BaseRepository):
         Get output for specific platform
         """
         try:
-            response = (
+            response = await self._execute(
                 self.table.select("*")
                 .eq("job_id", str(job_id))
                 .eq("platform", platform)
-                .execute()
             )
             if response.data:
                 return response.data[0]
@@ -122,7 +120,7 @@ class OutputRepository(BaseRepository):
             if platform:
                 query = query.eq("platform", platform)
             
-            response = query.execute()
+            response = await self._execute(query)
             return response.count if response.count else 0
         except Exception as e:
             logger.error(f"Error counting outputs: {e}")
@@ -133,11 +131,10 @@ class OutputRepository(BaseRepository):
         Get all outputs for a content
         """
         try:
-            response = (
+            response = await self._execute(
                 self.table.select("*")
                 .eq("content_id", str(content_id))
                 .order("created_at", desc=True)
-                .execute()
             )
             return response.data if response.data else []
         except Exception as e:
@@ -0,0 +1,87 @@
+"""
+Usage repository for LLM token accounting
+"""
+from typing import Optional, Dict, Any, List, Tuple
+from uuid import UUID
+from datetime import datetime
+from supabase import Client
+from .base import BaseRepository
+from loguru import logger
+
+USAGE_FIELDS = ("calls", "prompt_tokens", "completion_tokens", "total_tokens", "latency_ms")
+
+
+class UsageRepository(BaseRepository):
+    """
+    Repository for per-call LLM usage records
+    """
+    
+    def __init__(self, client: Client):
+        super().__init__(client, "llm_usage")
+    
+    async def get_by_job(self, job_id: UUID) -> List[Dict[str, Any]]:
+        """
+        Get all usage records for a job
+        """
+        try:
+            response = await self._execute(
+                self.table.select("*")
+                .eq("job_id", str(job_id))
+                .order("created_at", desc=False)
+            )
+            return response.data if response.data else []
+        except Exception as e:
+            logger.error(f"Error getting usage by job: {e}")
+            raise
+    
+    async def get_totals(self, user_id: UUID, since: datetime) -> Dict[str, int]:
+        """
+        Usage totals for a user since a point in time, summed in the database
+        """
+        rows = await self._usage_totals(user_id, since)
+        return rows[0][1] if rows else dict.fromkeys(USAGE_FIELDS, 0)
+    
+    async def get_grouped_totals(
+        self,
+        user_id: UUID,
+        since: datetime,
+        group_by: str,
+        limit: Optional[int] = None
+    ) -> Dict[str, Dict[str, int]]:
+        """
+        Usage totals per stage, model or job_id, largest first, summed in the database
+        """
+        if group_by not in ("stage", "model", "job_id"):
+            raise ValueError(f"Cannot group usage by {group_by}")
+        return dict(await self._usage_totals(user_id, since, group_by, limit))
+    
+    async def get_tokens_since(self, user_id: UUID, since: datetime) -> int:
+        """
+        Total tokens used by a user since a point in time
+        """
+        return (await self.get_totals(user_id, since))["total_tokens"]
+    
+    async def _usage_totals(
+        self,
+        user_id: UUID,
+        since: datetime,
+        group_by: Optional[str] = None,
+        limit: Optional[int] = None
+    ) -> List[Tuple[str, Dict[str, int]]]:
+        """(group key, totals) rows from the llm_usage_totals function"""
+        try:
+            response = await self._execute(
+                self.client.rpc("llm_usage_totals", {
+                    "p_user_id": str(user_id),
+                    "p_since": since.isoformat(),
+                    "p_group_by": group_by,
+                    "p_limit": limit
+                })
+            )
+            return [
+                (str(row["group_key"]), {field: int(row.get(field) or 0) for field in USAGE_FIELDS})
+                for row in response.data or []
+            ]
+        except Exception as e:
+            logger.error(f"Error summing usage: {e}")
+            raise
@@ -21,7 +21,7 @@ class UserRepository(BaseRepository):
         Get user by email
         """
         try:
-            response = self.table.select("*").eq("email", email).execute()
+            response = await self._execute(self.table.select("*").eq("email", email))
             if response.data:
                 return response.data[0]
             return None
@@ -62,7 +62,7 @@ class UserRepository(BaseRepository):
         Get user's API key
         """
         try:
-            response = self.table.select("api_key").eq("id", str(user_id)).execute()
+            response = await self._execute(self.table.select("api_key").eq("id", str(user_id)))
             if response.data and response.data[0].get("api_key"):
                 return response.data[0]["api_key"]
             return None
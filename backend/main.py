@@ -10,8 +10,13 @@ import asyncio
 from loguru import logger
 
 from core.config import settings
+from api.middleware import BodySizeLimitMiddleware
 from api.routes import content, jobs, outputs, analytics, health, auth
 from services.simple_job_processor import simple_job_processor
+from services.extraction import shutdown_extraction_pool
+from db.executor import get_db_stats, shutdown_db_executor
+from services.http_client import http_client
+from services.bulk_import import bulk_importer
 
 
 @asynccontextmanager
@@ -25,6 +30,8 @@ async def lifespan(app: FastAPI):
     # await init_database()
     # await init_storage()
     
+    await http_client.start()
+    
     # Start job processor in background
     logger.info("Starting background job processor...")
     job_processor_task = asyncio.create_task(simple_job_processor.start())
@@ -43,6 +50,11 @@ async def lifespan(app: FastAPI):
     except asyncio.CancelledError:
         logger.info("Job processor stopped successfully")
     
+    await bulk_importer.shutdown()
+    shutdown_extraction_pool()
+    await http_client.close()
+    shutdown_db_executor()
+    
     # await cleanup_resources()
 
 
@@ -57,6 +69,14 @@ app = FastAPI(
     lifespan=lifespan
 )
 
+# Stop oversized uploads while they stream in (1MB slack for form fields);
+# added before CORS so 413 responses still carry CORS headers
+app.add_middleware(
+    BodySizeLimitMiddleware,
+    max_bytes=settings.max_file_size_bytes + 1024 * 1024,
+    paths=[f"{settings.API_PREFIX}/content/upload"]
+)
+
 # CORS middleware
 app.add_middleware(
     CORSMiddleware,
@@ -66,7 +86,6 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-
 # Request timing middleware
 @app.middleware("http")
 async def add_process_time_header(request: Request, call_next):
@@ -135,10 +154,19 @@ app.include_router(
 async def get_processor_status():
     """Get job processor status"""
     from services.simple_job_processor import simple_job_processor
+    from services.extraction.pool import get_extraction_pool
     return {
         "status": "running" if simple_job_processor.is_running else "stopped",
-        "processor_type": "simple_gemini",
-        "model": settings.GEMINI_MODEL
+        "processor_type": "simple_groq",
+        "model": settings.GROQ_MODEL,
+        "model_routes": settings.LLM_MODEL_ROUTES,
+        "llm": simple_job_processor.llm.get_stats(),
+        "analysis_batching": {
+            "enabled": settings.ANALYSIS_BATCHING,
+            **simple_job_processor.analysis_batcher.get_stats()
+        },
+        "extraction_pool": get_extraction_pool().get_stats(),
+        "database": get_db_stats()
     }
 
 
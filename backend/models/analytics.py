@@ -81,3 +81,39 @@ class OutputAnalyticsResponse(BaseModel):
     engagement_rate: Optional[float] = None
     click_through_rate: Optional[float] = None
     tracked_at: datetime
+
+
+class UsageTotals(BaseModel):
+    """Aggregated LLM token usage"""
+    calls: int = 0
+    prompt_tokens: int = 0
+    completion_tokens: int = 0
+    total_tokens: int = 0
+    latency_ms: int = 0
+
+
+class TokenQuotaStatus(BaseModel):
+    """Monthly token quota for the user's tier"""
+    tier: str
+    monthly_quota: Optional[int] = None
+    used_this_month: int
+    remaining: Optional[int] = None
+    enforced: bool
+
+
+class UsageSummaryResponse(BaseModel):
+    """LLM usage for a user over a period"""
+    since: datetime
+    totals: UsageTotals
+    by_stage: Dict[str, UsageTotals] = Field(..., description="Keyed by 'analysis' or platform name")
+    by_model: Dict[str, UsageTotals]
+    top_jobs: List[Dict[str, Any]]
+    quota: TokenQuotaStatus
+
+
+class JobUsageResponse(BaseModel):
+    """LLM usage for a single job"""
+    job_id: UUID
+    totals: UsageTotals
+    by_stage: Dict[str, UsageTotals]
+    calls: List[Dict[str, Any]]
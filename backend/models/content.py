@@ -7,6 +7,8 @@ from datetime import datetime
 from uuid import UUID
 from enum import Enum
 
+from models.job import RegenerateMode
+
 
 class SourceType(str, Enum):
     """Content source types"""
@@ -49,6 +51,11 @@ class ContentTextCreate(BaseModel):
     text: str = Field(..., min_length=100, description="Content text (minimum 100 characters)")
     platforms: List[str] = Field(..., min_items=1, description="Target platforms")
     preferences: Dict[str, Any] = Field(default_factory=dict)
+    revision_of: Optional[UUID] = Field(None, description="Content this is a new revision of")
+    regenerate: RegenerateMode = Field(
+        RegenerateMode.ALL,
+        description="'changed' regenerates only platforms whose inputs differ from the previous revision's"
+    )
 
 
 class ContentURLCreate(BaseModel):
@@ -57,6 +64,52 @@ class ContentURLCreate(BaseModel):
     title: Optional[str] = None
     platforms: List[str] = Field(..., min_items=1, description="Target platforms")
     preferences: Dict[str, Any] = Field(default_factory=dict)
+    revision_of: Optional[UUID] = Field(None, description="Content this is a new revision of")
+    regenerate: RegenerateMode = Field(
+        RegenerateMode.ALL,
+        description="'changed' regenerates only platforms whose inputs differ from the previous revision's"
+    )
+
+
+class ContentImportCreate(BaseModel):
+    """Bulk import from a sitemap or RSS/Atom feed"""
+    url: str = Field(..., description="Sitemap, sitemap index, RSS or Atom feed URL")
+    platforms: List[str] = Field(..., min_items=1, description="Target platforms")
+    preferences: Dict[str, Any] = Field(default_factory=dict)
+    max_entries: int = Field(200, ge=1, description="Maximum number of entries to import")
+
+
+class ContentImportResponse(BaseModel):
+    """Bulk import status and progress"""
+    id: UUID
+    source_url: str
+    status: str
+    platforms: List[str]
+    max_entries: int
+    total_entries: int = 0
+    processed_entries: int = 0
+    created_entries: int = 0
+    skipped_entries: int = 0
+    failed_entries: int = 0
+    progress_percentage: int = 0
+    errors: List[Dict[str, Any]] = Field(default_factory=list)
+    error_message: Optional[str] = None
+    started_at: Optional[datetime] = None
+    completed_at: Optional[datetime] = None
+    created_at: datetime
+    updated_at: datetime
+    
+    @validator('progress_percentage', always=True)
+    def compute_progress(cls, v, values):
+        if values.get('status') == 'completed':
+            return 100
+        total = values.get('total_entries') or 0
+        if not total:
+            return 0
+        return min(100, int(100 * (values.get('processed_entries') or 0) / total))
+    
+    class Config:
+        from_attributes = True
 
 
 class ContentUpdate(BaseModel):
@@ -74,6 +127,11 @@ class ContentResponse(ContentBase):
     source_url: Optional[str] = None
     file_path: Optional[str] = None
     file_size_bytes: Optional[int] = None
+    content_hash: Optional[str] = None
+    extraction_status: str = "completed"
+    extraction_error: Optional[str] = None
+    previous_revision_id: Optional[UUID] = None
+    sections: List[Dict[str, Any]] = Field(default_factory=list)
     metadata: Dict[str, Any] = Field(default_factory=dict)
     analysis: Optional[Dict[str, Any]] = None
     created_at: datetime
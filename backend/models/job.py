@@ -11,12 +11,19 @@ from enum import Enum
 class JobStatus(str, Enum):
     """Job status enumeration"""
     PENDING = "pending"
+    EXTRACTING = "extracting"
     PROCESSING = "processing"
     COMPLETED = "completed"
     FAILED = "failed"
     CANCELLED = "cancelled"
 
 
+class RegenerateMode(str, Enum):
+    """Which platforms a job on a revision regenerates"""
+    ALL = "all"
+    CHANGED = "changed"  # only platforms whose inputs differ from the previous revision's
+
+
 class JobBase(BaseModel):
     """Base job model"""
     platforms: List[str] = Field(..., min_items=1, description="Target platforms")
@@ -43,6 +50,7 @@ class JobResponse(JobBase):
     error_message: Optional[str] = None
     error_details: Optional[Dict[str, Any]] = None
     retry_count: int = 0
+    regenerate: RegenerateMode = RegenerateMode.ALL
     created_at: datetime
     updated_at: datetime
     
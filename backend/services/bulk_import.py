@@ -0,0 +1,371 @@
+"""
+Bulk import of a site's posts from a sitemap or RSS/Atom feed
+"""
+import asyncio
+import zlib
+from contextlib import asynccontextmanager
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import urljoin, urlsplit
+
+from loguru import logger
+
+from core.config import settings
+from db.repositories import ContentRepository, ImportRepository, JobRepository
+from db.supabase import supabase_admin_client
+from services.dedup import compute_content_hash, split_sections
+from services.platforms import unsupported_platforms
+
+# Only the first errors are stored on the import; the counters carry the totals
+MAX_RECORDED_ERRORS = 50
+# Sitemap indexes nested deeper than this are not followed
+MAX_SITEMAP_DEPTH = 3
+# The sitemap protocol caps an uncompressed sitemap at 50MB
+MAX_SITEMAP_BYTES = 50 * 1024 * 1024
+
+
+def parse_feed(body: bytes, base_url: str) -> Tuple[List[str], List[str]]:
+    """
+    Entry URLs and child sitemap URLs from a sitemap, sitemap index, RSS or
+    Atom document. Gzipped sitemaps (*.xml.gz) are decompressed first.
+    """
+    from lxml import etree
+    
+    if body[:2] == b"\x1f\x8b":
+        body = _gunzip(body, MAX_SITEMAP_BYTES)
+    
+    # No entity expansion or network access: the document is untrusted
+    parser = etree.XMLParser(resolve_entities=False, no_network=True, recover=True, remove_comments=True)
+    try:
+        root = etree.fromstring(body, parser=parser)
+    except etree.XMLSyntaxError as e:
+        raise ValueError(f"Not a valid sitemap or feed: {e}")
+    if root is None:
+        raise ValueError("Not a valid sitemap or feed")
+    
+    kind = _local(root).lower()
+    entries, sitemaps = [], []
+    if kind == "urlset":
+        entries = _locs(root, "url")
+    elif kind == "sitemapindex":
+        sitemaps = _locs(root, "sitemap")
+    elif kind in ("rss", "rdf"):
+        for item in root.iter("{*}item"):
+            link = _child_text(item, "link")
+            if not link:
+                guid = next((child for child in item if _local(child) == "guid"), None)
+                if guid is not None and guid.get("isPermaLink", "true") == "true":
+                    link = (guid.text or "").strip()
+            if link:
+                entries.append(link)
+    elif kind == "feed":
+        for entry in root.iter("{*}entry"):
+            for link in entry:
+                if _local(link) == "link" and link.get("rel", "alternate") == "alternate" and link.get("href"):
+                    entries.append(link.get("href").strip())
+                    break
+    else:
+        raise ValueError(f"Unsupported document type <{kind}>; expected a sitemap, RSS or Atom feed")
+    
+    return _absolute(entries, base_url), _absolute(sitemaps, base_url)
+
+
+def _gunzip(body: bytes, max_bytes: int) -> bytes:
+    decompressor = zlib.decompressobj(16 + zlib.MAX_WBITS)
+    data = decompressor.decompress(body, max_bytes)
+    if decompressor.unconsumed_tail:
+        raise ValueError(f"Sitemap larger than {max_bytes} bytes uncompressed")
+    return data
+
+
+def _local(element) -> str:
+    tag = element.tag
+    return tag.rsplit("}", 1)[-1] if isinstance(tag, str) else ""
+
+
+def _child_text(element, name: str) -> Optional[str]:
+    for child in element:
+        if _local(child) == name and child.text and child.text.strip():
+            return child.text.strip()
+    return None
+
+
+def _locs(root, container: str) -> List[str]:
+    found = []
+    for element in root.iter("{*}" + container):
+        loc = _child_text(element, "loc")
+        if loc:
+            found.append(loc)
+    return found
+
+
+def _absolute(urls: List[str], base_url: str) -> List[str]:
+    result = []
+    for url in urls:
+        url = urljoin(base_url, url)
+        if urlsplit(url).scheme in ("http", "https"):
+            result.append(url)
+    return result
+
+
+class DomainThrottle:
+    """
+    Per-host politeness: at most `concurrency` requests in flight to one
+    host, and request starts spaced at least `delay_seconds` apart.
+    """
+    
+    def __init__(self, concurrency: int, delay_seconds: float):
+        self.concurrency = max(1, concurrency)
+        self.delay_seconds = max(0.0, delay_seconds)
+        self._slots: Dict[str, asyncio.Semaphore] = {}
+        self._next_start: Dict[str, float] = {}
+    
+    @asynccontextmanager
+    async def slot(self, url: str):
+        host = (urlsplit(url).hostname or "").lower()
+        semaphore = self._slots.setdefault(host, asyncio.Semaphore(self.concurrency))
+        async with semaphore:
+            loop = asyncio.get_running_loop()
+            now = loop.time()
+            start = max(now, self._next_start.get(host, 0.0))
+            self._next_start[host] = start + self.delay_seconds
+            if start > now:
+                await asyncio.sleep(start - now)
+            yield
+
+
+class BulkImporter:
+    """
+    Runs sitemap/feed imports in the background.
+    
+    Entry pages are fetched concurrently through the shared HTTP client,
+    bounded globally by IMPORT_CONCURRENCY and per host by DomainThrottle,
+    and parsed in the extraction process pool. Extracted pages are written
+    as content and pending jobs in batches of IMPORT_BATCH_SIZE, and the
+    import record's counters are updated after each batch.
+    """
+    
+    def __init__(self):
+        self.import_repo = ImportRepository(supabase_admin_client)
+        self.content_repo = ContentRepository(supabase_admin_client)
+        self.job_repo = JobRepository(supabase_admin_client)
+        self._tasks: Dict[str, asyncio.Task] = {}
+    
+    def start(self, record: Dict[str, Any]):
+        """Run an import in the background"""
+        import_id = str(record["id"])
+        task = asyncio.create_task(self.run(record))
+        self._tasks[import_id] = task
+        task.add_done_callback(lambda _: self._tasks.pop(import_id, None))
+    
+    async def shutdown(self):
+        """Cancel running imports"""
+        tasks = list(self._tasks.values())
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+    
+    async def discover(self, source_url: str, max_entries: int) -> List[str]:
+        """
+        Entry URLs listed by a sitemap (following sitemap indexes) or feed,
+        de-duplicated and in document order
+        """
+        from services.http_client import http_client
+        
+        entries: Dict[str, None] = {}
+        seen_sitemaps = set()
+        queue = [(source_url, 0)]
+        
+        while queue and len(entries) < max_entries:
+            url, depth = queue.pop(0)
+            if url in seen_sitemaps:
+                continue
+            seen_sitemaps.add(url)
+            
+            try:
+                response = await http_client.fetch(url, max_bytes=MAX_SITEMAP_BYTES)
+                if response.status != 200:
+                    raise ValueError(f"HTTP {response.status}")
+                found, children = await asyncio.to_thread(parse_feed, response.body, response.url)
+            except Exception as e:
+                if depth == 0:
+                    raise ValueError(f"Failed to read {url}: {e}")
+                # A broken child sitemap shouldn't sink the whole import
+                logger.warning(f"Skipping sitemap {url}: {e}")
+                continue
+            
+            for entry in found:
+                entries.setdefault(entry, None)
+            if depth < MAX_SITEMAP_DEPTH:
+                queue.extend((child, depth + 1) for child in children)
+        
+        return list(entries)[:max_entries]
+    
+    async def run(self, record: Dict[str, Any]):
+        """Discover, fetch, extract and store every entry of an import"""
+        import_id = record["id"]
+        counts = {
+            "total_entries": 0,
+            "processed_entries": 0,
+            "created_entries": 0,
+            "skipped_entries": 0,
+            "failed_entries": 0
+        }
+        errors: List[Dict[str, str]] = []
+        
+        try:
+            # Every job of the import would fail on an unknown platform
+            unsupported = unsupported_platforms(record["platforms"])
+            if unsupported:
+                raise ValueError(f"Unsupported platforms: {', '.join(unsupported)}")
+            
+            await self.import_repo.update(import_id, {
+                "status": "discovering",
+                "started_at": datetime.utcnow().isoformat()
+            })
+            
+            urls = await self.discover(record["source_url"], record["max_entries"])
+            existing = set(await self.content_repo.get_existing_source_urls(record["user_id"], urls))
+            pending = [url for url in urls if url not in existing]
+            
+            counts["total_entries"] = len(urls)
+            counts["skipped_entries"] = counts["processed_entries"] = len(urls) - len(pending)
+            await self.import_repo.update(import_id, {"status": "importing", **counts})
+            logger.info(f"Import {import_id}: {len(urls)} entries, {len(pending)} new")
+            
+            await self._import_entries(record, pending, counts, errors)
+            
+            await self.import_repo.update(import_id, {
+                "status": "completed",
+                "completed_at": datetime.utcnow().isoformat(),
+                "errors": errors,
+                **counts
+            })
+            logger.info(
+                f"Import {import_id} completed: {counts['created_entries']} created, "
+                f"{counts['skipped_entries']} skipped, {counts['failed_entries']} failed"
+            )
+        
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.error(f"Import {import_id} failed: {e}")
+            try:
+                await self.import_repo.update(import_id, {
+                    "status": "failed",
+                    "error_message": str(e),
+                    "completed_at": datetime.utcnow().isoformat(),
+                    "errors": errors,
+                    **counts
+                })
+            except Exception as update_error:
+                logger.error(f"Failed to record import failure for {import_id}: {update_error}")
+    
+    async def _import_entries(
+        self,
+        record: Dict[str, Any],
+        urls: List[str],
+        counts: Dict[str, int],
+        errors: List[Dict[str, str]]
+    ):
+        throttle = DomainThrottle(
+            settings.IMPORT_PER_DOMAIN_CONCURRENCY,
+            settings.IMPORT_PER_DOMAIN_DELAY_MS / 1000
+        )
+        slots = asyncio.Semaphore(settings.IMPORT_CONCURRENCY)
+        batch_size = max(1, settings.IMPORT_BATCH_SIZE)
+        
+        tasks = [asyncio.create_task(self._fetch_entry(url, throttle, slots)) for url in urls]
+        batch: List[Tuple[str, Dict[str, Any]]] = []
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                url, extracted, error = await next_done
+                counts["processed_entries"] += 1
+                if error:
+                    self._record_failure(counts, errors, url, error)
+                else:
+                    batch.append((url, extracted))
+                
+                if len(batch) >= batch_size:
+                    await self._store_batch(record, batch, counts, errors)
+                    batch = []
+                    await self.import_repo.update(record["id"], dict(counts))
+            
+            if batch:
+                await self._store_batch(record, batch, counts, errors)
+        finally:
+            for task in tasks:
+                task.cancel()
+    
+    async def _fetch_entry(
+        self,
+        url: str,
+        throttle: DomainThrottle,
+        slots: asyncio.Semaphore
+    ) -> Tuple[str, Optional[Dict[str, Any]], Optional[str]]:
+        from services.extraction import extract_content_from_url
+        
+        try:
+            # Wait for the host first so one slow site doesn't hold global slots
+            async with throttle.slot(url), slots:
+                return url, await extract_content_from_url(url), None
+        except Exception as e:
+            return url, None, str(e)
+    
+    async def _store_batch(
+        self,
+        record: Dict[str, Any],
+        batch: List[Tuple[str, Dict[str, Any]]],
+        counts: Dict[str, int],
+        errors: List[Dict[str, str]]
+    ):
+        """Insert one batch of content rows and their pending jobs"""
+        content_rows = [
+            {
+                "user_id": str(record["user_id"]),
+                "title": (extracted.get("title") or "Untitled")[:500],
+                "original_text": extracted["text"],
+                "content_hash": compute_content_hash(extracted["text"]),
+                "sections": split_sections(extracted["text"]),
+                "source_type": "url",
+                "source_url": url,
+                "import_id": str(record["id"]),
+                "metadata": extracted.get("metadata", {})
+            }
+            for url, extracted in batch
+        ]
+        
+        contents = []
+        try:
+            contents = await self.content_repo.create_many(content_rows)
+            await self.job_repo.create_many([
+                {
+                    "content_id": content["id"],
+                    "user_id": str(record["user_id"]),
+                    "platforms": record["platforms"],
+                    "user_preferences": record.get("user_preferences") or {},
+                    "status": "pending"
+                }
+                for content in contents
+            ])
+            counts["created_entries"] += len(contents)
+        except Exception as e:
+            logger.error(f"Import {record['id']}: failed to store batch: {e}")
+            # Content rows without a job would be skipped as already imported
+            # on a re-import, so the failed entries could never be retried
+            if contents:
+                try:
+                    await self.content_repo.delete_many([content["id"] for content in contents])
+                except Exception as cleanup_error:
+                    logger.error(f"Import {record['id']}: failed to remove content of failed batch: {cleanup_error}")
+            for url, _ in batch:
+                self._record_failure(counts, errors, url, f"Failed to save: {e}")
+    
+    @staticmethod
+    def _record_failure(counts: Dict[str, int], errors: List[Dict[str, str]], url: str, error: str):
+        counts["failed_entries"] += 1
+        if len(errors) < MAX_RECORDED_ERRORS:
+            errors.append({"url": url, "error": error})
+
+
+bulk_importer = BulkImporter()
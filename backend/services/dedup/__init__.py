@@ -0,0 +1,38 @@
+"""
+Content deduplication services
+"""
+import hashlib
+import re
+import unicodedata
+
+_WHITESPACE_RE = re.compile(r"\s+")
+
+
+def normalize_text(text: str) -> str:
+    """
+    Normalize extracted text so that re-extractions of the same document
+    hash identically (Unicode NFKC, collapsed whitespace, trimmed)
+    """
+    text = unicodedata.normalize("NFKC", text or "")
+    return _WHITESPACE_RE.sub(" ", text).strip()
+
+
+def compute_content_hash(text: str) -> str:
+    """
+    SHA-256 hex digest of the normalized text
+    """
+    return hashlib.sha256(normalize_text(text).encode("utf-8")).hexdigest()
+
+
+from .minhash import compute_minhash, estimate_similarity, lsh_bands
+from .sections import split_sections, changed_sections
+
+__all__ = [
+    "normalize_text",
+    "compute_content_hash",
+    "compute_minhash",
+    "estimate_similarity",
+    "lsh_bands",
+    "split_sections",
+    "changed_sections",
+]
@@ -0,0 +1,85 @@
+"""
+MinHash signatures and LSH banding for near-duplicate detection
+"""
+import hashlib
+import re
+import zlib
+from typing import List
+
+import numpy as np
+
+from . import normalize_text
+
+NUM_PERM = 128
+LSH_BANDS = 32
+SHINGLE_SIZE = 5
+
+_MERSENNE_PRIME = np.uint64((1 << 61) - 1)
+_MAX_HASH = np.uint64((1 << 32) - 1)
+_CHUNK_ROWS = 4096
+_WORD_RE = re.compile(r"\w+")
+
+# Fixed seed so signatures are comparable across processes and restarts
+_rng = np.random.RandomState(1)
+_PERM_A = _rng.randint(1, 1 << 32, size=NUM_PERM, dtype=np.uint64)
+_PERM_B = _rng.randint(0, 1 << 32, size=NUM_PERM, dtype=np.uint64)
+_SHINGLE_MULTIPLIERS = _rng.randint(1, 1 << 32, size=SHINGLE_SIZE, dtype=np.uint64)
+
+
+def shingle_hashes(text: str, size: int = SHINGLE_SIZE) -> np.ndarray:
+    """
+    Unique 32-bit hashes of the word-level shingles in text
+    """
+    words = _WORD_RE.findall(normalize_text(text).lower())
+    if not words:
+        return np.empty(0, dtype=np.uint64)
+    
+    word_hashes = np.fromiter((zlib.crc32(w.encode("utf-8")) for w in words), dtype=np.uint64, count=len(words))
+    size = min(size, len(word_hashes))
+    count = len(word_hashes) - size + 1
+    
+    # Combine each window of `size` word hashes (uint64 arithmetic wraps)
+    combined = np.zeros(count, dtype=np.uint64)
+    for offset in range(size):
+        combined += word_hashes[offset:offset + count] * _SHINGLE_MULTIPLIERS[offset]
+    combined ^= combined >> np.uint64(32)
+    
+    return np.unique(combined & _MAX_HASH)
+
+
+def compute_minhash(text: str) -> np.ndarray:
+    """
+    MinHash signature (NUM_PERM uint32 values) of the text's shingle set
+    """
+    hashes = shingle_hashes(text)
+    signature = np.full(NUM_PERM, _MAX_HASH, dtype=np.uint64)
+    
+    # Chunk rows to keep the (shingles x permutations) matrix bounded
+    for start in range(0, len(hashes), _CHUNK_ROWS):
+        chunk = hashes[start:start + _CHUNK_ROWS, np.newaxis]
+        permuted = ((chunk * _PERM_A + _PERM_B) % _MERSENNE_PRIME) & _MAX_HASH
+        np.minimum(signature, permuted.min(axis=0), out=signature)
+    
+    return signature
+
+
+def estimate_similarity(a, b) -> float:
+    """
+    Estimated Jaccard similarity of two signatures
+    """
+    a = np.asarray(a, dtype=np.uint64)
+    b = np.asarray(b, dtype=np.uint64)
+    if a.shape != b.shape or not a.size:
+        return 0.0
+    return float(np.mean(a == b))
+
+
+def lsh_bands(signature, bands: int = LSH_BANDS) -> List[str]:
+    """
+    Band keys for LSH lookup; signatures sharing any key are candidates
+    """
+    rows = np.asarray(signature, dtype=np.uint64).reshape(bands, -1)
+    return [
+        f"{i}:{hashlib.blake2b(row.tobytes(), digest_size=8).hexdigest()}"
+        for i, row in enumerate(rows)
+    ]
@@ -0,0 +1,147 @@
+"""
+Content-defined sections for incremental reprocessing
+
+Text is cut into sections at boundaries chosen by the content itself
+(headings, and paragraphs whose hash falls on a boundary value) rather than
+at fixed offsets, so editing one part of a document leaves the other
+sections, and their hashes, unchanged. Comparing the section hashes of two
+revisions tells which parts actually changed.
+"""
+import hashlib
+import re
+from collections import Counter
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from . import normalize_text
+
+# Sections are at least MIN and at most MAX characters (a single paragraph
+# may exceed MAX only if it has no line or sentence breaks). Past MIN, a
+# paragraph ends its section when its hash is 0 mod BOUNDARY_DIVISOR.
+SECTION_MIN_CHARS = 1000
+SECTION_MAX_CHARS = 6000
+BOUNDARY_DIVISOR = 4
+
+_BLANK_LINE_RE = re.compile(r"\n[ \t\r\f\v]*\n\s*")
+_LINE_RE = re.compile(r"\n\s*")
+_SENTENCE_RE = re.compile(r"(?<=[.!?])\s+")
+_MARKDOWN_HEADING_RE = re.compile(r"#{1,6}\s+\S")
+_SLIDE_RE = re.compile(r"--- Slide \d+ ---")
+_HEADING_MAX_CHARS = 80
+
+
+def split_sections(text: str) -> List[Dict[str, Any]]:
+    """
+    Split text into content-defined sections.
+    
+    Returns one {"hash", "heading", "start", "end"} dict per section, where
+    hash is the SHA-256 of the section's normalized text and start/end are
+    offsets into text.
+    """
+    sections = []
+    start = end = None
+    heading: Optional[str] = None
+    
+    def close():
+        sections.append({
+            "hash": hashlib.sha256(normalize_text(text[start:end]).encode("utf-8")).hexdigest(),
+            "heading": heading,
+            "start": start,
+            "end": end
+        })
+    
+    for p_start, p_end in _paragraphs(text):
+        paragraph = text[p_start:p_end]
+        is_heading = _is_heading(paragraph)
+        
+        if start is not None and (
+            (is_heading and end - start >= SECTION_MIN_CHARS // 4)
+            or p_end - start > SECTION_MAX_CHARS
+        ):
+            close()
+            start = None
+        
+        if start is None:
+            start, heading = p_start, None
+        if is_heading and heading is None:
+            heading = normalize_text(paragraph.split("\n", 1)[0]).strip("#- ")[:200]
+        end = p_end
+        
+        if end - start >= SECTION_MIN_CHARS and _is_boundary(paragraph):
+            close()
+            start = None
+    
+    if start is not None:
+        close()
+    return sections
+
+
+def changed_sections(
+    previous: List[Dict[str, Any]],
+    current: List[Dict[str, Any]]
+) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
+    """
+    Compare two revisions' sections by hash. Returns (added, removed):
+    sections of current with no match in previous, and sections of previous
+    with no match in current. Moved sections count as unchanged.
+    """
+    unmatched = Counter(section["hash"] for section in previous)
+    added = []
+    for section in current:
+        if unmatched[section["hash"]] > 0:
+            unmatched[section["hash"]] -= 1
+        else:
+            added.append(section)
+    
+    removed = []
+    for section in previous:
+        if unmatched[section["hash"]] > 0:
+            unmatched[section["hash"]] -= 1
+            removed.append(section)
+    return added, removed
+
+
+def _paragraphs(text: str) -> Iterator[Tuple[int, int]]:
+    """Spans of the non-blank paragraphs, long ones broken at lines, then sentences"""
+    for start, end in _spans(text, 0, len(text), _BLANK_LINE_RE):
+        if end - start <= SECTION_MAX_CHARS:
+            yield start, end
+            continue
+        for line_start, line_end in _spans(text, start, end, _LINE_RE):
+            if line_end - line_start <= SECTION_MAX_CHARS:
+                yield line_start, line_end
+            else:
+                yield from _spans(text, line_start, line_end, _SENTENCE_RE)
+
+
+def _spans(text: str, start: int, end: int, separator: re.Pattern) -> Iterator[Tuple[int, int]]:
+    """Spans of text[start:end] between separator matches, trimmed, skipping blank ones"""
+    position = start
+    for match in separator.finditer(text, start, end):
+        yield from _trimmed(text, position, match.start())
+        position = match.end()
+    yield from _trimmed(text, position, end)
+
+
+def _trimmed(text: str, start: int, end: int) -> Iterator[Tuple[int, int]]:
+    while start < end and text[start].isspace():
+        start += 1
+    while end > start and text[end - 1].isspace():
+        end -= 1
+    if start < end:
+        yield start, end
+
+
+def _is_heading(paragraph: str) -> bool:
+    """Markdown headings, slide markers and short single lines without closing punctuation"""
+    if _MARKDOWN_HEADING_RE.match(paragraph) or _SLIDE_RE.match(paragraph):
+        return True
+    return (
+        len(paragraph) <= _HEADING_MAX_CHARS
+        and "\n" not in paragraph
+        and paragraph[-1] not in ".!?:;,"
+    )
+
+
+def _is_boundary(paragraph: str) -> bool:
+    digest = hashlib.sha256(normalize_text(paragraph).encode("utf-8")).digest()
+    return int.from_bytes(digest[:4], "big") % BOUNDARY_DIVISOR == 0
@@ -1,28 +1,100 @@
 """
 Content extraction services
 """
-from typing import Dict, Any
-import io
+from typing import Dict, Any, Optional, Callable, Awaitable
+import asyncio
+import os
 from loguru import logger
 
+from core.config import settings
+from .cache import EXTRACTOR_VERSION, ExtractionCache, file_sha256
+from .pool import WorkerDiedError, run_in_pool, shutdown_extraction_pool
+from .ooxml import extract_docx, extract_pptx
+from .pdf import extract_pdf
+from .uploads import RawInputStore, SpooledUpload, UploadTooLargeError, spool_upload
+from .url_cache import CachedPage, UrlFetchCache
+from .webpage import parse_html
 
-async def extract_content_from_file(file_content: bytes, filename: str) -> Dict[str, Any]:
+
+extraction_cache = ExtractionCache(
+    memory_max_bytes=settings.EXTRACTION_CACHE_MEMORY_MB * 1024 * 1024,
+    directory=settings.EXTRACTION_CACHE_DIR,
+    disk_max_bytes=settings.EXTRACTION_CACHE_DISK_MB * 1024 * 1024
+)
+url_cache = UrlFetchCache(max_bytes=settings.URL_CACHE_MEMORY_MB * 1024 * 1024)
+raw_inputs = RawInputStore(settings.RAW_INPUT_DIR)
+
+
+ProgressCallback = Callable[[int, int], Awaitable[None]]
+
+
+async def extract_content_from_file(
+    file_path: str,
+    filename: str,
+    digest: Optional[str] = None,
+    on_progress: Optional[ProgressCallback] = None
+) -> Dict[str, Any]:
     """
-    Extract content from uploaded file
+    Extract content from an uploaded file spooled to disk
     Supports: PDF, DOCX, PPTX, TXT
+    
+    Results are cached by the file's SHA-256 (pass `digest` if it is already
+    known), so re-uploads of the same file skip parsing. `on_progress(done,
+    total)` is awaited as parts of a long document finish (PDF page ranges).
     """
-    # Determine file type
     ext = filename.rsplit('.', 1)[1].lower() if '.' in filename else ''
+    if not settings.EXTRACTION_CACHE_ENABLED:
+        return await _extract(file_path, filename, ext, on_progress)
+    
+    digest = digest or await asyncio.to_thread(file_sha256, file_path)
+    if ext == 'pdf':
+        variant = f"{ext}:{settings.PDF_MAX_PAGES}"
+    elif ext in ('docx', 'pptx'):
+        variant = f"{ext}:{settings.OFFICE_PARSER}"
+    else:
+        variant = ext
+    key = extraction_cache.key(digest, variant)
+    
+    cached = await extraction_cache.get(key)
+    if cached is not None:
+        logger.info(f"Extraction cache hit for {filename}")
+        result = {**cached, "metadata": dict(cached.get("metadata") or {})}
+        # Titles derived from the filename follow the new upload's name
+        if not result["metadata"].get('original_title'):
+            result["title"] = filename.rsplit('.', 1)[0]
+        return result
+    
+    result = await _extract(file_path, filename, ext, on_progress)
+    await extraction_cache.put(key, result)
+    return result
+
+
+async def _extract(
+    file_path: str,
+    filename: str,
+    ext: str,
+    on_progress: Optional[ProgressCallback] = None
+) -> Dict[str, Any]:
+    """
+    Run the extractor for a file type
     
+    Extractors open the file by path, so only the path crosses into the
+    worker process and no in-memory copies of the document are made.
+    Binary formats are parsed in the extraction process pool so large
+    documents don't block the event loop. DOCX/PPTX use the streaming
+    zip/iterparse extractor unless OFFICE_PARSER is "legacy".
+    """
     try:
         if ext == 'pdf':
-            return await _extract_from_pdf(file_content, filename)
+            return await extract_pdf(file_path, filename, on_progress)
         elif ext == 'docx':
-            return await _extract_from_docx(file_content, filename)
+            extractor = extract_docx if settings.OFFICE_PARSER == "stream" else _extract_from_docx
+            return await run_in_pool(extractor, file_path, filename)
         elif ext == 'pptx':
-            return await _extract_from_pptx(file_content, filename)
+            extractor = extract_pptx if settings.OFFICE_PARSER == "stream" else _extract_from_pptx
+            return await run_in_pool(extractor, file_path, filename)
         elif ext == 'txt':
-            return await _extract_from_txt(file_content, filename)
+            return await asyncio.to_thread(_extract_from_txt, file_path, filename)
         else:
             raise ValueError(f"Unsupported file type: {ext}")
     
@@ -31,57 +103,12 @@ async def extract_content_from_file(file_content: bytes, filename: str) -> Dict[
         raise ValueError(f"Failed to extract content from {filename}: {str(e)}")
 
 
-async def _extract_from_pdf(file_content: bytes, filename: str) -> Dict[str, Any]:
-    """Extract text from PDF using pdfplumber"""
-    import pdfplumber
-    
-    text_parts = []
-    metadata = {}
-    
-    try:
-        with pdfplumber.open(io.BytesIO(file_content)) as pdf:
-            metadata['page_count'] = len(pdf.pages)
-            
-            for page in pdf.pages:
-                page_text = page.extract_text()
-                if page_text:
-                    text_parts.append(page_text)
-            
-            # Try to extract title from metadata
-            if pdf.metadata:
-                title = pdf.metadata.get('Title') or pdf.metadata.get('title')
-                if title:
-                    metadata['original_title'] = title
-        
-        full_text = '\n\n'.join(text_parts)
-        
-        if not full_text.strip():
-            raise ValueError("PDF appears to be empty or contains no extractable text")
-        
-        metadata.update({
-            'word_count': len(full_text.split()),
-            'character_count': len(full_text),
-            'file_size': len(file_content)
-        })
-        
-        return {
-            "text": full_text,
-            "title": metadata.get('original_title') or filename.rsplit('.', 1)[0],
-            "source_type": "pdf",
-            "metadata": metadata
-        }
-    
-    except Exception as e:
-        logger.error(f"PDF extraction error: {e}")
-        raise ValueError(f"Failed to extract PDF content: {str(e)}")
-
-
-async def _extract_from_docx(file_content: bytes, filename: str) -> Dict[str, Any]:
+def _extract_from_docx(file_path: str, filename: str) -> Dict[str, Any]:
     """Extract text from DOCX using python-docx"""
     from docx import Document
     
     try:
-        doc = Document(io.BytesIO(file_content))
+        doc = Document(file_path)
         
         # Extract paragraphs
         text_parts = [para.text for para in doc.paragraphs if para.text.strip()]
@@ -95,7 +122,7 @@ async def _extract_from_docx(file_content: bytes, filename: str) -> Dict[str, An
             'paragraph_count': len(text_parts),
             'word_count': len(full_text.split()),
             'character_count': len(full_text),
-            'file_size': len(file_content)
+            'file_size': os.path.getsize(file_path)
         }
         
         # Try to get title from document properties
@@ -116,12 +143,12 @@ async def _extract_from_docx(file_content: bytes, filename: str) -> Dict[str, An
         raise ValueError(f"Failed to extract DOCX content: {str(e)}")
 
 
-async def _extract_from_pptx(file_content: bytes, filename: str) -> Dict[str, Any]:
+def _extract_from_pptx(file_path: str, filename: str) -> Dict[str, Any]:
     """Extract text from PPTX using python-pptx"""
     from pptx import Presentation
     
     try:
-        prs = Presentation(io.BytesIO(file_content))
+        prs = Presentation(file_path)
         
         text_parts = []
         slide_count = 0
@@ -146,7 +173,7 @@ async def _extract_from_pptx(file_content: bytes, filename: str) -> Dict[str, An
             'slide_count': slide_count,
             'word_count': len(full_text.split()),
             'character_count': len(full_text),
-            'file_size': len(file_content)
+            'file_size': os.path.getsize(file_path)
         }
         
         return {
@@ -161,9 +188,12 @@ async def _extract_from_pptx(file_content: bytes, filename: str) -> Dict[str, An
         raise ValueError(f"Failed to extract PPTX content: {str(e)}")
 
 
-async def _extract_from_txt(file_content: bytes, filename: str) -> Dict[str, Any]:
+def _extract_from_txt(file_path: str, filename: str) -> Dict[str, Any]:
     """Extract text from TXT file"""
     try:
+        with open(file_path, 'rb') as f:
+            file_content = f.read()
+        
         # Try UTF-8 first, then fallback to latin-1
         try:
             text = file_content.decode('utf-8')
@@ -176,7 +206,7 @@ async def _extract_from_txt(file_content: bytes, filename: str) -> Dict[str, Any
         metadata = {
             'word_count': len(text.split()),
             'character_count': len(text),
-            'file_size': len(file_content),
+            'file_size': os.path.getsize(file_path),
             'line_count': len(text.splitlines())
         }
         
@@ -195,58 +225,46 @@ async def _extract_from_txt(file_content: bytes, filename: str) -> Dict[str, Any
 async def extract_content_from_url(url: str) -> Dict[str, Any]:
     """
     Extract content from URL using web scraping
+    
+    Pages are fetched through the shared pooled HTTP client. Pages served
+    with an ETag or Last-Modified are cached and revalidated with a
+    conditional GET; a 304 reuses the cached extraction without downloading
+    or parsing the page again. Parsing runs in the extraction process pool,
+    so bulk imports can parse pages on every core.
     """
-    import aiohttp
-    from bs4 import BeautifulSoup
+    from services.http_client import http_client
     
     try:
-        async with aiohttp.ClientSession() as session:
-            async with session.get(url, timeout=30) as response:
-                if response.status != 200:
-                    raise ValueError(f"Failed to fetch URL: HTTP {response.status}")
-                
-                html = await response.text()
-        
-        # Parse HTML
-        soup = BeautifulSoup(html, 'html.parser')
-        
-        # Remove script and style elements
-        for script in soup(["script", "style", "nav", "footer", "header"]):
-            script.decompose()
-        
-        # Extract title
-        title = "Untitled"
-        if soup.title and soup.title.string:
-            title = soup.title.string.strip()
-        
-        # Extract main content
-        # Try to find main content area
-        main_content = soup.find('main') or soup.find('article') or soup.find('div', class_='content')
-        
-        if main_content:
-            text = main_content.get_text(separator='\n', strip=True)
-        else:
-            text = soup.get_text(separator='\n', strip=True)
-        
-        # Clean up excessive newlines
-        lines = [line.strip() for line in text.splitlines() if line.strip()]
-        text = '\n\n'.join(lines)
+        cached = url_cache.get(url) if settings.URL_CACHE_ENABLED else None
+        response = await http_client.fetch(url, headers=cached.conditional_headers() if cached else None)
         
-        if not text.strip():
-            raise ValueError("No extractable text found on the webpage")
+        if response.status == 304 and cached:
+            url_cache.revalidated += 1
+            if cached.extractor_version == EXTRACTOR_VERSION:
+                result = cached.result
+            else:
+                # Unchanged page, newer extractor: re-parse the cached body
+                result = await run_in_pool(parse_html, cached.body, cached.charset, url)
+                url_cache.put(CachedPage(url, cached.body, cached.charset, cached.etag, cached.last_modified, result))
+            logger.info(f"URL not modified, reusing cached extraction: {url}")
+            return {**result, "metadata": dict(result["metadata"])}
         
-        metadata = {
-            "url": url,
-            "word_count": len(text.split()),
-            "character_count": len(text)
-        }
+        if response.status != 200:
+            raise ValueError(f"Failed to fetch URL: HTTP {response.status}")
         
-        return {
-            "text": text,
-            "title": title,
-            "source_type": "url",
-            "metadata": metadata
-        }
+        result = await run_in_pool(parse_html, response.body, response.charset, url)
+        if settings.URL_CACHE_ENABLED:
+            if cached:
+                url_cache.refetched += 1
+            url_cache.put(CachedPage(
+                url=url,
+                body=response.body,
+                charset=response.charset,
+                etag=response.headers.get("ETag"),
+                last_modified=response.headers.get("Last-Modified"),
+                result=result
+            ))
+        return {**result, "metadata": dict(result["metadata"])}
     
     except Exception as e:
         logger.error(f"URL extraction error for {url}: {e}")
@@ -0,0 +1,174 @@
+"""
+Content-addressed cache of extraction results
+"""
+import asyncio
+import hashlib
+import json
+import os
+import tempfile
+from collections import OrderedDict
+from typing import Any, Dict, Optional
+from loguru import logger
+
+# Bump when any extractor's output changes so stale entries are ignored
+EXTRACTOR_VERSION = "4"
+
+
+def file_sha256(file_path: str, chunk_size: int = 1024 * 1024) -> str:
+    """SHA-256 of a file, read in chunks"""
+    digest = hashlib.sha256()
+    with open(file_path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class ExtractionCache:
+    """
+    Two-tier cache of extraction results keyed by file digest.
+    
+    The memory tier is an LRU bounded by the size of the cached text. The
+    disk tier stores one JSON file per key under `directory` and evicts the
+    least recently used files (by mtime, refreshed on hit) once it exceeds
+    `disk_max_bytes`. An empty directory disables the disk tier.
+    """
+    
+    def __init__(self, memory_max_bytes: int, directory: str = "", disk_max_bytes: int = 0):
+        self.memory_max_bytes = memory_max_bytes
+        self.directory = directory
+        self.disk_max_bytes = disk_max_bytes
+        self._memory: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._memory_sizes: Dict[str, int] = {}
+        self._memory_bytes = 0
+        self._disk_bytes: Optional[int] = None
+        self.hits = {"memory": 0, "disk": 0}
+        self.misses = 0
+    
+    @staticmethod
+    def key(digest: str, variant: str = "") -> str:
+        """Cache key for a file digest and extractor settings"""
+        return hashlib.sha256(f"{digest}:{variant}:{EXTRACTOR_VERSION}".encode()).hexdigest()
+    
+    async def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """Cached result for key, or None"""
+        result = self._memory.get(key)
+        if result is not None:
+            self._memory.move_to_end(key)
+            self.hits["memory"] += 1
+            return result
+        
+        if self.directory:
+            result = await asyncio.to_thread(self._read_disk, key)
+            if result is not None:
+                self._remember(key, result)
+                self.hits["disk"] += 1
+                return result
+        
+        self.misses += 1
+        return None
+    
+    async def put(self, key: str, result: Dict[str, Any]):
+        """Store a result in both tiers"""
+        self._remember(key, result)
+        if self.directory:
+            try:
+                await asyncio.to_thread(self._write_disk, key, result)
+            except OSError as e:
+                logger.warning(f"Failed to write extraction cache entry: {e}")
+    
+    def _remember(self, key: str, result: Dict[str, Any]):
+        size = len(result.get("text", ""))
+        if size > self.memory_max_bytes:
+            return
+        if key in self._memory:
+            self._memory_bytes -= self._memory_sizes[key]
+        self._memory[key] = result
+        self._memory.move_to_end(key)
+        self._memory_sizes[key] = size
+        self._memory_bytes += size
+        
+        while self._memory_bytes > self.memory_max_bytes:
+            evicted, _ = self._memory.popitem(last=False)
+            self._memory_bytes -= self._memory_sizes.pop(evicted)
+    
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, key[:2], f"{key}.json")
+    
+    def _read_disk(self, key: str) -> Optional[Dict[str, Any]]:
+        path = self._path(key)
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                result = json.load(f)
+            # Refresh mtime so eviction is least-recently-used
+            os.utime(path)
+            return result
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as e:
+            logger.warning(f"Discarding unreadable extraction cache entry {path}: {e}")
+            try:
+                os.unlink(path)
+            except OSError:
+                pass
+            return None
+    
+    def _write_disk(self, key: str, result: Dict[str, Any]):
+        path = self._path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        data = json.dumps(result).encode("utf-8")
+        
+        # Write then rename so readers never see a partial entry
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            os.replace(tmp_path, path)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+        
+        if self._disk_bytes is None:
+            self._disk_bytes = self._scan_disk_bytes()
+        else:
+            self._disk_bytes += len(data)
+        if self._disk_bytes > self.disk_max_bytes:
+            self._evict_disk()
+    
+    def _entries(self):
+        for root, _, files in os.walk(self.directory):
+            for name in files:
+                if name.endswith(".json"):
+                    path = os.path.join(root, name)
+                    try:
+                        stat = os.stat(path)
+                    except FileNotFoundError:
+                        continue
+                    yield path, stat.st_size, stat.st_mtime
+    
+    def _scan_disk_bytes(self) -> int:
+        return sum(size for _, size, _ in self._entries())
+    
+    def _evict_disk(self):
+        """Delete least recently used entries until under 90% of the limit"""
+        entries = sorted(self._entries(), key=lambda entry: entry[2])
+        total = sum(size for _, size, _ in entries)
+        target = self.disk_max_bytes * 0.9
+        for path, size, _ in entries:
+            if total <= target:
+                break
+            try:
+                os.unlink(path)
+                total -= size
+            except FileNotFoundError:
+                total -= size
+        self._disk_bytes = total
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """Get cache statistics"""
+        return {
+            "memory_entries": len(self._memory),
+            "memory_bytes": self._memory_bytes,
+            "disk_bytes": self._disk_bytes,
+            "hits": dict(self.hits),
+            "misses": self.misses
+        }
@@ -0,0 +1,258 @@
+"""
+Streaming DOCX/PPTX text extraction
+
+Reads the relevant XML parts straight out of the zip with lxml's iterparse
+instead of building python-docx/python-pptx object models. Finished
+paragraphs and table rows are cleared from the tree as soon as their text
+is taken, so memory stays flat however large the part is. Unlike the object
+model path this also picks up tables, text boxes, headers/footers and
+footnotes (DOCX) and speaker notes (PPTX).
+"""
+import os
+import posixpath
+import re
+import zipfile
+from collections import Counter
+from typing import Any, Dict, IO, Iterator, List, Optional
+
+from lxml import etree
+
+W_NS = "http://schemas.openxmlformats.org/wordprocessingml/2006/main"
+A_NS = "http://schemas.openxmlformats.org/drawingml/2006/main"
+P_NS = "http://schemas.openxmlformats.org/presentationml/2006/main"
+R_NS = "http://schemas.openxmlformats.org/officeDocument/2006/relationships"
+REL_NS = "http://schemas.openxmlformats.org/package/2006/relationships"
+DC_NS = "http://purl.org/dc/elements/1.1/"
+
+# Parts that inflate beyond this are refused (zip bombs)
+MAX_PART_BYTES = 256 * 1024 * 1024
+
+# Slide/notes placeholders that only hold furniture, not content
+_SKIP_PLACEHOLDERS = {"sldNum", "dt", "ftr", "hdr", "sldImg"}
+_DOCX_EXTRA_PARTS = re.compile(r"word/(header\d*|footer\d*|footnotes|endnotes)\.xml")
+_WHITESPACE = re.compile(r"\s+")
+
+
+def extract_docx(file_path: str, filename: str) -> Dict[str, Any]:
+    """Extract text from a DOCX: body paragraphs and tables, then headers, footers and notes"""
+    with zipfile.ZipFile(file_path) as zf:
+        counts: Counter = Counter()
+        with _open_part(zf, "word/document.xml") as part:
+            body = list(_iter_blocks(part, W_NS, counts))
+        
+        # Headers/footers repeat per section; keep each distinct block once
+        seen = set(body)
+        extra = []
+        for name in sorted(n for n in zf.namelist() if _DOCX_EXTRA_PARTS.fullmatch(n)):
+            with _open_part(zf, name) as part:
+                for block in _iter_blocks(part, W_NS, Counter()):
+                    if block not in seen:
+                        seen.add(block)
+                        extra.append(block)
+        
+        title = _core_title(zf)
+    
+    full_text = '\n\n'.join(body + extra)
+    if not full_text.strip():
+        raise ValueError("DOCX appears to be empty")
+    
+    metadata = {
+        'paragraph_count': counts["paragraphs"],
+        'table_count': counts["tables"],
+        'word_count': len(full_text.split()),
+        'character_count': len(full_text),
+        'file_size': os.path.getsize(file_path)
+    }
+    if title:
+        metadata['original_title'] = title
+    
+    return {
+        "text": full_text,
+        "title": title or filename.rsplit('.', 1)[0],
+        "source_type": "docx",
+        "metadata": metadata
+    }
+
+
+def extract_pptx(file_path: str, filename: str) -> Dict[str, Any]:
+    """Extract text from a PPTX: slide text and tables in slide order, with speaker notes"""
+    with zipfile.ZipFile(file_path) as zf:
+        counts: Counter = Counter()
+        text_parts = []
+        slides = _slide_parts(zf)
+        
+        for number, slide in enumerate(slides, 1):
+            with _open_part(zf, slide) as part:
+                lines = list(_iter_blocks(part, A_NS, counts))
+            
+            notes = []
+            notes_part = _related_part(zf, slide, "/notesSlide")
+            if notes_part:
+                with _open_part(zf, notes_part) as part:
+                    notes = list(_iter_blocks(part, A_NS, Counter()))
+            if notes:
+                counts["notes"] += 1
+                lines.append("Notes: " + " ".join(notes))
+            
+            if lines:
+                text_parts.append(f"--- Slide {number} ---\n" + '\n'.join(lines))
+    
+    full_text = '\n\n'.join(text_parts)
+    if not full_text.strip():
+        raise ValueError("PPTX appears to be empty or contains no extractable text")
+    
+    metadata = {
+        'slide_count': len(slides),
+        'notes_count': counts["notes"],
+        'table_count': counts["tables"],
+        'word_count': len(full_text.split()),
+        'character_count': len(full_text),
+        'file_size': os.path.getsize(file_path)
+    }
+    
+    return {
+        "text": full_text,
+        "title": filename.rsplit('.', 1)[0],
+        "source_type": "pptx",
+        "metadata": metadata
+    }
+
+
+def _iter_blocks(source: IO[bytes], ns: str, counts: Counter) -> Iterator[str]:
+    """
+    Yield the text of each paragraph, and each table row as "cell | cell",
+    in document order. Works for WordprocessingML (w:) and DrawingML (a:)
+    text, which share the p/t/tbl/tr/tc structure.
+    """
+    P, T, TBL, TR, TC, BR, TAB = (f"{{{ns}}}{name}" for name in ("p", "t", "tbl", "tr", "tc", "br", "tab"))
+    SP, PH = f"{{{P_NS}}}sp", f"{{{P_NS}}}ph"
+    
+    paragraphs: List[List[str]] = []  # open paragraphs; text boxes nest them
+    tables: List[Dict[str, List[str]]] = []  # open tables, innermost last
+    skip_shape = False
+    
+    context = etree.iterparse(
+        source,
+        events=("start", "end"),
+        resolve_entities=False,
+        no_network=True,
+        remove_comments=True,
+        remove_pis=True
+    )
+    for event, elem in context:
+        tag = elem.tag
+        if event == "start":
+            if tag == P:
+                paragraphs.append([])
+            elif tag == TBL:
+                tables.append({"row": [], "cell": []})
+                counts["tables"] += 1
+            elif tag == TR:
+                tables[-1]["row"] = []
+            elif tag == TC:
+                tables[-1]["cell"] = []
+            continue
+        
+        if tag == T:
+            if paragraphs and elem.text:
+                paragraphs[-1].append(elem.text)
+        elif tag in (BR, TAB):
+            if paragraphs:
+                paragraphs[-1].append(" ")
+        elif tag == PH:
+            skip_shape = elem.get("type") in _SKIP_PLACEHOLDERS
+        elif tag == SP:
+            skip_shape = False
+        elif tag == P:
+            text = _clean("".join(paragraphs.pop()))
+            if text and not skip_shape:
+                if tables:
+                    tables[-1]["cell"].append(text)
+                else:
+                    counts["paragraphs"] += 1
+                    yield text
+        elif tag == TC:
+            tables[-1]["row"].append(" ".join(tables[-1]["cell"]))
+        elif tag == TR:
+            cells = [cell for cell in tables[-1]["row"] if cell]
+            if cells:
+                line = " | ".join(cells)
+                # A nested table's rows belong to the enclosing cell
+                if len(tables) > 1:
+                    tables[-2]["cell"].append(line)
+                else:
+                    yield line
+        elif tag == TBL:
+            tables.pop()
+        
+        # Drop finished blocks (and everything before them) from the tree
+        if tag == TR or (tag in (P, TBL) and not paragraphs and not tables):
+            elem.clear()
+            parent = elem.getparent()
+            if parent is not None:
+                while elem.getprevious() is not None:
+                    del parent[0]
+
+
+def _open_part(zf: zipfile.ZipFile, name: str) -> IO[bytes]:
+    try:
+        info = zf.getinfo(name)
+    except KeyError:
+        raise ValueError(f"Missing document part: {name}")
+    if info.file_size > MAX_PART_BYTES:
+        raise ValueError(f"Document part {name} is too large ({info.file_size} bytes uncompressed)")
+    return zf.open(info)
+
+
+def _read_xml(zf: zipfile.ZipFile, name: str):
+    """Parse a small part (rels, presentation.xml, core properties) in one go"""
+    parser = etree.XMLParser(resolve_entities=False, no_network=True)
+    with _open_part(zf, name) as part:
+        return etree.parse(part, parser).getroot()
+
+
+def _relationships(zf: zipfile.ZipFile, part_name: str) -> Dict[str, Dict[str, str]]:
+    """Relationship id -> {type, target part name} for a part"""
+    directory, base = posixpath.split(part_name)
+    rels_name = posixpath.join(directory, "_rels", base + ".rels")
+    if rels_name not in zf.NameToInfo:
+        return {}
+    
+    relationships = {}
+    for rel in _read_xml(zf, rels_name).iterfind(f"{{{REL_NS}}}Relationship"):
+        if rel.get("TargetMode") == "External":
+            continue
+        target = posixpath.normpath(posixpath.join(directory, rel.get("Target", "")))
+        relationships[rel.get("Id")] = {"type": rel.get("Type", ""), "target": target}
+    return relationships
+
+
+def _related_part(zf: zipfile.ZipFile, part_name: str, type_suffix: str) -> Optional[str]:
+    for rel in _relationships(zf, part_name).values():
+        if rel["type"].endswith(type_suffix) and rel["target"] in zf.NameToInfo:
+            return rel["target"]
+    return None
+
+
+def _slide_parts(zf: zipfile.ZipFile) -> List[str]:
+    """Slide part names in presentation order"""
+    relationships = _relationships(zf, "ppt/presentation.xml")
+    presentation = _read_xml(zf, "ppt/presentation.xml")
+    
+    slides = []
+    for slide_id in presentation.iterfind(f".//{{{P_NS}}}sldId"):
+        rel = relationships.get(slide_id.get(f"{{{R_NS}}}id"))
+        if rel and rel["target"] in zf.NameToInfo:
+            slides.append(rel["target"])
+    return slides
+
+
+def _core_title(zf: zipfile.ZipFile) -> Optional[str]:
+    if "docProps/core.xml" not in zf.NameToInfo:
+        return None
+    title = _read_xml(zf, "docProps/core.xml").findtext(f"{{{DC_NS}}}title")
+    return _clean(title) if title and title.strip() else None
+
+
+def _clean(text: str) -> str:
+    return _WHITESPACE.sub(" ", text).strip()
@@ -0,0 +1,183 @@
+"""
+PDF text extraction, split into page ranges across worker processes
+
+Pages are read with a fast text-only pass (pypdfium2) and fall back to
+pdfplumber's layout analysis only where the fast pass returns nothing
+usable. metadata['page_tiers'] records which tier produced each page.
+"""
+import asyncio
+import os
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+from loguru import logger
+
+from core.config import settings
+from .pool import run_in_pool
+
+
+# Characters expected in real text; a page mostly made of anything else is
+# treated as a failed fast pass (broken font encodings, CID garbage)
+_PLAIN_PUNCTUATION = set(" \n\t.,;:!?'\"()[]{}-–—/&%$€£@#*+=<>_|~`^•…“”‘’")
+
+TIER_FAST = "pdfium"
+TIER_LAYOUT = "pdfplumber"
+
+
+def pdf_info(file_path: str) -> Dict[str, Any]:
+    """Page count and document title, without extracting any text"""
+    try:
+        import pypdfium2 as pdfium
+    except ImportError:
+        pdfium = None
+    
+    if pdfium:
+        doc = pdfium.PdfDocument(file_path)
+        try:
+            return {"page_count": len(doc), "title": doc.get_metadata_dict().get("Title") or None}
+        finally:
+            doc.close()
+    
+    import pdfplumber
+    
+    with pdfplumber.open(file_path) as pdf:
+        title = None
+        if pdf.metadata:
+            title = pdf.metadata.get('Title') or pdf.metadata.get('title')
+        return {"page_count": len(pdf.pages), "title": title}
+
+
+def looks_like_text(text: Optional[str]) -> bool:
+    """Whether a fast-pass page result is usable prose rather than garbage"""
+    if not text or not text.strip():
+        return False
+    if "\ufffd" in text or "(cid:" in text:
+        return False
+    plain = sum(1 for c in text if c.isalnum() or c in _PLAIN_PUNCTUATION)
+    return plain / len(text) >= 0.9
+
+
+def _fast_page_texts(file_path: str, start: int, end: int) -> List[Optional[str]]:
+    """Text of each page via pdfium, or Nones if it isn't installed"""
+    try:
+        import pypdfium2 as pdfium
+    except ImportError:
+        return [None] * (end - start)
+    
+    doc = pdfium.PdfDocument(file_path)
+    try:
+        texts = []
+        for index in range(start, end):
+            page = doc[index]
+            textpage = page.get_textpage()
+            try:
+                texts.append(textpage.get_text_bounded().replace("\r\n", "\n"))
+            except Exception:
+                texts.append(None)
+            finally:
+                textpage.close()
+                page.close()
+        return texts
+    finally:
+        doc.close()
+
+
+def extract_page_range(file_path: str, start: int, end: int) -> List[Tuple[Optional[str], str]]:
+    """
+    (text, tier) for pages [start, end).
+    
+    Each page is read with the fast pdfium text pass first; pdfplumber's
+    layout analysis only runs for pages where that yields nothing usable.
+    """
+    results: List[Tuple[Optional[str], str]] = []
+    fallback_pages = []
+    for offset, text in enumerate(_fast_page_texts(file_path, start, end)):
+        if looks_like_text(text):
+            results.append((text, TIER_FAST))
+        else:
+            results.append((None, TIER_LAYOUT))
+            fallback_pages.append(start + offset + 1)
+    
+    if fallback_pages:
+        import pdfplumber
+        
+        with pdfplumber.open(file_path, pages=fallback_pages) as pdf:
+            for page in pdf.pages:
+                results[page.page_number - 1 - start] = (page.extract_text(), TIER_LAYOUT)
+                # Drop the page's parsed layout so memory stays flat on long ranges
+                page.close()
+    
+    return results
+
+
+def page_ranges(page_count: int, pages_per_task: int) -> List[range]:
+    """Split [0, page_count) into consecutive ranges of pages_per_task"""
+    pages_per_task = max(1, pages_per_task)
+    return [
+        range(start, min(start + pages_per_task, page_count))
+        for start in range(0, page_count, pages_per_task)
+    ]
+
+
+async def extract_pdf(
+    file_path: str,
+    filename: str,
+    on_progress: Optional[Callable[[int, int], Awaitable[None]]] = None
+) -> Dict[str, Any]:
+    """
+    Extract text from a PDF, pdfium first and pdfplumber per page as needed.
+    
+    Documents longer than PDF_PAGES_PER_TASK are split into page ranges that
+    are extracted in parallel in the extraction pool and reassembled in
+    order. Pages beyond PDF_MAX_PAGES are skipped and the result is marked
+    as truncated. `on_progress(done, total)` is awaited as each range
+    finishes.
+    """
+    try:
+        info = await run_in_pool(pdf_info, file_path)
+        page_count = info["page_count"]
+        pages_to_extract = min(page_count, settings.PDF_MAX_PAGES) if settings.PDF_MAX_PAGES else page_count
+        
+        ranges = page_ranges(pages_to_extract, settings.PDF_PAGES_PER_TASK)
+        done = 0
+        
+        async def extract_range(r: range) -> List[Tuple[Optional[str], str]]:
+            nonlocal done
+            chunk = await run_in_pool(extract_page_range, file_path, r.start, r.stop)
+            done += 1
+            if on_progress:
+                await on_progress(done, len(ranges))
+            return chunk
+        
+        chunks = await asyncio.gather(*(extract_range(r) for r in ranges))
+        pages = [page for chunk in chunks for page in chunk]
+        text_parts = [text for text, _ in pages if text]
+        page_tiers = [tier for _, tier in pages]
+        full_text = '\n\n'.join(text_parts)
+        
+        if not full_text.strip():
+            raise ValueError("PDF appears to be empty or contains no extractable text")
+        
+        metadata = {
+            'page_count': page_count,
+            'word_count': len(full_text.split()),
+            'character_count': len(full_text),
+            'file_size': os.path.getsize(file_path),
+            'page_tiers': page_tiers,
+            'tier_counts': {tier: page_tiers.count(tier) for tier in (TIER_FAST, TIER_LAYOUT)}
+        }
+        if info["title"]:
+            metadata['original_title'] = info["title"]
+        if pages_to_extract < page_count:
+            metadata['truncated'] = True
+            metadata['pages_extracted'] = pages_to_extract
+            logger.warning(f"{filename}: extracted first {pages_to_extract} of {page_count} pages")
+        
+        return {
+            "text": full_text,
+            "title": metadata.get('original_title') or filename.rsplit('.', 1)[0],
+            "source_type": "pdf",
+            "metadata": metadata
+        }
+    
+    except Exception as e:
+        logger.error(f"PDF extraction error: {e}")
+        raise ValueError(f"Failed to extract PDF content: {str(e)}")
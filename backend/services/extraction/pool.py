@@ -0,0 +1,279 @@
+"""
+Sandboxed worker processes for CPU-heavy document extraction
+
+Untrusted documents are parsed in separate worker processes, each with an
+address-space rlimit and a per-task CPU-time rlimit, and the API process
+kills a worker outright when a task overruns its wall-clock timeout. Every
+worker has its own pipe, so a worker that crashes, hits a limit or is killed
+only fails the task it was running; the next task gets a fresh worker.
+"""
+import asyncio
+import multiprocessing
+import os
+import signal
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, List, Optional
+from loguru import logger
+
+from core.config import settings
+
+_pool: Optional["SandboxPool"] = None
+
+
+class WorkerDiedError(RuntimeError):
+    """The worker running a task exited before returning a result"""
+
+
+def _worker_count() -> int:
+    return settings.EXTRACTION_WORKERS or os.cpu_count() or 1
+
+
+def _mp_context():
+    """
+    Workers are never forked from the API process: forking a process that
+    runs an event loop and client threads can deadlock the child. Prefer a
+    forkserver with the extractors preloaded (fast worker start, no re-import
+    of the app's main module), else spawn.
+    """
+    if "forkserver" in multiprocessing.get_all_start_methods():
+        context = multiprocessing.get_context("forkserver")
+        context.set_forkserver_preload(["services.extraction"])
+        return context
+    return multiprocessing.get_context("spawn")
+
+
+def _cpu_time() -> float:
+    import resource
+    usage = resource.getrusage(resource.RUSAGE_SELF)
+    return usage.ru_utime + usage.ru_stime
+
+
+def _apply_memory_limits(memory_bytes: int):
+    """Cap the worker's address space and disable core dumps"""
+    try:
+        import resource
+    except ImportError:
+        return
+    resource.setrlimit(resource.RLIMIT_CORE, (0, 0))
+    if memory_bytes:
+        resource.setrlimit(resource.RLIMIT_AS, (memory_bytes, memory_bytes))
+
+
+def _set_cpu_budget(cpu_seconds: int):
+    """
+    RLIMIT_CPU counts the whole life of the process, so before each task the
+    soft limit is moved to "CPU used so far + budget". Going over it gets the
+    worker SIGXCPU, which terminates it even inside C parsing code.
+    """
+    try:
+        import resource
+    except ImportError:
+        return
+    _, hard = resource.getrlimit(resource.RLIMIT_CPU)
+    soft = int(_cpu_time()) + cpu_seconds if cpu_seconds else hard
+    if hard != resource.RLIM_INFINITY:
+        soft = min(soft, hard)
+    resource.setrlimit(resource.RLIMIT_CPU, (soft, hard))
+
+
+def _worker_main(conn, memory_bytes: int, cpu_seconds: int):
+    """
+    Worker loop: receive (fn, args), send back ("ok", result), ("error",
+    exception), or ("oom", MemoryError) after hitting the memory limit
+    """
+    _apply_memory_limits(memory_bytes)
+    while True:
+        try:
+            fn, args = conn.recv()
+        except (EOFError, OSError):
+            return
+        
+        _set_cpu_budget(cpu_seconds)
+        try:
+            reply = ("ok", fn(*args))
+        except MemoryError:
+            reply = ("oom", MemoryError(f"Document needs more than {memory_bytes // (1024 * 1024)}MB to parse"))
+        except Exception as e:
+            reply = ("error", e)
+        
+        try:
+            conn.send(reply)
+        except Exception as e:
+            # Unpicklable result or exception
+            conn.send(("error", RuntimeError(f"{type(e).__name__}: {e}")))
+
+
+class _Worker:
+    """One sandboxed worker process and the parent's end of its pipe"""
+    
+    def __init__(self, context, memory_bytes: int, cpu_seconds: int):
+        self.conn, child_conn = context.Pipe()
+        self.process = context.Process(
+            target=_worker_main,
+            args=(child_conn, memory_bytes, cpu_seconds),
+            daemon=True
+        )
+        self.process.start()
+        child_conn.close()
+        self.tasks = 0
+    
+    def alive(self) -> bool:
+        return self.process.is_alive()
+    
+    def kill(self):
+        if self.process.is_alive():
+            self.process.kill()
+        self.process.join(timeout=5)
+    
+    def exit_reason(self) -> str:
+        """Why the worker exited, for the error message"""
+        self.process.join(timeout=5)
+        code = self.process.exitcode
+        if code is None:
+            return "stopped responding"
+        if code == -signal.SIGXCPU:
+            return f"exceeded its CPU time limit ({settings.EXTRACTION_CPU_SECONDS}s)"
+        if code == -signal.SIGKILL:
+            return "was killed (out of memory?)"
+        if code < 0:
+            return f"crashed ({signal.Signals(-code).name})"
+        return f"exited with status {code}"
+
+
+class SandboxPool:
+    """
+    A fixed number of sandboxed extraction workers.
+    
+    Tasks are sent to an idle worker over its pipe; at most one task runs per
+    worker. Workers are started on demand, recycled after
+    EXTRACTION_MAX_TASKS_PER_WORKER tasks, and discarded (and so replaced by
+    the next task) when they die or are killed.
+    """
+    
+    def __init__(self, workers: int, memory_bytes: int, cpu_seconds: int, max_tasks_per_worker: int):
+        self.size = workers
+        self.memory_bytes = memory_bytes
+        self.cpu_seconds = cpu_seconds
+        self.max_tasks_per_worker = max_tasks_per_worker
+        self._context = _mp_context()
+        self._idle: List[_Worker] = []
+        self._slots = asyncio.Semaphore(workers)
+        # Blocking pipe reads, one per busy worker, kept off the default executor
+        self._readers = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="extraction-reader")
+        self.replaced = 0
+        self.timeouts = 0
+    
+    async def run(self, fn: Callable[..., Any], args: tuple, timeout: float) -> Any:
+        async with self._slots:
+            worker = await self._checkout()
+            loop = asyncio.get_running_loop()
+            try:
+                worker.conn.send((fn, args))
+                status, payload = await asyncio.wait_for(
+                    loop.run_in_executor(self._readers, worker.conn.recv),
+                    timeout=timeout
+                )
+            except asyncio.TimeoutError:
+                self.timeouts += 1
+                await self._discard(worker)
+                raise TimeoutError(f"Extraction timed out after {timeout:g}s")
+            except (EOFError, OSError):
+                reason = await asyncio.to_thread(worker.exit_reason)
+                await self._discard(worker)
+                logger.error(f"Extraction worker {worker.process.pid} {reason}")
+                raise WorkerDiedError(f"Extraction worker {reason}")
+            except BaseException:
+                # Cancelled mid-task: the worker's state is unknown
+                await self._discard(worker)
+                raise
+            
+            if status == "oom":
+                # Its heap is fragmented or nearly exhausted; don't reuse it
+                await self._discard(worker)
+                raise payload
+            self._checkin(worker)
+            if status == "error":
+                raise payload
+            return payload
+    
+    async def _checkout(self) -> _Worker:
+        while self._idle:
+            worker = self._idle.pop()
+            if worker.alive():
+                return worker
+            await self._discard(worker)
+        # Starting a process waits on the forkserver (or a full spawn)
+        return await asyncio.to_thread(_Worker, self._context, self.memory_bytes, self.cpu_seconds)
+    
+    def _checkin(self, worker: _Worker):
+        worker.tasks += 1
+        if self.max_tasks_per_worker and worker.tasks >= self.max_tasks_per_worker:
+            self._stop(worker)
+        else:
+            self._idle.append(worker)
+    
+    async def _discard(self, worker: _Worker):
+        """
+        Kill a worker that failed; the next task starts a replacement. The
+        kill and join block, so they run in a thread (not on _readers, whose
+        threads may all be stuck reading from workers being killed), shielded
+        so a cancelled task still finishes off its worker.
+        """
+        self.replaced += 1
+        await asyncio.shield(asyncio.to_thread(worker.kill))
+    
+    def _stop(self, worker: _Worker):
+        """Let a healthy worker exit by closing its pipe (multiprocessing reaps it)"""
+        worker.conn.close()
+    
+    def shutdown(self):
+        """Stop idle workers (busy ones are daemonic and die with the process)"""
+        for worker in self._idle:
+            self._stop(worker)
+        self._idle = []
+        self._readers.shutdown(wait=False, cancel_futures=True)
+    
+    def get_stats(self) -> dict:
+        """Get pool statistics"""
+        return {
+            "workers": self.size,
+            "idle": len(self._idle),
+            "replaced": self.replaced,
+            "timeouts": self.timeouts
+        }
+
+
+def get_extraction_pool() -> SandboxPool:
+    """Shared extraction pool, created on first use"""
+    global _pool
+    if _pool is None:
+        workers = _worker_count()
+        _pool = SandboxPool(
+            workers=workers,
+            memory_bytes=settings.EXTRACTION_MEMORY_MB * 1024 * 1024,
+            cpu_seconds=settings.EXTRACTION_CPU_SECONDS,
+            max_tasks_per_worker=settings.EXTRACTION_MAX_TASKS_PER_WORKER
+        )
+        logger.info(f"Started extraction pool with {workers} sandboxed workers")
+    return _pool
+
+
+async def run_in_pool(fn: Callable[..., Any], *args: Any, timeout: Optional[float] = None) -> Any:
+    """
+    Run a picklable function in a sandboxed extraction worker.
+    
+    At most one task per worker runs at a time, so the timeout covers
+    parsing rather than time spent queued behind other uploads. Raises
+    TimeoutError (the worker is killed) if the task runs longer than the
+    timeout, and WorkerDiedError if the worker crashed or hit a limit.
+    """
+    timeout = timeout or settings.EXTRACTION_TIMEOUT_SECONDS
+    return await get_extraction_pool().run(fn, args, timeout)
+
+
+def shutdown_extraction_pool():
+    """Stop the pool's workers (application shutdown)"""
+    global _pool
+    if _pool is not None:
+        _pool.shutdown()
+        _pool = None
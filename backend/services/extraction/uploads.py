@@ -0,0 +1,140 @@
+"""
+Streaming upload handling
+"""
+import asyncio
+import hashlib
+import os
+import re
+import shutil
+import tempfile
+import time
+import uuid
+from dataclasses import dataclass
+from typing import BinaryIO
+
+from fastapi import UploadFile
+
+CHUNK_SIZE = 1024 * 1024
+
+
+class UploadTooLargeError(ValueError):
+    """Upload exceeded the configured size limit"""
+
+
+@dataclass
+class SpooledUpload:
+    """An upload written to a temporary file on disk"""
+    path: str
+    size: int
+    sha256: str
+    
+    def cleanup(self):
+        """Remove the temporary file"""
+        try:
+            os.unlink(self.path)
+        except FileNotFoundError:
+            pass
+
+
+async def spool_upload(upload: UploadFile, max_bytes: int, directory: str = None) -> SpooledUpload:
+    """
+    Copy an upload to a temporary file in chunks, hashing as it goes.
+    
+    Raises UploadTooLargeError as soon as more than max_bytes have been read,
+    so an oversized file is never held in memory or fully written out.
+    """
+    suffix = os.path.splitext(upload.filename or "")[1]
+    fd, path = tempfile.mkstemp(suffix=suffix, dir=directory or None)
+    digest = hashlib.sha256()
+    size = 0
+    
+    try:
+        with os.fdopen(fd, "wb") as out:
+            while True:
+                chunk = await upload.read(CHUNK_SIZE)
+                if not chunk:
+                    break
+                size += len(chunk)
+                if size > max_bytes:
+                    raise UploadTooLargeError(f"File too large. Max size: {max_bytes // (1024 * 1024)}MB")
+                digest.update(chunk)
+                await asyncio.to_thread(_write, out, chunk)
+    except BaseException:
+        os.unlink(path)
+        raise
+    
+    return SpooledUpload(path=path, size=size, sha256=digest.hexdigest())
+
+
+def _write(out: BinaryIO, chunk: bytes):
+    out.write(chunk)
+
+
+class RawInputStore:
+    """
+    Uploaded files waiting for the extraction stage of their job.
+    
+    Files are kept under `directory` by a key of the form
+    "<user_id>/<token>/<filename>" (stored as content.file_path) until
+    extraction has run. The directory must be shared by every process that
+    runs the job processor. Inputs kept after a transient extraction
+    failure are removed by sweep() once they are old enough.
+    """
+    
+    def __init__(self, directory: str):
+        self.directory = directory or os.path.join(tempfile.gettempdir(), "raw-inputs")
+    
+    def new_key(self, user_id: str, filename: str) -> str:
+        """A unique key for a user's upload"""
+        name = re.sub(r"[^\w.\-]", "_", os.path.basename(filename or "")) or "upload"
+        return f"{user_id}/{uuid.uuid4().hex}/{name}"
+    
+    def path(self, key: str) -> str:
+        """Filesystem path for a key"""
+        path = os.path.normpath(os.path.join(self.directory, key))
+        if not path.startswith(os.path.normpath(self.directory) + os.sep):
+            raise ValueError(f"Invalid raw input key: {key}")
+        return path
+    
+    def save(self, upload: SpooledUpload, key: str) -> str:
+        """Move a spooled upload into the store (blocking; run in a thread)"""
+        path = self.path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        # shutil.move falls back to copy + delete across filesystems
+        shutil.move(upload.path, path)
+        return path
+    
+    def delete(self, key: str):
+        """Remove a stored input and its directory"""
+        path = self.path(key)
+        try:
+            os.unlink(path)
+            os.rmdir(os.path.dirname(path))
+        except OSError:
+            pass
+    
+    def sweep(self, max_age_seconds: float) -> int:
+        """Remove stored inputs older than max_age_seconds (blocking; run in a thread)"""
+        cutoff = time.time() - max_age_seconds
+        removed = 0
+        emptied = set()
+        for root, _, files in os.walk(self.directory, topdown=False):
+            for name in files:
+                path = os.path.join(root, name)
+                try:
+                    if os.path.getmtime(path) < cutoff:
+                        os.unlink(path)
+                        removed += 1
+                        emptied.add(root)
+                except OSError:
+                    pass
+            # Only directories this sweep emptied, or old ones: a save() in
+            # progress may have just created an empty one
+            if root != self.directory:
+                try:
+                    if root in emptied or os.path.getmtime(root) < cutoff:
+                        os.rmdir(root)
+                        emptied.add(os.path.dirname(root))
+                except OSError:
+                    pass
+        return removed
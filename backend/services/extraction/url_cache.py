@@ -0,0 +1,84 @@
+"""
+Cache of fetched pages for conditional-GET revalidation
+"""
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any, Dict, Optional
+
+from .cache import EXTRACTOR_VERSION
+
+
+@dataclass
+class CachedPage:
+    """A fetched page, its validators and its extraction result"""
+    url: str
+    body: bytes
+    charset: Optional[str]
+    etag: Optional[str]
+    last_modified: Optional[str]
+    result: Dict[str, Any]
+    extractor_version: str = EXTRACTOR_VERSION
+    size: int = field(init=False)
+    
+    def __post_init__(self):
+        self.size = len(self.body) + len(self.result.get("text", ""))
+    
+    def conditional_headers(self) -> Dict[str, str]:
+        """Request headers that revalidate this page"""
+        headers = {}
+        if self.etag:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified:
+            headers["If-Modified-Since"] = self.last_modified
+        return headers
+
+
+class UrlFetchCache:
+    """
+    In-memory LRU of fetched pages, bounded by body + text size.
+    
+    Only responses carrying an ETag or Last-Modified are worth keeping,
+    since those are the ones a server can answer with 304 Not Modified.
+    """
+    
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        self._pages: "OrderedDict[str, CachedPage]" = OrderedDict()
+        self._bytes = 0
+        self.revalidated = 0
+        self.refetched = 0
+    
+    def get(self, url: str) -> Optional[CachedPage]:
+        """Cached page for a URL, or None"""
+        page = self._pages.get(url)
+        if page is not None:
+            self._pages.move_to_end(url)
+        return page
+    
+    def put(self, page: CachedPage):
+        """Store a page if it has validators and fits"""
+        if not (page.etag or page.last_modified) or page.size > self.max_bytes:
+            self.discard(page.url)
+            return
+        self.discard(page.url)
+        self._pages[page.url] = page
+        self._bytes += page.size
+        
+        while self._bytes > self.max_bytes:
+            _, evicted = self._pages.popitem(last=False)
+            self._bytes -= evicted.size
+    
+    def discard(self, url: str):
+        """Drop a URL from the cache"""
+        page = self._pages.pop(url, None)
+        if page is not None:
+            self._bytes -= page.size
+    
+    def get_stats(self) -> Dict[str, int]:
+        """Get cache statistics"""
+        return {
+            "pages": len(self._pages),
+            "bytes": self._bytes,
+            "revalidated": self.revalidated,
+            "refetched": self.refetched
+        }
@@ -0,0 +1,207 @@
+"""
+HTML main-content extraction
+
+The lxml path parses the page once, strips non-content elements in place and
+picks the main content with a readability-style score: paragraphs add
+points (length, commas) to their parent and grandparent, class/id names
+nudge the score up or down, and link-heavy blocks are discounted. The
+BeautifulSoup path is kept as a fallback for when lxml isn't available.
+"""
+import codecs
+import re
+from typing import Any, Dict, List, Optional, Tuple
+
+from core.config import settings
+
+_REMOVE_TAGS = ("script", "style", "noscript", "nav", "footer", "header", "aside", "iframe", "svg", "template")
+_BLOCK_TAGS = {"p", "h1", "h2", "h3", "h4", "h5", "h6", "li", "pre", "blockquote", "td", "dd", "figcaption"}
+_POSITIVE = re.compile(r"article|body|content|entry|main|page|post|text|blog|story", re.I)
+_NEGATIVE = re.compile(r"comment|meta|footer|footnote|nav|sidebar|sponsor|ad-|advert|share|social|related|menu|promo|popup|cookie", re.I)
+_WHITESPACE = re.compile(r"\s+")
+
+# Candidates whose text is shorter than this are ignored in favour of <body>
+_MIN_CONTENT_CHARS = 200
+
+
+def parse_html(body: bytes, charset: Optional[str], url: str) -> Dict[str, Any]:
+    """Extract the title and main text from an HTML page"""
+    if settings.HTML_PARSER == "lxml":
+        try:
+            import lxml.html  # noqa: F401
+        except ImportError:
+            pass
+        else:
+            title, text = _extract_lxml(body, charset)
+            return _result(title, text, url)
+    
+    title, text = _extract_bs4(body, charset)
+    return _result(title, text, url)
+
+
+def _result(title: str, text: str, url: str) -> Dict[str, Any]:
+    if not text.strip():
+        raise ValueError("No extractable text found on the webpage")
+    
+    return {
+        "text": text,
+        "title": title,
+        "source_type": "url",
+        "metadata": {
+            "url": url,
+            "word_count": len(text.split()),
+            "character_count": len(text)
+        }
+    }
+
+
+def _extract_lxml(body: bytes, charset: Optional[str]) -> Tuple[str, str]:
+    import lxml.html
+    from lxml import etree
+    
+    parser = lxml.html.HTMLParser(encoding=_known_encoding(charset), remove_comments=True, remove_pis=True)
+    root = lxml.html.document_fromstring(body, parser=parser)
+    
+    title = _clean(root.findtext(".//title") or "")
+    if not title:
+        og_title = root.xpath("//meta[@property='og:title']/@content")
+        title = _clean(og_title[0]) if og_title else ""
+    
+    etree.strip_elements(root, *_REMOVE_TAGS, with_tail=False)
+    # Some templates (ASP.NET WebForms, CMSs) wrap the whole page in a <form>;
+    # only drop forms that are just controls (search, login, newsletter)
+    for form in [form for form in root.iter("form") if len(_clean(form.text_content())) < _MIN_CONTENT_CHARS]:
+        form.drop_tree()
+    
+    candidate = _best_candidate(root)
+    body_element = root.find("body")
+    container = candidate if candidate is not None else (body_element if body_element is not None else root)
+    
+    blocks = _text_blocks(container)
+    all_text = container.text_content()
+    # Text sitting directly in divs (no <p>/<li>) would be lost; fall back to lines
+    if sum(len(block) for block in blocks) < 0.5 * len(_clean(all_text)):
+        blocks = [line for line in (_clean(line) for line in all_text.splitlines()) if line]
+    
+    return title or "Untitled", "\n\n".join(blocks)
+
+
+def _known_encoding(charset: Optional[str]) -> Optional[str]:
+    """The server's charset if Python knows it, else None so lxml sniffs the encoding"""
+    if not charset:
+        return None
+    try:
+        codecs.lookup(charset)
+    except LookupError:
+        return None
+    return charset
+
+
+def _class_weight(element) -> int:
+    weight = 0
+    for name in (element.get("class"), element.get("id")):
+        if name:
+            if _NEGATIVE.search(name):
+                weight -= 25
+            if _POSITIVE.search(name):
+                weight += 25
+    return weight
+
+
+def _link_density(element) -> float:
+    text_length = len(element.text_content())
+    if not text_length:
+        return 1.0
+    link_length = sum(len(a.text_content()) for a in element.iter("a"))
+    return link_length / text_length
+
+
+def _best_candidate(root):
+    """Highest scoring container of paragraphs, or None"""
+    scores: Dict[Any, float] = {}
+    
+    def initial(element) -> float:
+        tag = element.tag
+        base = 5 if tag in ("div", "article", "main", "section") else -3 if tag in ("ul", "ol", "form", "th") else 0
+        return base + _class_weight(element)
+    
+    for paragraph in root.iter("p", "pre", "td"):
+        text = _clean(paragraph.text_content())
+        if len(text) < 25:
+            continue
+        score = 1 + text.count(",") + min(len(text) // 100, 3)
+        
+        parent = paragraph.getparent()
+        if parent is None:
+            continue
+        if parent not in scores:
+            scores[parent] = initial(parent)
+        scores[parent] += score
+        
+        grandparent = parent.getparent()
+        if grandparent is not None:
+            if grandparent not in scores:
+                scores[grandparent] = initial(grandparent)
+            scores[grandparent] += score / 2
+    
+    best, best_score = None, 0.0
+    for element, score in scores.items():
+        score *= 1 - _link_density(element)
+        if score > best_score:
+            best, best_score = element, score
+    
+    if best is not None and len(best.text_content()) < _MIN_CONTENT_CHARS:
+        return None
+    return best
+
+
+def _text_blocks(container) -> List[str]:
+    """Text of block-level elements in document order, without nesting duplicates"""
+    blocks = []
+    for element in container.iter(*_BLOCK_TAGS):
+        # Skip blocks inside another block (e.g. <p> in <li>); the outer one has the text
+        parent = element.getparent()
+        nested = False
+        while parent is not None and parent is not container:
+            if parent.tag in _BLOCK_TAGS:
+                nested = True
+                break
+            parent = parent.getparent()
+        if nested:
+            continue
+        text = _clean(element.text_content())
+        if text:
+            blocks.append(text)
+    return blocks
+
+
+def _clean(text: str) -> str:
+    return _WHITESPACE.sub(" ", text).strip()
+
+
+def _extract_bs4(body: bytes, charset: Optional[str]) -> Tuple[str, str]:
+    from bs4 import BeautifulSoup
+    
+    # Parse HTML (bytes, so the declared or <meta> charset is honoured)
+    soup = BeautifulSoup(body, 'html.parser', from_encoding=_known_encoding(charset))
+    
+    # Remove script and style elements
+    for script in soup(["script", "style", "nav", "footer", "header"]):
+        script.decompose()
+    
+    # Extract title
+    title = "Untitled"
+    if soup.title and soup.title.string:
+        title = soup.title.string.strip()
+    
+    # Extract main content
+    # Try to find main content area
+    main_content = soup.find('main') or soup.find('article') or soup.find('div', class_='content')
+    
+    if main_content:
+        text = main_content.get_text(separator='\n', strip=True)
+    else:
+        text = soup.get_text(separator='\n', strip=True)
+    
+    # Clean up excessive newlines
+    lines = [line.strip() for line in text.splitlines() if line.strip()]
+    return title, '\n\n'.join(lines)
@@ -0,0 +1,111 @@
+"""
+Shared pooled HTTP client for outbound fetches
+"""
+from dataclasses import dataclass
+from typing import Dict, Mapping, Optional
+
+import aiohttp
+from multidict import CIMultiDict
+from loguru import logger
+
+from core.config import settings
+
+CHUNK_SIZE = 64 * 1024
+
+
+class ResponseTooLargeError(ValueError):
+    """Response body exceeded the configured size cap"""
+
+
+@dataclass
+class FetchResult:
+    """A fetched response with its body fully read"""
+    status: int
+    url: str
+    headers: Mapping[str, str]  # case-insensitive
+    body: bytes
+    charset: Optional[str]
+
+
+class HttpClient:
+    """
+    One aiohttp session for the whole process.
+    
+    The connector keeps connections alive between requests, caps total and
+    per-host connections and caches DNS lookups, so repeat fetches from the
+    same site skip DNS, TCP and TLS setup. The session is created in the app
+    lifespan (or lazily on first use outside the app) and closed on shutdown.
+    """
+    
+    def __init__(self):
+        self._session: Optional[aiohttp.ClientSession] = None
+    
+    async def start(self):
+        """Create the session and connection pool"""
+        if self._session is None or self._session.closed:
+            connector = aiohttp.TCPConnector(
+                limit=settings.HTTP_MAX_CONNECTIONS,
+                limit_per_host=settings.HTTP_MAX_CONNECTIONS_PER_HOST,
+                ttl_dns_cache=settings.HTTP_DNS_CACHE_SECONDS,
+                keepalive_timeout=settings.HTTP_KEEPALIVE_SECONDS
+            )
+            self._session = aiohttp.ClientSession(
+                connector=connector,
+                timeout=aiohttp.ClientTimeout(
+                    total=settings.HTTP_TIMEOUT_SECONDS,
+                    connect=settings.HTTP_CONNECT_TIMEOUT_SECONDS
+                ),
+                headers={"User-Agent": f"{settings.APP_NAME}/{settings.APP_VERSION}"}
+            )
+            logger.info("HTTP client started")
+    
+    async def close(self):
+        """Close the session and its pooled connections"""
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+            logger.info("HTTP client closed")
+        self._session = None
+    
+    @property
+    def session(self) -> aiohttp.ClientSession:
+        if self._session is None or self._session.closed:
+            raise RuntimeError("HTTP client not started")
+        return self._session
+    
+    async def fetch(
+        self,
+        url: str,
+        headers: Optional[Dict[str, str]] = None,
+        max_bytes: Optional[int] = None
+    ) -> FetchResult:
+        """
+        GET a URL, streaming the body and stopping once it passes max_bytes.
+        
+        Raises ResponseTooLargeError if the declared or actual body size is
+        over the cap (URL_MAX_RESPONSE_MB by default).
+        """
+        await self.start()
+        max_bytes = max_bytes or settings.URL_MAX_RESPONSE_MB * 1024 * 1024
+        
+        async with self.session.get(url, headers=headers) as response:
+            if response.content_length is not None and response.content_length > max_bytes:
+                raise ResponseTooLargeError(f"Response too large: {response.content_length} bytes")
+            
+            chunks = []
+            size = 0
+            async for chunk in response.content.iter_chunked(CHUNK_SIZE):
+                size += len(chunk)
+                if size > max_bytes:
+                    raise ResponseTooLargeError(f"Response exceeded {max_bytes} bytes")
+                chunks.append(chunk)
+            
+            return FetchResult(
+                status=response.status,
+                url=str(response.url),
+                headers=CIMultiDict(response.headers),
+                body=b"".join(chunks),
+                charset=response.charset
+            )
+
+
+http_client = HttpClient()
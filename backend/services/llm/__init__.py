@@ -0,0 +1,28 @@
+"""
+LLM client services
+"""
+from .single_flight import SingleFlight
+from .circuit_breaker import CircuitBreaker, CircuitOpenError
+from .hedging import RequestHedger
+from .concurrency import AdaptiveConcurrencyLimiter
+from .batching import MicroBatcher
+from .client import LLMClient, llm_client
+from .parsing import parse_json_response
+from .usage import UsageTracker, current_usage, summarize_usage, group_usage, month_start
+
+__all__ = [
+    "SingleFlight",
+    "CircuitBreaker",
+    "CircuitOpenError",
+    "RequestHedger",
+    "AdaptiveConcurrencyLimiter",
+    "MicroBatcher",
+    "LLMClient",
+    "llm_client",
+    "parse_json_response",
+    "UsageTracker",
+    "current_usage",
+    "summarize_usage",
+    "group_usage",
+    "month_start",
+]
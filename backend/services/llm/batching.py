@@ -0,0 +1,91 @@
+"""
+Micro-batching of small LLM requests
+"""
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+
+class MicroBatcher:
+    """
+    Collect submitted items for up to `max_wait_ms` or `max_items`, whichever
+    comes first, and run them through one `run_batch(items)` call.
+    
+    `run_batch` must return one result per item, in order. If it raises, every
+    caller in that batch receives the exception.
+    """
+    
+    def __init__(
+        self,
+        run_batch: Callable[[List[Any]], Awaitable[List[Any]]],
+        max_items: int = 8,
+        max_wait_ms: int = 50
+    ):
+        self.run_batch = run_batch
+        self.max_items = max(1, max_items)
+        self.max_wait = max_wait_ms / 1000
+        self._pending: List[Any] = []
+        self._futures: List[asyncio.Future] = []
+        self._timer: Optional[asyncio.Task] = None
+        self._running: set = set()
+        self.batches = 0
+        self.items = 0
+    
+    async def submit(self, item: Any) -> Any:
+        """Queue an item and wait for its result"""
+        future = asyncio.get_running_loop().create_future()
+        self._pending.append(item)
+        self._futures.append(future)
+        
+        if len(self._pending) >= self.max_items:
+            self._flush()
+        elif self._timer is None:
+            self._timer = asyncio.create_task(self._flush_after_wait())
+        
+        return await future
+    
+    async def _flush_after_wait(self):
+        await asyncio.sleep(self.max_wait)
+        self._timer = None
+        self._flush()
+    
+    def _flush(self):
+        """Hand the pending items to a batch task"""
+        if self._timer is not None and self._timer is not asyncio.current_task():
+            self._timer.cancel()
+        self._timer = None
+        
+        items, futures = self._pending, self._futures
+        self._pending, self._futures = [], []
+        if not items:
+            return
+        
+        task = asyncio.create_task(self._run(items, futures))
+        # Keep a reference so the task isn't garbage collected mid-flight
+        self._running.add(task)
+        task.add_done_callback(self._running.discard)
+    
+    async def _run(self, items: List[Any], futures: List[asyncio.Future]):
+        self.batches += 1
+        self.items += len(items)
+        try:
+            results = await self.run_batch(items)
+            if len(results) != len(items):
+                raise ValueError(f"Batch returned {len(results)} results for {len(items)} items")
+        except Exception as e:
+            for future in futures:
+                if not future.done():
+                    future.set_exception(e)
+            return
+        
+        for future, result in zip(futures, results):
+            if not future.done():
+                future.set_result(result)
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """Get batching statistics"""
+        return {
+            "batches": self.batches,
+            "items": self.items,
+            "avg_batch_size": round(self.items / self.batches, 2) if self.batches else 0.0,
+            "pending": len(self._pending)
+        }
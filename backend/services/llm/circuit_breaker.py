@@ -0,0 +1,91 @@
+"""
+Circuit breaker for upstream LLM calls
+"""
+import time
+from typing import Any, Dict, Optional
+
+
+class CircuitOpenError(Exception):
+    """Raised when a call is rejected because the circuit is open"""
+    pass
+
+
+class CircuitBreaker:
+    """
+    Consecutive-failure circuit breaker.
+    
+    closed    -> calls pass; `failure_threshold` consecutive failures open it
+    open      -> calls are rejected until `recovery_seconds` have passed
+    half_open -> a single probe call is let through; success closes the
+                 circuit, failure re-opens it
+    """
+    
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+    
+    def __init__(self, name: str, failure_threshold: int = 5, recovery_seconds: float = 30.0):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.recovery_seconds = recovery_seconds
+        self._state = self.CLOSED
+        self._consecutive_failures = 0
+        self._opened_at: Optional[float] = None
+        self._probe_in_flight = False
+        self.rejected = 0
+        self.times_opened = 0
+    
+    @property
+    def state(self) -> str:
+        """Current state, moving open -> half_open once recovery time has passed"""
+        if self._state == self.OPEN and time.monotonic() - self._opened_at >= self.recovery_seconds:
+            self._state = self.HALF_OPEN
+            self._probe_in_flight = False
+        return self._state
+    
+    def allow_request(self) -> bool:
+        """Check whether a call may go upstream now"""
+        state = self.state
+        if state == self.CLOSED:
+            return True
+        if state == self.HALF_OPEN and not self._probe_in_flight:
+            self._probe_in_flight = True
+            return True
+        self.rejected += 1
+        return False
+    
+    def record_success(self):
+        """Record a successful upstream call"""
+        self._state = self.CLOSED
+        self._consecutive_failures = 0
+        self._probe_in_flight = False
+    
+    def record_failure(self):
+        """Record a failed upstream call"""
+        self._consecutive_failures += 1
+        if self._state == self.HALF_OPEN or self._consecutive_failures >= self.failure_threshold:
+            self._open()
+    
+    def record_abandoned(self):
+        """Record a call that ended without an outcome (e.g. cancelled)"""
+        self._probe_in_flight = False
+    
+    def _open(self):
+        self._state = self.OPEN
+        self._opened_at = time.monotonic()
+        self._probe_in_flight = False
+        self.times_opened += 1
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """Get breaker state and counters"""
+        state = self.state
+        retry_in = None
+        if state == self.OPEN:
+            retry_in = max(0.0, self.recovery_seconds - (time.monotonic() - self._opened_at))
+        return {
+            "state": state,
+            "consecutive_failures": self._consecutive_failures,
+            "times_opened": self.times_opened,
+            "rejected_calls": self.rejected,
+            "retry_in_seconds": round(retry_in, 1) if retry_in is not None else None
+        }
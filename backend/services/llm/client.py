@@ -0,0 +1,201 @@
+"""
+Async LLM client wrapping the Groq API
+"""
+import hashlib
+import json
+import time
+from typing import Any, Dict, List, Optional
+from loguru import logger
+from groq import AsyncGroq, APIStatusError
+
+from core.config import settings
+from .circuit_breaker import CircuitBreaker, CircuitOpenError
+from .concurrency import AdaptiveConcurrencyLimiter
+from .hedging import RequestHedger
+from .single_flight import SingleFlight
+from .usage import record_usage, summarize_usage
+
+
+class LLMClient:
+    """
+    Shared client for chat completions.
+
+    Identical requests that are in flight at the same time are collapsed into
+    one upstream call keyed by the prompt fingerprint. Each model sits behind
+    a circuit breaker: while a model's circuit is open, calls are routed to
+    GROQ_FALLBACK_MODEL if configured, otherwise rejected immediately.
+    Slow calls can optionally be hedged with a duplicate request once they
+    pass the stage's observed p95 latency. In-flight upstream calls are
+    bounded by an AIMD limit that backs off on 429s and latency spikes.
+    """
+    
+    def __init__(self):
+        self.client = AsyncGroq(
+            api_key=settings.GROQ_API_KEY,
+            timeout=settings.LLM_TIMEOUT_SECONDS,
+            max_retries=settings.LLM_MAX_RETRIES
+        )
+        self.single_flight = SingleFlight()
+        self.breakers: Dict[str, CircuitBreaker] = {}
+        self.usage_by_model: Dict[str, Dict[str, int]] = {}
+        self.usage_by_route: Dict[str, Dict[str, int]] = {}
+        self.limiter = AdaptiveConcurrencyLimiter(
+            initial=settings.LLM_CONCURRENCY_INITIAL,
+            min_limit=settings.LLM_CONCURRENCY_MIN,
+            max_limit=settings.LLM_CONCURRENCY_MAX,
+            backoff=settings.LLM_AIMD_BACKOFF,
+            latency_factor=settings.LLM_AIMD_LATENCY_FACTOR
+        )
+        self.hedger = RequestHedger(
+            enabled=settings.LLM_HEDGING_ENABLED,
+            percentile=settings.LLM_HEDGE_PERCENTILE,
+            max_rate=settings.LLM_HEDGE_MAX_RATE,
+            min_samples=settings.LLM_HEDGE_MIN_SAMPLES
+        )
+    
+    def breaker(self, model: str) -> CircuitBreaker:
+        """Get (or create) the circuit breaker for a model"""
+        if model not in self.breakers:
+            self.breakers[model] = CircuitBreaker(
+                model,
+                failure_threshold=settings.CIRCUIT_BREAKER_FAILURE_THRESHOLD,
+                recovery_seconds=settings.CIRCUIT_BREAKER_RECOVERY_SECONDS
+            )
+        return self.breakers[model]
+    
+    def _select_model(self, model: str) -> str:
+        """Pick the requested model, or the fallback while its circuit is open"""
+        if self.breaker(model).allow_request():
+            return model
+        
+        fallback = settings.GROQ_FALLBACK_MODEL
+        if fallback and fallback != model and self.breaker(fallback).allow_request():
+            logger.warning(f"Circuit open for {model}, routing to {fallback}")
+            return fallback
+        
+        raise CircuitOpenError(f"LLM circuit open for {model}")
+    
+    @staticmethod
+    def _is_provider_failure(error: Exception) -> bool:
+        """Client errors (bad request, auth) don't indicate an unhealthy provider"""
+        if isinstance(error, APIStatusError):
+            return error.status_code >= 500 or error.status_code in (408, 429)
+        return True
+    
+    @staticmethod
+    def fingerprint(messages: List[Dict[str, str]], model: str, temperature: float, max_tokens: int) -> str:
+        """Stable hash of everything that determines the completion"""
+        payload = json.dumps(
+            {
+                "messages": messages,
+                "model": model,
+                "temperature": temperature,
+                "max_tokens": max_tokens
+            },
+            sort_keys=True,
+            ensure_ascii=False
+        )
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+    
+    async def complete(
+        self,
+        prompt: str,
+        model: Optional[str] = None,
+        temperature: Optional[float] = None,
+        max_tokens: Optional[int] = None,
+        stage: str = "default"
+    ) -> str:
+        """
+        Run a single-prompt chat completion and return the response text.
+        Token usage is attributed to `stage` on the current usage tracker.
+        """
+        messages = [{"role": "user", "content": prompt}]
+        model = model or settings.model_for(stage)
+        temperature = settings.GROQ_TEMPERATURE if temperature is None else temperature
+        max_tokens = max_tokens or settings.GROQ_MAX_TOKENS
+        
+        key = self.fingerprint(messages, model, temperature, max_tokens)
+        
+        async def attempt() -> str:
+            selected = self._select_model(model)
+            breaker = self.breaker(selected)
+            try:
+                async with self.limiter.slot():
+                    started = time.monotonic()
+                    response = await self.client.chat.completions.create(
+                        model=selected,
+                        messages=messages,
+                        temperature=temperature,
+                        max_tokens=max_tokens
+                    )
+                    latency = time.monotonic() - started
+            except Exception as e:
+                if isinstance(e, APIStatusError) and e.status_code == 429:
+                    self.limiter.on_overload()
+                if self._is_provider_failure(e):
+                    breaker.record_failure()
+                else:
+                    breaker.record_success()
+                raise
+            except BaseException:
+                breaker.record_abandoned()
+                raise
+            breaker.record_success()
+            self.limiter.on_success(latency)
+            self.hedger.observe(stage, latency)
+            self._record_usage(stage, selected, response, int(latency * 1000))
+            return response.choices[0].message.content.strip()
+        
+        async def call() -> str:
+            return await self.hedger.run(stage, attempt)
+        
+        return await self.single_flight.do(key, call)
+    
+    def _record_usage(self, stage: str, model: str, response: Any, latency_ms: int):
+        """Record token usage for the calling job and the process-wide totals"""
+        usage = getattr(response, "usage", None)
+        prompt_tokens = getattr(usage, "prompt_tokens", 0) or 0
+        completion_tokens = getattr(usage, "completion_tokens", 0) or 0
+        
+        record_usage(stage, model, prompt_tokens, completion_tokens, latency_ms)
+        
+        for totals in (
+            self.usage_by_model.setdefault(model, summarize_usage([])),
+            self.usage_by_route.setdefault(f"{stage}:{model}", summarize_usage([]))
+        ):
+            totals["calls"] += 1
+            totals["prompt_tokens"] += prompt_tokens
+            totals["completion_tokens"] += completion_tokens
+            totals["total_tokens"] += prompt_tokens + completion_tokens
+            totals["latency_ms"] += latency_ms
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """Get client statistics"""
+        return {
+            "single_flight": self.single_flight.get_stats(),
+            "circuit_breakers": self.get_circuit_states(),
+            "usage_by_model": self.usage_by_model,
+            "usage_by_route": self.get_route_stats(),
+            "hedging": self.hedger.get_stats(),
+            "concurrency": self.limiter.get_stats()
+        }
+    
+    def get_route_stats(self) -> Dict[str, Dict[str, Any]]:
+        """Usage per stage:model route, with average latency and tokens per call"""
+        routes = {}
+        for route, totals in self.usage_by_route.items():
+            calls = totals["calls"] or 1
+            routes[route] = {
+                **totals,
+                "avg_latency_ms": totals["latency_ms"] // calls,
+                "avg_total_tokens": totals["total_tokens"] // calls
+            }
+        return routes
+    
+    def get_circuit_states(self) -> Dict[str, Dict[str, Any]]:
+        """Get circuit breaker state per model"""
+        return {model: breaker.get_stats() for model, breaker in self.breakers.items()}
+
+
+# Global LLM client instance
+llm_client = LLMClient()
@@ -0,0 +1,104 @@
+"""
+Adaptive (AIMD) concurrency limit for upstream LLM calls
+"""
+import asyncio
+import time
+from contextlib import asynccontextmanager
+from typing import Any, Dict, Optional
+
+
+class AdaptiveConcurrencyLimiter:
+    """
+    Bound in-flight upstream calls with a limit that adapts to the provider.
+    
+    Additive increase: each success raises the limit by `increase / limit`,
+    i.e. about +`increase` per limit's worth of successful calls.
+    Multiplicative decrease: a 429 or a latency spike (more than
+    `latency_factor` times the smoothed baseline) multiplies the limit by
+    `backoff`, at most once per `cooldown_seconds` so a single burst of
+    failures counts as one congestion event.
+    """
+    
+    def __init__(
+        self,
+        initial: int = 8,
+        min_limit: int = 1,
+        max_limit: int = 64,
+        increase: float = 1.0,
+        backoff: float = 0.5,
+        latency_factor: float = 3.0,
+        cooldown_seconds: float = 2.0
+    ):
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.increase = increase
+        self.backoff = backoff
+        self.latency_factor = latency_factor
+        self.cooldown_seconds = cooldown_seconds
+        self.limit = float(max(min_limit, min(initial, max_limit)))
+        self.in_flight = 0
+        self.waiting = 0
+        self.decreases = 0
+        self._baseline_latency: Optional[float] = None
+        self._last_decrease = 0.0
+        self._condition = asyncio.Condition()
+    
+    @property
+    def current_limit(self) -> int:
+        """Integer limit on in-flight calls"""
+        return max(self.min_limit, int(self.limit))
+    
+    async def acquire(self):
+        """Wait for a free slot"""
+        async with self._condition:
+            self.waiting += 1
+            try:
+                await self._condition.wait_for(lambda: self.in_flight < self.current_limit)
+            finally:
+                self.waiting -= 1
+            self.in_flight += 1
+    
+    async def release(self):
+        """Free a slot"""
+        async with self._condition:
+            self.in_flight -= 1
+            self._condition.notify_all()
+    
+    @asynccontextmanager
+    async def slot(self):
+        """Hold a slot for the duration of the block"""
+        await self.acquire()
+        try:
+            yield
+        finally:
+            await self.release()
+    
+    def on_success(self, latency_seconds: float):
+        """Grow the limit, or back off if the call was a latency spike"""
+        baseline = self._baseline_latency
+        if baseline is not None and latency_seconds > self.latency_factor * baseline:
+            self.on_overload()
+        else:
+            self.limit = min(float(self.max_limit), self.limit + self.increase / self.limit)
+        
+        # Smoothed baseline (EWMA); spikes only nudge it
+        self._baseline_latency = latency_seconds if baseline is None else 0.9 * baseline + 0.1 * latency_seconds
+    
+    def on_overload(self):
+        """Shrink the limit after a 429 or latency spike"""
+        now = time.monotonic()
+        if now - self._last_decrease < self.cooldown_seconds:
+            return
+        self._last_decrease = now
+        self.limit = max(float(self.min_limit), self.limit * self.backoff)
+        self.decreases += 1
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """Get limiter state"""
+        return {
+            "limit": self.current_limit,
+            "in_flight": self.in_flight,
+            "waiting": self.waiting,
+            "decreases": self.decreases,
+            "baseline_latency_seconds": round(self._baseline_latency, 3) if self._baseline_latency is not None else None
+        }
@@ -0,0 +1,105 @@
+"""
+Request hedging for tail-latency reduction
+"""
+import asyncio
+from collections import deque
+from typing import Any, Awaitable, Callable, Deque, Dict, Optional
+
+
+class RequestHedger:
+    """
+    Fire a second identical request when the first is slower than the
+    observed p95 latency for its stage; the first response wins.
+    
+    Hedging only starts once a stage has `min_samples` latency observations,
+    and the number of hedges is capped at `max_rate` of all calls so a
+    provider-wide slowdown can't double the load.
+    """
+    
+    def __init__(
+        self,
+        enabled: bool = False,
+        percentile: float = 0.95,
+        max_rate: float = 0.1,
+        min_samples: int = 20,
+        window: int = 200
+    ):
+        self.enabled = enabled
+        self.percentile = percentile
+        self.max_rate = max_rate
+        self.min_samples = min_samples
+        self.window = window
+        self._latencies: Dict[str, Deque[float]] = {}
+        self.calls = 0
+        self.hedged = 0
+        self.hedge_wins = 0
+    
+    def observe(self, stage: str, latency_seconds: float):
+        """Record the latency of a successful call"""
+        samples = self._latencies.setdefault(stage, deque(maxlen=self.window))
+        samples.append(latency_seconds)
+    
+    def hedge_delay(self, stage: str) -> Optional[float]:
+        """Observed latency percentile for a stage, or None with too few samples"""
+        samples = self._latencies.get(stage)
+        if not samples or len(samples) < self.min_samples:
+            return None
+        ordered = sorted(samples)
+        index = min(len(ordered) - 1, int(self.percentile * len(ordered)))
+        return ordered[index]
+    
+    def _within_budget(self) -> bool:
+        return self.hedged < self.max_rate * self.calls
+    
+    async def run(self, stage: str, fn: Callable[[], Awaitable[Any]]) -> Any:
+        """Run fn(), hedging with a second fn() if it is slow"""
+        self.calls += 1
+        delay = self.hedge_delay(stage) if self.enabled else None
+        if delay is None:
+            return await fn()
+        
+        primary = asyncio.ensure_future(fn())
+        backup = None
+        try:
+            done, _ = await asyncio.wait({primary}, timeout=delay)
+            if done or not self._within_budget():
+                return await primary
+            
+            self.hedged += 1
+            backup = asyncio.ensure_future(fn())
+            pending = {primary, backup}
+            error: Optional[BaseException] = None
+            
+            # First successful response wins; only fail if both attempts fail
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None:
+                        if task is backup:
+                            self.hedge_wins += 1
+                        for other in pending:
+                            other.cancel()
+                        return task.result()
+                    error = task.exception()
+            raise error
+        
+        except asyncio.CancelledError:
+            primary.cancel()
+            if backup:
+                backup.cancel()
+            raise
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """Get hedging statistics"""
+        return {
+            "enabled": self.enabled,
+            "calls": self.calls,
+            "hedged": self.hedged,
+            "hedge_wins": self.hedge_wins,
+            "hedge_rate": round(self.hedged / self.calls, 4) if self.calls else 0.0,
+            "p95_seconds": {
+                stage: round(delay, 3)
+                for stage in self._latencies
+                if (delay := self.hedge_delay(stage)) is not None
+            }
+        }
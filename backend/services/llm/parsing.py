@@ -0,0 +1,27 @@
+"""
+Helpers for parsing LLM responses
+"""
+import json
+import re
+from typing import Any, Optional
+
+_JSON_OBJECT_RE = re.compile(r'\{.*\}', re.DOTALL)
+
+
+def parse_json_response(response_text: str) -> Optional[Any]:
+    """
+    Parse a JSON response, falling back to the outermost {...} block when the
+    model wraps it in prose. Returns None if nothing parses.
+    """
+    try:
+        return json.loads(response_text)
+    except json.JSONDecodeError:
+        pass
+    
+    json_match = _JSON_OBJECT_RE.search(response_text)
+    if json_match:
+        try:
+            return json.loads(json_match.group())
+        except json.JSONDecodeError:
+            return None
+    return None
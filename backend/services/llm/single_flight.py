@@ -0,0 +1,69 @@
+"""
+Single-flight deduplication for concurrent identical calls
+"""
+import asyncio
+from typing import Any, Awaitable, Callable, Dict
+
+# Result given to followers when the leader's call was cancelled
+_LEADER_CANCELLED = object()
+
+
+class SingleFlight:
+    """
+    Collapse concurrent calls that share a key into one upstream call.
+
+    The first caller for a key runs the coroutine; callers that arrive while
+    it is still in flight await the same future and receive the same result
+    (or exception). If the leader is cancelled, its followers are not: one of
+    them runs the call again as the new leader. Nothing is cached once the
+    call settles.
+    """
+    
+    def __init__(self):
+        self._in_flight: Dict[str, asyncio.Future] = {}
+        self.calls = 0
+        self.collapsed = 0
+    
+    async def do(self, key: str, fn: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        Run fn() for key, or join the call already in flight for key
+        """
+        future = self._in_flight.get(key)
+        while future is not None:
+            self.collapsed += 1
+            # Shield so a cancelled follower doesn't cancel the leader's call
+            result = await asyncio.shield(future)
+            if result is not _LEADER_CANCELLED:
+                return result
+            # The leader was cancelled; the first follower back runs the call itself
+            future = self._in_flight.get(key)
+        
+        future = asyncio.get_running_loop().create_future()
+        self._in_flight[key] = future
+        self.calls += 1
+        
+        try:
+            result = await fn()
+        except asyncio.CancelledError:
+            # Only the leader is cancelled: wake followers to retry, not to be cancelled too
+            future.set_result(_LEADER_CANCELLED)
+            raise
+        except Exception as e:
+            future.set_exception(e)
+            # Mark retrieved so an unjoined failure doesn't log a warning
+            future.exception()
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            if self._in_flight.get(key) is future:
+                del self._in_flight[key]
+    
+    def get_stats(self) -> Dict[str, int]:
+        """Get deduplication statistics"""
+        return {
+            "upstream_calls": self.calls,
+            "collapsed_calls": self.collapsed,
+            "in_flight": len(self._in_flight)
+        }
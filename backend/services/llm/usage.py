@@ -0,0 +1,76 @@
+"""
+Token and latency accounting for LLM calls
+"""
+from contextvars import ContextVar
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+
+class UsageTracker:
+    """
+    Collects usage records for the LLM calls made in one unit of work (a job).
+    
+    The tracker is bound to a context variable so calls made anywhere below
+    the job, including concurrently gathered tasks, are attributed to it.
+    """
+    
+    def __init__(self):
+        self.records: List[Dict[str, Any]] = []
+    
+    def record(
+        self,
+        stage: str,
+        model: str,
+        prompt_tokens: int,
+        completion_tokens: int,
+        latency_ms: int
+    ):
+        """Record one upstream call"""
+        self.records.append({
+            "stage": stage,
+            "model": model,
+            "prompt_tokens": prompt_tokens,
+            "completion_tokens": completion_tokens,
+            "total_tokens": prompt_tokens + completion_tokens,
+            "latency_ms": latency_ms
+        })
+    
+    def summary(self, stage: Optional[str] = None) -> Dict[str, int]:
+        """Totals across all records, or only those for one stage"""
+        records = [r for r in self.records if stage is None or r["stage"] == stage]
+        return summarize_usage(records)
+
+
+def summarize_usage(records: List[Dict[str, Any]]) -> Dict[str, int]:
+    """Sum token counts and latency over usage records"""
+    return {
+        "calls": len(records),
+        "prompt_tokens": sum(r.get("prompt_tokens") or 0 for r in records),
+        "completion_tokens": sum(r.get("completion_tokens") or 0 for r in records),
+        "total_tokens": sum(r.get("total_tokens") or 0 for r in records),
+        "latency_ms": sum(r.get("latency_ms") or 0 for r in records)
+    }
+
+
+def group_usage(records: List[Dict[str, Any]], key: str) -> Dict[str, Dict[str, int]]:
+    """Summarize usage records grouped by a field (stage, model, job_id)"""
+    groups: Dict[str, List[Dict[str, Any]]] = {}
+    for record in records:
+        groups.setdefault(str(record.get(key)), []).append(record)
+    return {name: summarize_usage(group) for name, group in groups.items()}
+
+
+def month_start(now: Optional[datetime] = None) -> datetime:
+    """Start of the current calendar month (UTC), the token quota period"""
+    now = now or datetime.utcnow()
+    return now.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+
+
+current_usage: ContextVar[Optional[UsageTracker]] = ContextVar("llm_usage", default=None)
+
+
+def record_usage(stage: str, model: str, prompt_tokens: int, completion_tokens: int, latency_ms: int):
+    """Attribute a call to the tracker bound to the current context, if any"""
+    tracker = current_usage.get()
+    if tracker is not None:
+        tracker.record(stage, model, prompt_tokens, completion_tokens, latency_ms)
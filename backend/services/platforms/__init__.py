@@ -0,0 +1,271 @@
+"""
+Declarative registry of output platforms
+
+Each platform is described once: its prompt, token budget, the fields its
+output must contain, how to normalize/validate a parsed response and what to
+return when generation fails. The job processor drives every platform through
+the same call/parse/validate/fallback path.
+"""
+from dataclasses import dataclass
+from string import Formatter
+from typing import Any, Callable, Dict, List, Optional
+
+
+@dataclass(frozen=True)
+class PlatformSpec:
+    """Generation settings for one output platform"""
+    name: str
+    prompt_template: str
+    max_tokens: int
+    required_fields: List[str]
+    fallback: Callable[[List[str]], Dict[str, Any]]
+    normalize: Optional[Callable[[Dict[str, Any]], Dict[str, Any]]] = None
+    validator: Optional[Callable[[Dict[str, Any]], List[str]]] = None
+    content_chars: int = 2000
+    insight_count: Optional[int] = None
+    
+    def build_prompt(self, content: str, analysis: Dict[str, Any]) -> str:
+        """Render the prompt for content and its analysis"""
+        inputs = self.prompt_inputs(content, analysis)
+        if "insights" in inputs:
+            inputs["insights"] = ", ".join(inputs["insights"])
+        return self.prompt_template.format(**inputs)
+    
+    def prompt_inputs(self, content: str, analysis: Dict[str, Any]) -> Dict[str, Any]:
+        """The values the prompt reads: its window of the content and the analysis fields it uses"""
+        values = {
+            "content": content[:self.content_chars],
+            "insights": self.insights(analysis),
+            "tone": analysis.get("tone", "professional")
+        }
+        fields = {name for _, name, _, _ in Formatter().parse(self.prompt_template) if name}
+        return {name: value for name, value in values.items() if name in fields}
+    
+    def insights(self, analysis: Dict[str, Any]) -> List[str]:
+        """Key insights used by this platform"""
+        insights = [str(i) for i in analysis.get("key_insights", [])]
+        return insights[:self.insight_count] if self.insight_count else insights
+    
+    def validate(self, result: Dict[str, Any]) -> List[str]:
+        """Return a list of problems with a parsed result (empty if valid)"""
+        if not isinstance(result, dict):
+            return ["response is not a JSON object"]
+        errors = [f"missing {field}" for field in self.required_fields if not result.get(field)]
+        if self.validator and not errors:
+            errors.extend(self.validator(result))
+        return errors
+
+
+# Normalizers and validators
+
+def _normalize_linkedin(result: Dict[str, Any]) -> Dict[str, Any]:
+    result["character_count"] = len(result.get("post", ""))
+    return result
+
+
+def _normalize_twitter(result: Dict[str, Any]) -> Dict[str, Any]:
+    for tweet in result.get("tweets", []):
+        if "char_count" not in tweet:
+            tweet["char_count"] = len(tweet.get("text", ""))
+    return result
+
+
+def _normalize_blog(result: Dict[str, Any]) -> Dict[str, Any]:
+    if "word_count" not in result:
+        result["word_count"] = len(result.get("content", "").split())
+    return result
+
+
+def _normalize_email(result: Dict[str, Any]) -> Dict[str, Any]:
+    for email in result.get("emails", []):
+        if "word_count" not in email:
+            email["word_count"] = len(email.get("content", "").split())
+    return result
+
+
+def _validate_list_of_objects(field: str) -> Callable[[Dict[str, Any]], List[str]]:
+    def validate(result: Dict[str, Any]) -> List[str]:
+        items = result.get(field)
+        if not isinstance(items, list) or not all(isinstance(item, dict) for item in items):
+            return [f"{field} must be a list of objects"]
+        return []
+    return validate
+
+
+# Fallbacks
+
+def _fallback_linkedin(insights: List[str]) -> Dict[str, Any]:
+    post_text = f"Key insights: {'. '.join(insights[:2])}. What are your thoughts?"
+    return {
+        "post": post_text,
+        "hashtags": ["#business", "#insights", "#professional"],
+        "cta": "Share your thoughts!",
+        "character_count": len(post_text)
+    }
+
+
+def _fallback_twitter(insights: List[str]) -> Dict[str, Any]:
+    tweets = []
+    for i, insight in enumerate(insights[:3], 1):
+        tweet_text = f"{i}/{len(insights[:3])} {insight}"
+        tweets.append({
+            "number": i,
+            "text": tweet_text,
+            "char_count": len(tweet_text)
+        })
+    return {"tweets": tweets}
+
+
+def _fallback_blog(insights: List[str]) -> Dict[str, Any]:
+    blog_content = f"# Key Insights\n\n{chr(10).join([f'- {insight}' for insight in insights])}\n\nThese insights provide valuable perspective on the topic."
+    return {
+        "title": "Key Insights and Analysis",
+        "content": blog_content,
+        "meta_description": "Discover key insights and analysis on this important topic.",
+        "word_count": len(blog_content.split())
+    }
+
+
+def _fallback_email(insights: List[str]) -> Dict[str, Any]:
+    return {
+        "emails": [
+            {
+                "number": 1,
+                "subject": "Introduction to Key Insights",
+                "content": f"Hello! I wanted to share some key insights: {insights[0] if insights else 'Important information'}",
+                "word_count": 50
+            },
+            {
+                "number": 2,
+                "subject": "Deep Dive Analysis",
+                "content": f"Let's explore further: {'. '.join(insights[:2])}",
+                "word_count": 75
+            },
+            {
+                "number": 3,
+                "subject": "Take Action",
+                "content": "Ready to implement these insights? Let's connect and discuss next steps.",
+                "word_count": 40
+            }
+        ]
+    }
+
+
+PLATFORM_REGISTRY: Dict[str, PlatformSpec] = {
+    "linkedin": PlatformSpec(
+        name="linkedin",
+        prompt_template="""
+        Create a professional LinkedIn post based on this content:
+        
+        Content: {content}
+        Key insights: {insights}
+        Tone: {tone}
+        
+        Requirements:
+        - Maximum 1300 characters
+        - Professional tone
+        - Include 3-5 hashtags
+        - Include a call-to-action
+        - Engaging opening
+        
+        Return only JSON: {{"post": "text", "hashtags": ["#tag1", "#tag2"], "cta": "action"}}
+        """,
+        max_tokens=1000,
+        required_fields=["post", "hashtags"],
+        fallback=_fallback_linkedin,
+        normalize=_normalize_linkedin,
+        insight_count=3
+    ),
+    "twitter": PlatformSpec(
+        name="twitter",
+        prompt_template="""
+        Create a Twitter thread based on this content:
+        
+        Content: {content}
+        Key insights: {insights}
+        
+        Requirements:
+        - 3-5 tweets
+        - Each tweet max 280 characters
+        - Engaging first tweet
+        - Include hashtags
+        
+        Return only JSON: {{"tweets": [{{"number": 1, "text": "tweet text", "char_count": 150}}]}}
+        """,
+        max_tokens=1000,
+        required_fields=["tweets"],
+        fallback=_fallback_twitter,
+        normalize=_normalize_twitter,
+        validator=_validate_list_of_objects("tweets"),
+        insight_count=4
+    ),
+    "blog": PlatformSpec(
+        name="blog",
+        prompt_template="""
+        Create a blog post based on this content:
+        
+        Content: {content}
+        Key insights: {insights}
+        Tone: {tone}
+        
+        Requirements:
+        - 500-700 words
+        - SEO title
+        - Meta description (150 chars)
+        - Clear structure
+        
+        Return only JSON: {{"title": "title", "content": "blog content", "meta_description": "desc", "word_count": 600}}
+        """,
+        max_tokens=2000,
+        required_fields=["title", "content"],
+        fallback=_fallback_blog,
+        normalize=_normalize_blog,
+        content_chars=3000
+    ),
+    "email": PlatformSpec(
+        name="email",
+        prompt_template="""
+        Create a 3-email sequence based on this content:
+        
+        Content: {content}
+        Key insights: {insights}
+        
+        Requirements:
+        - 3 emails with subjects and content
+        - Email 1: Introduction (200-300 words)
+        - Email 2: Main content (300-400 words)
+        - Email 3: Call-to-action (200-300 words)
+        
+        Return only JSON: {{"emails": [{{"number": 1, "subject": "subject", "content": "email content", "word_count": 250}}]}}
+        """,
+        max_tokens=2000,
+        required_fields=["emails"],
+        fallback=_fallback_email,
+        normalize=_normalize_email,
+        validator=_validate_list_of_objects("emails")
+    ),
+}
+
+
+def get_platform(name: str) -> Optional[PlatformSpec]:
+    """Get the spec for a platform, or None if it isn't registered"""
+    return PLATFORM_REGISTRY.get(name)
+
+
+def content_window() -> int:
+    """Characters of content read by the widest platform prompt"""
+    return max(spec.content_chars for spec in PLATFORM_REGISTRY.values())
+
+
+def unsupported_platforms(platforms: List[str]) -> List[str]:
+    """Platforms that have no registry entry"""
+    return [p for p in platforms if p not in PLATFORM_REGISTRY]
+
+
+__all__ = [
+    "PlatformSpec",
+    "PLATFORM_REGISTRY",
+    "get_platform",
+    "content_window",
+    "unsupported_platforms",
+]
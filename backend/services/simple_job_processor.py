@@ -2,17 +2,45 @@
 Simple job processing service using Groq API directly
 """
 import asyncio
+import hashlib
 import json
-import re
-from typing import List, Dict, Any
+import os
+from typing import List, Dict, Any, Optional, Tuple
 from uuid import UUID
 from datetime import datetime
 from loguru import logger
-from groq import Groq
 
-from db.repositories import JobRepository, ContentRepository, OutputRepository
+from db.repositories import (
+    JobRepository,
+    ContentRepository,
+    OutputRepository,
+    UsageRepository,
+    UserRepository
+)
 from db.supabase import supabase_admin_client
 from core.config import settings
+from services.llm import llm_client, parse_json_response, MicroBatcher, UsageTracker, current_usage, month_start
+from services.platforms import get_platform, content_window, unsupported_platforms
+from services.dedup import (
+    normalize_text,
+    compute_content_hash,
+    compute_minhash,
+    estimate_similarity,
+    lsh_bands,
+    split_sections,
+    changed_sections
+)
+
+# Characters of content the analysis prompt reads
+ANALYSIS_CONTENT_CHARS = 3000
+
+
+class StageError(Exception):
+    """A pipeline stage failed; the job records which one"""
+    
+    def __init__(self, stage: str, message: str):
+        super().__init__(message)
+        self.stage = stage
 
 
 class SimpleJobProcessor:
@@ -22,10 +50,24 @@ class SimpleJobProcessor:
         self.job_repo = JobRepository(supabase_admin_client)
         self.content_repo = ContentRepository(supabase_admin_client)
         self.output_repo = OutputRepository(supabase_admin_client)
+        self.usage_repo = UsageRepository(supabase_admin_client)
+        self.user_repo = UserRepository(supabase_admin_client)
         self.is_running = False
+        self._last_raw_sweep: Optional[float] = None
         
-        # Configure Groq
-        self.client = Groq(api_key=settings.GROQ_API_KEY)
+        # Shared Groq client (collapses identical in-flight requests)
+        self.llm = llm_client
+        self._job_slots = asyncio.Semaphore(settings.MAX_CONCURRENT_JOBS)
+        
+        # Analyses started at upload time, keyed by content id
+        self._analysis_tasks: Dict[str, asyncio.Task] = {}
+        
+        # Short analyses share one multi-document prompt when batching is on
+        self.analysis_batcher = MicroBatcher(
+            self._analyze_batch,
+            max_items=settings.ANALYSIS_BATCH_MAX_ITEMS,
+            max_wait_ms=settings.ANALYSIS_BATCH_MAX_WAIT_MS
+        )
     
     async def start(self):
         """Start the job processor"""
@@ -34,12 +76,28 @@ class SimpleJobProcessor:
         
         while self.is_running:
             try:
+                await self.sweep_raw_inputs()
                 await self.process_pending_jobs()
                 await asyncio.sleep(5)  # Check every 5 seconds
             except Exception as e:
                 logger.error(f"Job processor error: {e}")
                 await asyncio.sleep(10)  # Wait longer on error
     
+    async def sweep_raw_inputs(self):
+        """Remove uploads left behind by failed extractions, at most once an hour"""
+        from services.extraction import raw_inputs
+        
+        now = asyncio.get_running_loop().time()
+        if self._last_raw_sweep is not None and now - self._last_raw_sweep < 3600:
+            return
+        self._last_raw_sweep = now
+        try:
+            removed = await asyncio.to_thread(raw_inputs.sweep, settings.RAW_INPUT_RETENTION_HOURS * 3600)
+            if removed:
+                logger.info(f"Removed {removed} expired raw inputs")
+        except Exception as e:
+            logger.error(f"Raw input sweep failed: {e}")
+    
     def stop(self):
         """Stop the job processor"""
         self.is_running = False
@@ -49,24 +107,28 @@ class SimpleJobProcessor:
         """Process all pending jobs"""
         try:
             # Get pending jobs
-            pending_jobs = await self.job_repo.get_pending_jobs(limit=5)
+            pending_jobs = await self.job_repo.get_pending_jobs(limit=settings.MAX_CONCURRENT_JOBS)
             
             if not pending_jobs:
                 return
             
             logger.info(f"Processing {len(pending_jobs)} pending jobs")
             
-            # Process each job
-            for job in pending_jobs:
-                try:
-                    await self.process_job(job)
-                except Exception as e:
-                    logger.error(f"Error processing job {job['id']}: {e}")
-                    await self.mark_job_failed(job["id"], str(e))
+            # Process jobs concurrently, bounded by MAX_CONCURRENT_JOBS
+            await asyncio.gather(*(self._process_job_slot(job) for job in pending_jobs))
         
         except Exception as e:
             logger.error(f"Error getting pending jobs: {e}")
     
+    async def _process_job_slot(self, job: Dict[str, Any]):
+        """Process a job once a concurrency slot is free"""
+        async with self._job_slots:
+            try:
+                await self.process_job(job)
+            except Exception as e:
+                logger.error(f"Error processing job {job['id']}: {e}")
+                await self.mark_job_failed(job["id"], str(e))
+    
     async def process_job(self, job: Dict[str, Any]):
         """Process a single job"""
         job_id = job["id"]
@@ -79,15 +141,30 @@ class SimpleJobProcessor:
             "status": "processing",
             "started_at": datetime.utcnow().isoformat(),
             "current_step": "Loading content",
-            "progress_percentage": 10
+            "progress_percentage": 5
         })
         
+        # Attribute every LLM call made for this job to its usage tracker
+        usage = UsageTracker()
+        usage_token = current_usage.set(usage)
+        
         try:
             # Get content
             content = await self.content_repo.get_by_id(UUID(content_id))
             if not content:
                 raise Exception(f"Content not found: {content_id}")
             
+            if settings.ENFORCE_TOKEN_QUOTAS:
+                await self.check_token_quota(job["user_id"])
+            
+            unsupported = unsupported_platforms(job["platforms"])
+            if unsupported:
+                raise ValueError(f"Unsupported platforms: {', '.join(unsupported)}")
+            
+            # First stage for uploads and URLs: turn the stored input into text
+            if content.get("extraction_status", "completed") != "completed":
+                content = await self.extract_content(job, content)
+            
             # Update progress
             await self.job_repo.update(UUID(job_id), {
                 "current_step": "Generating job title",
@@ -107,28 +184,56 @@ class SimpleJobProcessor:
             })
             logger.info(f"Updated job {job_id} with title in database")
             
-            # Analyze content
-            analysis = await self.analyze_content(content["original_text"])
-            
-            # Process each platform
-            platforms = job["platforms"]
+            # Identical earlier submissions make this job free
             outputs = {}
+            output_metadata = {}
+            validation = {}
+            reusable = await self.find_reusable_outputs(job, content)
             
-            for i, platform in enumerate(platforms):
-                progress = 30 + (i * 40 // len(platforms))
-                await self.job_repo.update(UUID(job_id), {
-                    "current_step": f"Generating {platform} content",
-                    "progress_percentage": progress
-                })
+            if reusable:
+                logger.info(f"Reusing outputs for job {job_id} from identical content")
+                for platform, output in reusable.items():
+                    outputs[platform] = output["content"]
+                    output_metadata[platform] = self._reused_output_metadata(output)
+                    input_hash = (output.get("generation_metadata") or {}).get("input_hash")
+                    if input_hash:
+                        output_metadata[platform]["input_hash"] = input_hash
+            else:
+                # Analyze content (speculative, reused, or incremental from a previous revision or near-duplicate)
+                analysis, near_duplicate = await self.get_analysis(content)
+                input_hashes = {
+                    platform: self.platform_input_hash(platform, content["original_text"], analysis, job)
+                    for platform in job["platforms"]
+                }
+                
+                # A revision can keep the outputs whose inputs didn't change
+                unchanged = {}
+                if job.get("regenerate") == "changed" and content.get("previous_revision_id"):
+                    unchanged = await self.find_unchanged_outputs(job, content, input_hashes)
+                for platform, output in unchanged.items():
+                    outputs[platform] = output["content"]
+                    output_metadata[platform] = {
+                        **self._reused_output_metadata(output),
+                        "input_hash": input_hashes[platform]
+                    }
+                if unchanged:
+                    logger.info(f"Job {job_id} keeps unchanged outputs for {', '.join(unchanged)}")
                 
-                if platform == "linkedin":
-                    outputs[platform] = await self.generate_linkedin(content["original_text"], analysis)
-                elif platform == "twitter":
-                    outputs[platform] = await self.generate_twitter(content["original_text"], analysis)
-                elif platform == "blog":
-                    outputs[platform] = await self.generate_blog(content["original_text"], analysis)
-                elif platform == "email":
-                    outputs[platform] = await self.generate_email(content["original_text"], analysis)
+                # Fan out to every other platform through the registry
+                platforms = [platform for platform in job["platforms"] if platform not in unchanged]
+                if platforms:
+                    generated, validation = await self.generate_outputs(
+                        job_id, platforms, content["original_text"], analysis
+                    )
+                    outputs.update(generated)
+                    
+                    for platform in generated:
+                        output_metadata[platform] = {
+                            "usage": usage.summary(platform),
+                            "input_hash": input_hashes[platform]
+                        }
+                        if near_duplicate:
+                            output_metadata[platform]["near_duplicate"] = near_duplicate
             
             # Update progress
             await self.job_repo.update(UUID(job_id), {
@@ -137,7 +242,7 @@ class SimpleJobProcessor:
             })
             
             # Save outputs
-            await self.save_outputs(job, content, outputs)
+            await self.save_outputs(job, content, outputs, output_metadata, validation)
             
             # Calculate processing time
             start_time_str = job.get("started_at")
@@ -163,14 +268,444 @@ class SimpleJobProcessor:
         
         except Exception as e:
             logger.error(f"Job {job_id} failed: {e}")
-            await self.mark_job_failed(job_id, str(e))
+            await self.mark_job_failed(job_id, str(e), stage=getattr(e, "stage", None))
+        
+        finally:
+            current_usage.reset(usage_token)
+            await self.save_usage(job, usage)
+    
+    async def extract_content(self, job: Dict[str, Any], content: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Extraction stage: parse the upload or fetch the URL stored at
+        submission time and fill in the content's text, title and metadata.
+        
+        The job is 'extracting' (5-10%) while this runs. On failure the
+        content is marked failed with the error and StageError is raised.
+        """
+        from services.extraction import (
+            WorkerDiedError,
+            extract_content_from_file,
+            extract_content_from_url,
+            raw_inputs
+        )
+        
+        job_id = UUID(job["id"])
+        content_id = UUID(content["id"])
+        metadata = dict(content.get("metadata") or {})
+        
+        await self.job_repo.update(job_id, {
+            "status": "extracting",
+            "current_step": "Extracting content",
+            "progress_percentage": 5
+        })
+        await self.content_repo.update(content_id, {"extraction_status": "extracting", "extraction_error": None})
+        
+        async def on_progress(done: int, total: int):
+            await self.job_repo.update(job_id, {
+                "current_step": f"Extracting content ({done}/{total})",
+                "progress_percentage": 5 + done * 5 // total
+            })
+        
+        try:
+            if content["source_type"] == "url":
+                extracted = await extract_content_from_url(content["source_url"])
+            else:
+                path = raw_inputs.path(content["file_path"])
+                if not os.path.exists(path):
+                    raise ValueError("Uploaded file is no longer available")
+                extracted = await extract_content_from_file(
+                    path,
+                    metadata.get("filename") or os.path.basename(path),
+                    digest=metadata.get("sha256"),
+                    on_progress=on_progress
+                )
+        except Exception as e:
+            await self.content_repo.update(content_id, {"extraction_status": "failed", "extraction_error": str(e)})
+            # A retry may get past a timeout or a dead worker, so keep the
+            # upload for it (sweep_raw_inputs removes it later); other errors
+            # come from the document itself and will happen again
+            if content.get("file_path") and not isinstance(e, (TimeoutError, asyncio.TimeoutError, WorkerDiedError)):
+                raw_inputs.delete(content["file_path"])
+            raise StageError("extraction", str(e))
+        
+        # The text is on the content row from here on
+        if content.get("file_path"):
+            raw_inputs.delete(content["file_path"])
+        
+        update = {
+            "original_text": extracted["text"],
+            "content_hash": compute_content_hash(extracted["text"]),
+            "sections": split_sections(extracted["text"]),
+            "source_type": extracted["source_type"],
+            "extraction_status": "completed",
+            "metadata": {**metadata, **extracted.get("metadata", {})}
+        }
+        if not metadata.get("title_from_user") and extracted.get("title"):
+            update["title"] = extracted["title"][:500]
+        content = await self.content_repo.update(content_id, update)
+        
+        await self.job_repo.update(job_id, {
+            "status": "processing",
+            "current_step": "Content extracted",
+            "progress_percentage": 10
+        })
+        logger.info(f"Extracted content {content_id} for job {job_id}")
+        return content
+    
+    async def check_token_quota(self, user_id: str):
+        """Raise if the user has used up their tier's monthly token quota"""
+        profile = await self.user_repo.get_profile(UUID(user_id))
+        tier = (profile or {}).get("subscription_tier") or "free"
+        quota = settings.token_quota(tier)
+        if not quota:
+            return
+        
+        used = await self.usage_repo.get_tokens_since(UUID(user_id), month_start())
+        if used >= quota:
+            raise ValueError(f"Monthly token quota exceeded for {tier} tier ({used}/{quota} tokens)")
+    
+    async def save_usage(self, job: Dict[str, Any], usage: UsageTracker):
+        """Persist the job's per-call LLM usage records"""
+        if not usage.records:
+            return
+        
+        totals = usage.summary()
+        logger.info(
+            f"Job {job['id']} used {totals['total_tokens']} tokens "
+            f"({totals['prompt_tokens']} prompt, {totals['completion_tokens']} completion) "
+            f"in {totals['calls']} LLM calls"
+        )
+        try:
+            await self.usage_repo.create_many([
+                {"job_id": job["id"], "user_id": job["user_id"], **record}
+                for record in usage.records
+            ])
+        except Exception as e:
+            logger.error(f"Error saving usage for job {job['id']}: {e}")
+    
+    async def find_reusable_outputs(
+        self,
+        job: Dict[str, Any],
+        content: Dict[str, Any]
+    ) -> Optional[Dict[str, Dict[str, Any]]]:
+        """
+        Find outputs of a completed job on identical content (same normalized
+        text hash and user) that covers this job's platforms with the same
+        preferences. Returns platform -> output record, or None.
+        """
+        content_hash = content.get("content_hash")
+        if not content_hash:
+            return None
+        
+        try:
+            # Content that already has outputs is being regenerated on purpose
+            if await self.output_repo.get_by_content(UUID(content["id"])):
+                return None
+            
+            duplicates = await self.content_repo.get_by_hash(
+                UUID(content["user_id"]),
+                content_hash,
+                exclude_id=UUID(content["id"])
+            )
+            if not duplicates:
+                return None
+            
+            platforms = set(job["platforms"])
+            preferences = job.get("user_preferences") or {}
+            candidates = await self.job_repo.get_completed_by_contents([d["id"] for d in duplicates])
+            
+            for candidate in candidates:
+                if (candidate.get("user_preferences") or {}) != preferences:
+                    continue
+                if not platforms.issubset(candidate.get("platforms") or []):
+                    continue
+                
+                by_platform = {
+                    output["platform"]: output
+                    for output in await self.output_repo.get_by_job(UUID(candidate["id"]))
+                }
+                if platforms.issubset(by_platform):
+                    return {platform: by_platform[platform] for platform in job["platforms"]}
+        
+        except Exception as e:
+            # Reuse is an optimization; fall back to generating
+            logger.warning(f"Output reuse lookup failed for job {job['id']}: {e}")
+        
+        return None
+    
+    def platform_input_hash(
+        self,
+        platform: str,
+        text: str,
+        analysis: Dict[str, Any],
+        job: Dict[str, Any]
+    ) -> str:
+        """
+        Fingerprint of everything a platform's generation depends on: the
+        window of the text and the analysis fields its prompt reads, the
+        model and the job's preferences
+        """
+        payload = json.dumps({
+            "inputs": get_platform(platform).prompt_inputs(text, analysis),
+            "model": settings.model_for(platform),
+            "preferences": job.get("user_preferences") or {}
+        }, sort_keys=True)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+    
+    async def find_unchanged_outputs(
+        self,
+        job: Dict[str, Any],
+        content: Dict[str, Any],
+        input_hashes: Dict[str, str]
+    ) -> Dict[str, Dict[str, Any]]:
+        """
+        Find outputs of the previous revision's completed jobs generated from
+        exactly the inputs this job would use. Returns platform -> output
+        record for the platforms that need no regeneration.
+        """
+        unchanged: Dict[str, Dict[str, Any]] = {}
+        try:
+            candidates = await self.job_repo.get_completed_by_contents([content["previous_revision_id"]])
+            for candidate in candidates:
+                for output in await self.output_repo.get_by_job(UUID(candidate["id"])):
+                    platform = output["platform"]
+                    input_hash = (output.get("generation_metadata") or {}).get("input_hash")
+                    if platform not in unchanged and input_hash and input_hash == input_hashes.get(platform):
+                        unchanged[platform] = output
+                if len(unchanged) == len(input_hashes):
+                    break
+        
+        except Exception as e:
+            # Reuse is an optimization; fall back to generating
+            logger.warning(f"Unchanged output lookup failed for job {job['id']}: {e}")
+            return {}
+        
+        return unchanged
+    
+    def start_speculative_analysis(self, content: Dict[str, Any], job: Dict[str, Any]):
+        """
+        Start analyzing freshly created content in the background so that
+        process_job finds the analysis ready instead of waiting on the LLM
+        """
+        content_id = str(content["id"])
+        if content_id in self._analysis_tasks:
+            return
+        
+        task = asyncio.create_task(self._speculative_analysis(content, job))
+        self._analysis_tasks[content_id] = task
+        
+        # Keep the finished task around long enough for the job poll to see it
+        task.add_done_callback(
+            lambda _: asyncio.get_running_loop().call_later(
+                settings.SPECULATIVE_ANALYSIS_TTL_SECONDS,
+                self._analysis_tasks.pop,
+                content_id,
+                None
+            )
+        )
+    
+    async def _speculative_analysis(self, content: Dict[str, Any], job: Dict[str, Any]):
+        """Run prepare_analysis, attributing its tokens to the job"""
+        usage = UsageTracker()
+        current_usage.set(usage)
+        try:
+            return await self.prepare_analysis(content)
+        except Exception as e:
+            logger.warning(f"Speculative analysis failed for content {content['id']}: {e}")
+            return None
+        finally:
+            await self.save_usage(job, usage)
+    
+    async def get_analysis(self, content: Dict[str, Any]) -> Tuple[Dict[str, Any], Optional[Dict[str, Any]]]:
+        """
+        Get the analysis from a speculative run or the content record,
+        analyzing now only if neither has it
+        """
+        task = self._analysis_tasks.get(str(content["id"]))
+        if task:
+            result = await asyncio.shield(task)
+            if result:
+                logger.info(f"Using speculative analysis for content {content['id']}")
+                return result
+        elif content.get("analysis"):
+            return content["analysis"], (content.get("metadata") or {}).get("near_duplicate")
+        
+        return await self.prepare_analysis(content)
+    
+    async def prepare_analysis(self, content: Dict[str, Any]) -> Tuple[Dict[str, Any], Optional[Dict[str, Any]]]:
+        """
+        Get the content analysis, updating the previous revision's analysis
+        with just the changed sections, or reusing or warm-starting from the
+        most similar analyzed near-duplicate. Returns (analysis, near_duplicate)
+        where near_duplicate describes the revision or match, if any.
+        """
+        text = content["original_text"]
+        signature = await asyncio.to_thread(compute_minhash, text)
+        bands = lsh_bands(signature)
+        
+        revision = None
+        if content.get("previous_revision_id"):
+            revision = await self.prepare_revision_analysis(content)
+        
+        if revision:
+            analysis, near_duplicate = revision
+            logger.info(
+                f"Content {content['id']} is a revision of {near_duplicate['content_id']} "
+                f"({near_duplicate['changed_sections']} changed, {near_duplicate['removed_sections']} removed "
+                f"of {near_duplicate['total_sections']} sections), analysis {near_duplicate['analysis']}"
+            )
+        else:
+            best, best_similarity = None, 0.0
+            try:
+                candidates = await self.content_repo.get_analyzed_by_bands(
+                    UUID(content["user_id"]),
+                    bands,
+                    exclude_id=UUID(content["id"])
+                )
+                for candidate in candidates:
+                    similarity = estimate_similarity(signature, candidate.get("minhash_signature") or [])
+                    if similarity > best_similarity:
+                        best, best_similarity = candidate, similarity
+            except Exception as e:
+                logger.warning(f"Near-duplicate lookup failed for content {content['id']}: {e}")
+            
+            near_duplicate = None
+            if best and best_similarity >= settings.NEAR_DUPLICATE_REUSE_THRESHOLD:
+                analysis = best["analysis"]
+                near_duplicate = {"content_id": best["id"], "similarity": round(best_similarity, 3), "analysis": "reused"}
+            elif best and best_similarity >= settings.NEAR_DUPLICATE_WARM_START_THRESHOLD:
+                analysis = await self.analyze_content(text, prior_analysis=best["analysis"])
+                near_duplicate = {"content_id": best["id"], "similarity": round(best_similarity, 3), "analysis": "warm_start"}
+            else:
+                analysis = await self.analyze_content(text)
+            
+            if near_duplicate:
+                logger.info(f"Content {content['id']} matches {best['id']} (similarity {best_similarity:.2f}), analysis {near_duplicate['analysis']}")
+        
+        update = {
+            "analysis": analysis,
+            "minhash_signature": [int(v) for v in signature],
+            "lsh_bands": bands
+        }
+        if not content.get("sections"):
+            update["sections"] = split_sections(text)
+        if near_duplicate:
+            update["metadata"] = {**(content.get("metadata") or {}), "near_duplicate": near_duplicate}
+        
+        try:
+            await self.content_repo.update(UUID(content["id"]), update)
+        except Exception as e:
+            logger.warning(f"Failed to store analysis for content {content['id']}: {e}")
+        
+        return analysis, near_duplicate
     
-    async def analyze_content(self, content: str) -> Dict[str, Any]:
+    async def prepare_revision_analysis(self, content: Dict[str, Any]) -> Optional[Tuple[Dict[str, Any], Dict[str, Any]]]:
+        """
+        Analyze a revision by comparing its sections with the previous
+        revision's. The previous analysis is kept when no section changed, or
+        when the changed sections lie beyond the text the analysis and the
+        platform prompts read; otherwise
+        only the added and removed sections are sent to the LLM. Returns
+        (analysis, revision) or None if the previous revision isn't analyzed.
+        """
+        try:
+            previous = await self.content_repo.get_by_id(UUID(content["previous_revision_id"]))
+        except Exception as e:
+            logger.warning(f"Previous revision lookup failed for content {content['id']}: {e}")
+            return None
+        if not previous or not previous.get("analysis") or not previous.get("original_text"):
+            return None
+        
+        text = content["original_text"]
+        previous_text = previous["original_text"]
+        sections = content.get("sections") or split_sections(text)
+        added, removed = changed_sections(previous.get("sections") or split_sections(previous_text), sections)
+        revision = {
+            "content_id": previous["id"],
+            "relation": "revision",
+            "changed_sections": len(added),
+            "removed_sections": len(removed),
+            "total_sections": len(sections)
+        }
+        
+        # Keep the analysis when the changes all lie beyond the text the
+        # analysis and every platform prompt read
+        window = max(ANALYSIS_CONTENT_CHARS, content_window())
+        if (not added and not removed) or text[:window] == previous_text[:window]:
+            revision["analysis"] = "reused"
+            return previous["analysis"], revision
+        
+        analysis = await self._analyze_revision(
+            previous["analysis"],
+            "\n\n".join(text[s["start"]:s["end"]] for s in added),
+            "\n\n".join(previous_text[s["start"]:s["end"]] for s in removed)
+        )
+        revision["analysis"] = "incremental"
+        return analysis, revision
+    
+    async def analyze_content(self, content: str, prior_analysis: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
         """Analyze content using Groq"""
+        if (
+            settings.ANALYSIS_BATCHING
+            and prior_analysis is None
+            and len(content) <= settings.ANALYSIS_BATCH_MAX_CHARS
+        ):
+            return await self.analysis_batcher.submit((content, current_usage.get()))
+        return await self._analyze_unbatched(content, prior_analysis)
+    
+    async def _analyze_unbatched(self, content: str, prior_analysis: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """Analyze one text with its own prompt"""
+        prior = ""
+        if prior_analysis:
+            prior = f"""
+        An earlier version of this content was analyzed as follows.
+        Keep what still applies and update what changed:
+        {json.dumps(prior_analysis)[:1500]}
+        """
+        
         prompt = f"""
         Analyze this content and extract key information:
         
-        Content: {content[:3000]}
+        Content: {content[:ANALYSIS_CONTENT_CHARS]}
+        {prior}
+        Provide a JSON response with:
+        - key_insights: array of 3-5 main insights
+        - tone: professional/casual/technical/inspirational
+        - audience: target audience description
+        - content_type: tutorial/opinion/case-study/news/guide
+        
+        Return only valid JSON, no other text.
+        """
+        
+        try:
+            response_text = await self.llm.complete(prompt, stage="analysis")
+            analysis = parse_json_response(response_text)
+            if isinstance(analysis, dict):
+                return analysis
+        except Exception as e:
+            logger.error(f"Content analysis error: {e}")
+        
+        return self._fallback_analysis()
+    
+    async def _analyze_revision(
+        self,
+        prior_analysis: Dict[str, Any],
+        added: str,
+        removed: str
+    ) -> Dict[str, Any]:
+        """Update a previous revision's analysis from the sections that changed"""
+        prompt = f"""
+        A document was analyzed as follows:
+        {json.dumps(prior_analysis)[:1500]}
+        
+        A new revision of the document changes some sections.
+        
+        Sections added or rewritten: {added[:3000] or "(none)"}
+        
+        Sections removed or replaced: {removed[:1500] or "(none)"}
+        
+        Update the analysis for the new revision. Copy every key insight, the
+        tone, audience and content_type unchanged unless these changes affect them.
         
         Provide a JSON response with:
         - key_insights: array of 3-5 main insights
@@ -182,39 +717,105 @@ class SimpleJobProcessor:
         """
         
         try:
-            response = self.client.chat.completions.create(
-                model=settings.GROQ_MODEL,
-                messages=[{"role": "user", "content": prompt}],
-                temperature=settings.GROQ_TEMPERATURE,
-                max_tokens=settings.GROQ_MAX_TOKENS
+            response_text = await self.llm.complete(prompt, stage="analysis")
+            analysis = parse_json_response(response_text)
+            if isinstance(analysis, dict) and analysis.get("key_insights"):
+                return _keep_prior_wording(analysis, prior_analysis)
+        except Exception as e:
+            logger.error(f"Revision analysis error: {e}")
+        
+        # The previous revision's analysis is a better fallback than a generic one
+        return prior_analysis
+    
+    async def _analyze_batch(self, items: List[Tuple[str, Optional[UsageTracker]]]) -> List[Dict[str, Any]]:
+        """
+        Analyze several short texts with one multi-document prompt.
+        
+        Documents missing or malformed in the response are analyzed
+        individually. Token usage of the shared call is split evenly across
+        the callers' trackers.
+        """
+        if len(items) == 1:
+            content, tracker = items[0]
+            token = current_usage.set(tracker)
+            try:
+                return [await self._analyze_unbatched(content)]
+            finally:
+                current_usage.reset(token)
+        
+        documents = "\n".join(
+            f'<document id="{i}">\n{content}\n</document>'
+            for i, (content, _) in enumerate(items, 1)
+        )
+        prompt = f"""
+        Analyze each of the following {len(items)} documents independently and extract key information:
+        
+        {documents}
+        
+        For each document provide:
+        - key_insights: array of 3-5 main insights
+        - tone: professional/casual/technical/inspirational
+        - audience: target audience description
+        - content_type: tutorial/opinion/case-study/news/guide
+        
+        Return only valid JSON, no other text:
+        {{"results": [{{"id": 1, "key_insights": [], "tone": "", "audience": "", "content_type": ""}}]}}
+        """
+        
+        batch_usage = UsageTracker()
+        token = current_usage.set(batch_usage)
+        by_id: Dict[int, Dict[str, Any]] = {}
+        try:
+            response_text = await self.llm.complete(
+                prompt,
+                max_tokens=min(8000, 400 * len(items)),
+                stage="analysis"
             )
+            parsed = parse_json_response(response_text)
+            for result in (parsed or {}).get("results", []) if isinstance(parsed, dict) else []:
+                if isinstance(result, dict) and isinstance(result.get("id"), int):
+                    by_id[result.pop("id")] = result
+        except Exception as e:
+            logger.error(f"Batched content analysis error ({len(items)} documents): {e}")
+        finally:
+            current_usage.reset(token)
+        
+        # Split the shared call's usage across the jobs in the batch
+        for record in batch_usage.records:
+            for _, tracker in items:
+                if tracker is not None:
+                    tracker.record(
+                        record["stage"],
+                        record["model"],
+                        record["prompt_tokens"] // len(items),
+                        record["completion_tokens"] // len(items),
+                        record["latency_ms"]
+                    )
+        
+        analyses = []
+        for i, (content, tracker) in enumerate(items, 1):
+            analysis = by_id.get(i)
+            if analysis and analysis.get("key_insights"):
+                analyses.append(analysis)
+                continue
             
-            response_text = response.choices[0].message.content.strip()
-            
-            # Try to parse JSON
+            logger.warning(f"Document {i} missing from batched analysis, analyzing individually")
+            token = current_usage.set(tracker)
             try:
-                return json.loads(response_text)
-            except json.JSONDecodeError:
-                # Extract JSON from response
-                json_match = re.search(r'\{.*\}', response_text, re.DOTALL)
-                if json_match:
-                    return json.loads(json_match.group())
-                else:
-                    # Fallback
-                    return {
-                        "key_insights": ["Key insight 1", "Key insight 2", "Key insight 3"],
-                        "tone": "professional",
-                        "audience": "general audience",
-                        "content_type": "general"
-                    }
-        except Exception as e:
-            logger.error(f"Content analysis error: {e}")
-            return {
-                "key_insights": ["Key insight 1", "Key insight 2", "Key insight 3"],
-                "tone": "professional",
-                "audience": "general audience",
-                "content_type": "general"
-            }
+                analyses.append(await self._analyze_unbatched(content))
+            finally:
+                current_usage.reset(token)
+        
+        return analyses
+    
+    def _fallback_analysis(self) -> Dict[str, Any]:
+        """Generic analysis used when the model response is unusable"""
+        return {
+            "key_insights": ["Key insight 1", "Key insight 2", "Key insight 3"],
+            "tone": "professional",
+            "audience": "general audience",
+            "content_type": "general"
+        }
     
     async def generate_job_title(self, content: str, platforms: List[str]) -> str:
         """Generate a descriptive job title based on content and platforms"""
@@ -320,273 +921,87 @@ class SimpleJobProcessor:
         
         return title[:max_length]
     
-    async def generate_linkedin(self, content: str, analysis: Dict) -> Dict[str, Any]:
-        """Generate LinkedIn post"""
-        insights = analysis.get("key_insights", [])[:3]
-        
-        prompt = f"""
-        Create a professional LinkedIn post based on this content:
-        
-        Content: {content[:2000]}
-        Key insights: {', '.join(insights)}
-        Tone: {analysis.get('tone', 'professional')}
-        
-        Requirements:
-        - Maximum 1300 characters
-        - Professional tone
-        - Include 3-5 hashtags
-        - Include a call-to-action
-        - Engaging opening
-        
-        Return only JSON: {{"post": "text", "hashtags": ["#tag1", "#tag2"], "cta": "action"}}
+    async def generate_outputs(
+        self,
+        job_id: str,
+        platforms: List[str],
+        content: str,
+        analysis: Dict[str, Any]
+    ) -> Tuple[Dict[str, Any], Dict[str, Dict[str, Any]]]:
         """
-        
-        try:
-            response = self.client.chat.completions.create(
-                model=settings.GROQ_MODEL,
-                messages=[{"role": "user", "content": prompt}],
-                temperature=settings.GROQ_TEMPERATURE,
-                max_tokens=settings.GROQ_MAX_TOKENS
-            )
-            
-            response_text = response.choices[0].message.content.strip()
-            
-            try:
-                result = json.loads(response_text)
-            except json.JSONDecodeError:
-                json_match = re.search(r'\{.*\}', response_text, re.DOTALL)
-                if json_match:
-                    result = json.loads(json_match.group())
-                else:
-                    # Fallback
-                    post_text = f"Key insights: {'. '.join(insights[:2])}. What are your thoughts?"
-                    result = {
-                        "post": post_text,
-                        "hashtags": ["#business", "#insights", "#professional"],
-                        "cta": "Share your thoughts!"
-                    }
-            
-            result["character_count"] = len(result.get("post", ""))
-            return result
-            
-        except Exception as e:
-            logger.error(f"LinkedIn generation error: {e}")
-            post_text = f"Key insights: {'. '.join(insights[:2])}. What are your thoughts?"
-            return {
-                "post": post_text,
-                "hashtags": ["#business", "#insights"],
-                "cta": "Share your thoughts!",
-                "character_count": len(post_text)
-            }
-    
-    async def generate_twitter(self, content: str, analysis: Dict) -> Dict[str, Any]:
-        """Generate Twitter thread"""
-        insights = analysis.get("key_insights", [])[:4]
-        
-        prompt = f"""
-        Create a Twitter thread based on this content:
-        
-        Content: {content[:2000]}
-        Key insights: {', '.join(insights)}
-        
-        Requirements:
-        - 3-5 tweets
-        - Each tweet max 280 characters
-        - Engaging first tweet
-        - Include hashtags
-        
-        Return only JSON: {{"tweets": [{{"number": 1, "text": "tweet text", "char_count": 150}}]}}
+        Generate all platforms concurrently (bounded by PLATFORM_CONCURRENCY).
+        Returns (outputs, validation_results) keyed by platform.
         """
+        slots = asyncio.Semaphore(settings.PLATFORM_CONCURRENCY)
+        completed = 0
         
-        try:
-            response = self.client.chat.completions.create(
-                model=settings.GROQ_MODEL,
-                messages=[{"role": "user", "content": prompt}],
-                temperature=settings.GROQ_TEMPERATURE,
-                max_tokens=settings.GROQ_MAX_TOKENS
-            )
-            
-            response_text = response.choices[0].message.content.strip()
-            
-            try:
-                result = json.loads(response_text)
-            except json.JSONDecodeError:
-                json_match = re.search(r'\{.*\}', response_text, re.DOTALL)
-                if json_match:
-                    result = json.loads(json_match.group())
-                else:
-                    # Fallback
-                    tweets = []
-                    for i, insight in enumerate(insights[:3], 1):
-                        tweet_text = f"{i}/{len(insights[:3])} {insight}"
-                        tweets.append({
-                            "number": i,
-                            "text": tweet_text,
-                            "char_count": len(tweet_text)
-                        })
-                    result = {"tweets": tweets}
-            
-            # Ensure char counts
-            for tweet in result.get("tweets", []):
-                if "char_count" not in tweet:
-                    tweet["char_count"] = len(tweet.get("text", ""))
-            
+        async def generate(platform: str) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+            nonlocal completed
+            async with slots:
+                result = await self.generate_platform(platform, content, analysis)
+            completed += 1
+            await self.job_repo.update(UUID(job_id), {
+                "current_step": f"Generated {platform} content ({completed}/{len(platforms)})",
+                "progress_percentage": 30 + (completed * 40 // len(platforms))
+            })
             return result
-            
-        except Exception as e:
-            logger.error(f"Twitter generation error: {e}")
-            tweets = []
-            for i, insight in enumerate(insights[:3], 1):
-                tweet_text = f"{i}/3 {insight}"
-                tweets.append({
-                    "number": i,
-                    "text": tweet_text,
-                    "char_count": len(tweet_text)
-                })
-            return {"tweets": tweets}
-    
-    async def generate_blog(self, content: str, analysis: Dict) -> Dict[str, Any]:
-        """Generate blog post"""
-        insights = analysis.get("key_insights", [])
         
-        prompt = f"""
-        Create a blog post based on this content:
-        
-        Content: {content[:3000]}
-        Key insights: {', '.join(insights)}
-        Tone: {analysis.get('tone', 'professional')}
-        
-        Requirements:
-        - 500-700 words
-        - SEO title
-        - Meta description (150 chars)
-        - Clear structure
+        await self.job_repo.update(UUID(job_id), {
+            "current_step": f"Generating content for {', '.join(platforms)}",
+            "progress_percentage": 30
+        })
+        results = await asyncio.gather(*(generate(platform) for platform in platforms))
         
-        Return only JSON: {{"title": "title", "content": "blog content", "meta_description": "desc", "word_count": 600}}
+        outputs = {platform: output for platform, (output, _) in zip(platforms, results)}
+        validation = {platform: checks for platform, (_, checks) in zip(platforms, results)}
+        return outputs, validation
+    
+    async def generate_platform(
+        self,
+        platform: str,
+        content: str,
+        analysis: Dict[str, Any]
+    ) -> Tuple[Dict[str, Any], Dict[str, Any]]:
         """
-        
-        try:
-            response = self.client.chat.completions.create(
-                model=settings.GROQ_MODEL,
-                messages=[{"role": "user", "content": prompt}],
-                temperature=settings.GROQ_TEMPERATURE,
-                max_tokens=settings.GROQ_MAX_TOKENS
-            )
-            
-            response_text = response.choices[0].message.content.strip()
-            
-            try:
-                result = json.loads(response_text)
-            except json.JSONDecodeError:
-                json_match = re.search(r'\{.*\}', response_text, re.DOTALL)
-                if json_match:
-                    result = json.loads(json_match.group())
-                else:
-                    # Fallback
-                    blog_content = f"# Key Insights\n\n{chr(10).join([f'- {insight}' for insight in insights])}\n\nThese insights provide valuable perspective on the topic."
-                    result = {
-                        "title": "Key Insights and Analysis",
-                        "content": blog_content,
-                        "meta_description": "Discover key insights and analysis on this important topic.",
-                        "word_count": len(blog_content.split())
-                    }
-            
-            if "word_count" not in result:
-                result["word_count"] = len(result.get("content", "").split())
-            
-            return result
-            
-        except Exception as e:
-            logger.error(f"Blog generation error: {e}")
-            blog_content = f"# Key Insights\n\n{chr(10).join([f'- {insight}' for insight in insights])}"
-            return {
-                "title": "Key Insights",
-                "content": blog_content,
-                "meta_description": "Key insights and analysis.",
-                "word_count": len(blog_content.split())
-            }
-    
-    async def generate_email(self, content: str, analysis: Dict) -> Dict[str, Any]:
-        """Generate email sequence"""
-        insights = analysis.get("key_insights", [])
-        
-        prompt = f"""
-        Create a 3-email sequence based on this content:
-        
-        Content: {content[:2000]}
-        Key insights: {', '.join(insights)}
-        
-        Requirements:
-        - 3 emails with subjects and content
-        - Email 1: Introduction (200-300 words)
-        - Email 2: Main content (300-400 words)
-        - Email 3: Call-to-action (200-300 words)
-        
-        Return only JSON: {{"emails": [{{"number": 1, "subject": "subject", "content": "email content", "word_count": 250}}]}}
+        Generate one platform's output from its registry entry.
+        Returns (output, validation_results); falls back on any failure.
         """
+        spec = get_platform(platform)
+        insights = spec.insights(analysis)
         
         try:
-            response = self.client.chat.completions.create(
-                model=settings.GROQ_MODEL,
-                messages=[{"role": "user", "content": prompt}],
-                temperature=settings.GROQ_TEMPERATURE,
-                max_tokens=settings.GROQ_MAX_TOKENS
+            response_text = await self.llm.complete(
+                spec.build_prompt(content, analysis),
+                max_tokens=min(spec.max_tokens, settings.GROQ_MAX_TOKENS),
+                stage=platform
             )
+            result = parse_json_response(response_text)
+            errors = spec.validate(result) if result is not None else ["response is not valid JSON"]
             
-            response_text = response.choices[0].message.content.strip()
-            
-            try:
-                result = json.loads(response_text)
-            except json.JSONDecodeError:
-                json_match = re.search(r'\{.*\}', response_text, re.DOTALL)
-                if json_match:
-                    result = json.loads(json_match.group())
-                else:
-                    # Fallback
-                    emails = [
-                        {
-                            "number": 1,
-                            "subject": "Introduction to Key Insights",
-                            "content": f"Hello! I wanted to share some key insights: {insights[0] if insights else 'Important information'}",
-                            "word_count": 50
-                        },
-                        {
-                            "number": 2,
-                            "subject": "Deep Dive Analysis",
-                            "content": f"Let's explore further: {'. '.join(insights[:2])}",
-                            "word_count": 75
-                        },
-                        {
-                            "number": 3,
-                            "subject": "Take Action",
-                            "content": "Ready to implement these insights? Let's connect and discuss next steps.",
-                            "word_count": 40
-                        }
-                    ]
-                    result = {"emails": emails}
-            
-            # Ensure word counts
-            for email in result.get("emails", []):
-                if "word_count" not in email:
-                    email["word_count"] = len(email.get("content", "").split())
-            
-            return result
+            if not errors:
+                if spec.normalize:
+                    result = spec.normalize(result)
+                return result, {"status": "generated"}
             
+            logger.warning(f"{platform} output invalid ({'; '.join(errors)}), using fallback")
+        
         except Exception as e:
-            logger.error(f"Email generation error: {e}")
-            return {
-                "emails": [
-                    {
-                        "number": 1,
-                        "subject": "Key Insights",
-                        "content": f"Key insight: {insights[0] if insights else 'Important information'}",
-                        "word_count": 20
-                    }
-                ]
-            }
+            logger.error(f"{platform} generation error: {e}")
+            errors = [str(e)]
+        
+        return spec.fallback(insights), {"status": "fallback", "errors": errors}
     
-    async def save_outputs(self, job: Dict[str, Any], content: Dict[str, Any], outputs: Dict[str, Any]):
+    async def save_outputs(
+        self,
+        job: Dict[str, Any],
+        content: Dict[str, Any],
+        outputs: Dict[str, Any],
+        output_metadata: Optional[Dict[str, Dict[str, Any]]] = None,
+        validation: Optional[Dict[str, Dict[str, Any]]] = None
+    ):
         """Save generated outputs to database"""
+        output_metadata = output_metadata or {}
+        validation = validation or {}
         job_id = job["id"]
         content_id = content["id"]
         user_id = job["user_id"]
@@ -605,10 +1020,11 @@ class SimpleJobProcessor:
                         "platform": platform,
                         "content": output,
                         "quality_score": quality_score,
-                        "validation_results": {"status": "generated"},
+                        "validation_results": validation.get(platform, {"status": "generated"}),
                         "generation_metadata": {
                             "processor": "simple_groq",
-                            "model": settings.GROQ_MODEL
+                            "model": settings.model_for(platform),
+                            **output_metadata.get(platform, {})
                         }
                     })
                     
@@ -617,33 +1033,49 @@ class SimpleJobProcessor:
                 except Exception as e:
                     logger.error(f"Error saving {platform} output: {e}")
     
+    @staticmethod
+    def _reused_output_metadata(output: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Generation metadata for a reused output: where it came from and the
+        model that actually wrote it, which may no longer be the one
+        settings.model_for routes the platform to
+        """
+        metadata = {
+            "reused_from_output": output["id"],
+            "reused_from_job": output["job_id"]
+        }
+        model = (output.get("generation_metadata") or {}).get("model")
+        if model:
+            metadata["model"] = model
+        return metadata
+    
     def _calculate_quality_score(self, output: Dict[str, Any], platform: str) -> float:
         """Calculate quality score for output"""
         score = 1.0
         
         # Basic completeness check
-        required_fields = {
-            "linkedin": ["post", "hashtags"],
-            "twitter": ["tweets"],
-            "blog": ["title", "content"],
-            "email": ["emails"]
-        }
+        spec = get_platform(platform)
+        required_fields = spec.required_fields if spec else []
         
-        for field in required_fields.get(platform, []):
+        for field in required_fields:
             if field not in output or not output[field]:
                 score -= 0.2
         
         return max(0.0, min(1.0, score))
     
-    async def mark_job_failed(self, job_id: str, error_message: str):
-        """Mark job as failed"""
+    async def mark_job_failed(self, job_id: str, error_message: str, stage: Optional[str] = None):
+        """Mark job as failed, recording the failed stage if known"""
+        update = {
+            "status": "failed",
+            "completed_at": datetime.utcnow().isoformat(),
+            "error_message": error_message,
+            "progress_percentage": 0
+        }
+        if stage:
+            update["current_step"] = f"{stage.capitalize()} failed"
+            update["error_details"] = {"stage": stage}
         try:
-            await self.job_repo.update(UUID(job_id), {
-                "status": "failed",
-                "completed_at": datetime.utcnow().isoformat(),
-                "error_message": error_message,
-                "progress_percentage": 0
-            })
+            await self.job_repo.update(UUID(job_id), update)
         except Exception as e:
             logger.error(f"Error marking job as failed: {e}")
 
@@ -652,6 +1084,24 @@ class SimpleJobProcessor:
 simple_job_processor = SimpleJobProcessor()
 
 
+def _keep_prior_wording(analysis: Dict[str, Any], prior: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Use the previous analysis's exact wording for insights and fields the
+    LLM only restyled (case, spacing, punctuation), so they don't count as
+    changed inputs for the platforms
+    """
+    def key(value: Any) -> str:
+        return normalize_text(str(value)).casefold().strip(" .!")
+    
+    prior_insights = {key(insight): insight for insight in prior.get("key_insights") or []}
+    result = dict(analysis)
+    result["key_insights"] = [prior_insights.get(key(insight), insight) for insight in analysis.get("key_insights") or []]
+    for field in ("tone", "audience", "content_type"):
+        if field in prior and field in result and key(result[field]) == key(prior[field]):
+            result[field] = prior[field]
+    return result
+
+
 async def start_simple_job_processor():
     """Start the simple job processor"""
     await simple_job_processor.start()
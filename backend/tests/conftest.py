@@ -0,0 +1,18 @@
+"""
+Shared test setup: import the app's modules from backend/ with placeholder
+settings, so tests never need a real .env
+"""
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+for name, value in {
+    "SECRET_KEY": "test-secret-key-test-secret-key-test-secret",
+    "SUPABASE_URL": "http://localhost:54321",
+    "SUPABASE_KEY": "test",
+    "SUPABASE_SERVICE_KEY": "test",
+    "SUPABASE_JWT_SECRET": "test",
+    "GROQ_API_KEY": "test",
+}.items():
+    os.environ.setdefault(name, value)
@@ -0,0 +1,77 @@
+"""
+BulkImporter: failed batches leave no content behind, unknown platforms stop the import
+"""
+import asyncio
+from uuid import uuid4
+
+from services.bulk_import import BulkImporter
+
+
+class FakeContentRepo:
+    def __init__(self):
+        self.rows = {}
+    
+    async def create_many(self, records):
+        created = [{**record, "id": str(uuid4())} for record in records]
+        self.rows.update((row["id"], row) for row in created)
+        return created
+    
+    async def delete_many(self, ids):
+        for id in ids:
+            self.rows.pop(id, None)
+        return len(ids)
+
+
+class FailingJobRepo:
+    async def create_many(self, records):
+        raise RuntimeError("insert failed")
+
+
+class FakeImportRepo:
+    def __init__(self):
+        self.updates = []
+    
+    async def update(self, id, data):
+        self.updates.append(data)
+        return data
+
+
+def importer(content_repo=None, job_repo=None, import_repo=None) -> BulkImporter:
+    bulk = BulkImporter.__new__(BulkImporter)
+    bulk.content_repo = content_repo or FakeContentRepo()
+    bulk.job_repo = job_repo or FailingJobRepo()
+    bulk.import_repo = import_repo or FakeImportRepo()
+    bulk._tasks = {}
+    return bulk
+
+
+def test_failed_job_insert_removes_batch_content():
+    content_repo = FakeContentRepo()
+    bulk = importer(content_repo=content_repo)
+    record = {"id": str(uuid4()), "user_id": str(uuid4()), "platforms": ["linkedin"]}
+    batch = [(f"https://example.com/{i}", {"title": f"Post {i}", "text": f"Body {i}"}) for i in range(3)]
+    counts = {"created_entries": 0, "failed_entries": 0}
+    errors = []
+    
+    asyncio.run(bulk._store_batch(record, batch, counts, errors))
+    
+    assert content_repo.rows == {}
+    assert counts == {"created_entries": 0, "failed_entries": 3}
+    assert [error["url"] for error in errors] == [url for url, _ in batch]
+
+
+def test_unknown_platform_fails_import_before_discovery():
+    import_repo = FakeImportRepo()
+    bulk = importer(import_repo=import_repo)
+    
+    async def discover(*args):
+        raise AssertionError("discovery should not run")
+    bulk.discover = discover
+    
+    asyncio.run(bulk.run({
+        "id": str(uuid4()), "user_id": str(uuid4()), "source_url": "https://example.com/sitemap.xml",
+        "platforms": ["linkedin", "linkdin"], "max_entries": 10
+    }))
+    
+    assert import_repo.updates[-1]["status"] == "failed"
+    assert "linkdin" in import_repo.updates[-1]["error_message"]
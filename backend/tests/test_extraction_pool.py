@@ -0,0 +1,55 @@
+"""
+SandboxPool: blocking process management stays off the event loop, and
+workers that ran out of memory are not reused
+"""
+import asyncio
+import time
+
+import pytest
+
+from services.extraction.pool import SandboxPool
+
+
+class SlowToDie:
+    """A worker whose kill() blocks like a join on a stuck process"""
+    
+    def __init__(self):
+        self.killed = False
+    
+    def kill(self):
+        time.sleep(0.3)
+        self.killed = True
+
+
+def test_discard_does_not_block_the_loop():
+    async def main():
+        pool = SandboxPool(workers=1, memory_bytes=0, cpu_seconds=0, max_tasks_per_worker=0)
+        worker = SlowToDie()
+        ticks = 0
+        
+        async def ticker():
+            nonlocal ticks
+            while not worker.killed:
+                ticks += 1
+                await asyncio.sleep(0.01)
+        
+        await asyncio.gather(pool._discard(worker), ticker())
+        pool.shutdown()
+        return ticks
+    
+    assert asyncio.run(main()) > 5
+
+
+def test_worker_out_of_memory_is_discarded():
+    async def main():
+        pool = SandboxPool(workers=1, memory_bytes=512 * 1024 * 1024, cpu_seconds=0, max_tasks_per_worker=0)
+        try:
+            with pytest.raises(MemoryError):
+                await pool.run(bytearray, (4 * 1024 * 1024 * 1024,), 30)
+            return pool.get_stats()
+        finally:
+            pool.shutdown()
+    
+    stats = asyncio.run(main())
+    assert stats["idle"] == 0
+    assert stats["replaced"] == 1
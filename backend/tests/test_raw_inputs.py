@@ -0,0 +1,74 @@
+"""
+Raw inputs: kept after transient extraction failures, removed after permanent ones and by the sweep
+"""
+import asyncio
+import os
+import time
+import uuid
+
+import pytest
+
+import services.extraction as extraction
+from services.extraction import RawInputStore, WorkerDiedError
+from services.simple_job_processor import SimpleJobProcessor, StageError
+
+
+class FakeRepo:
+    def __init__(self):
+        self.rows = {}
+    
+    async def update(self, id, data):
+        self.rows.setdefault(str(id), {}).update(data)
+        return self.rows[str(id)]
+
+
+@pytest.fixture
+def store(tmp_path, monkeypatch):
+    store = RawInputStore(str(tmp_path))
+    monkeypatch.setattr(extraction, "raw_inputs", store)
+    return store
+
+
+def stored_upload(store: RawInputStore) -> str:
+    key = store.new_key(str(uuid.uuid4()), "report.pdf")
+    path = store.path(key)
+    os.makedirs(os.path.dirname(path))
+    with open(path, "wb") as f:
+        f.write(b"%PDF-1.7")
+    return key
+
+
+def run_extraction(store, monkeypatch, error: Exception) -> str:
+    async def failing_extract(*args, **kwargs):
+        raise error
+    monkeypatch.setattr(extraction, "extract_content_from_file", failing_extract)
+    
+    processor = SimpleJobProcessor()
+    processor.job_repo = FakeRepo()
+    processor.content_repo = FakeRepo()
+    key = stored_upload(store)
+    content = {"id": str(uuid.uuid4()), "source_type": "pdf", "file_path": key, "metadata": {}}
+    
+    with pytest.raises(StageError):
+        asyncio.run(processor.extract_content({"id": str(uuid.uuid4())}, content))
+    return store.path(key)
+
+
+@pytest.mark.parametrize("error", [TimeoutError("timed out"), WorkerDiedError("worker crashed")])
+def test_transient_failure_keeps_upload(store, monkeypatch, error):
+    assert os.path.exists(run_extraction(store, monkeypatch, error))
+
+
+def test_permanent_failure_removes_upload(store, monkeypatch):
+    assert not os.path.exists(run_extraction(store, monkeypatch, ValueError("Not a PDF")))
+
+
+def test_sweep_removes_only_expired_inputs(store):
+    old, new = stored_upload(store), stored_upload(store)
+    expired = time.time() - 7200
+    os.utime(store.path(old), (expired, expired))
+    os.utime(os.path.dirname(store.path(old)), (expired, expired))
+    
+    assert store.sweep(3600) == 1
+    assert not os.path.exists(os.path.dirname(store.path(old)))
+    assert os.path.exists(store.path(new))
@@ -0,0 +1,188 @@
+"""
+Revisions: re-analysis and regeneration limited to what a one-section edit changes,
+and reused outputs keep their provenance
+"""
+import asyncio
+import json
+import uuid
+
+import pytest
+
+from core.config import settings
+from services.dedup import compute_content_hash, split_sections
+from services.simple_job_processor import SimpleJobProcessor
+
+PLATFORMS = ["linkedin", "twitter", "blog"]
+INSIGHTS = ["Plans written down get followed", "Short meetings work", "Owners post updates first"]
+
+
+class FakeRepo:
+    """In-memory stand-in for the repositories the processor uses"""
+    
+    def __init__(self):
+        self.rows = {}
+    
+    async def create(self, data):
+        row = dict(data, id=str(uuid.uuid4()))
+        self.rows[row["id"]] = row
+        return row
+    
+    async def get_by_id(self, id):
+        return self.rows.get(str(id))
+    
+    async def update(self, id, data):
+        self.rows.setdefault(str(id), {}).update(data)
+        return self.rows[str(id)]
+    
+    async def get_by_hash(self, *args, **kwargs):
+        return []
+    
+    async def get_analyzed_by_bands(self, *args, **kwargs):
+        return []
+    
+    async def get_by_content(self, content_id):
+        return [row for row in self.rows.values() if row.get("content_id") == str(content_id)]
+    
+    async def get_by_job(self, job_id):
+        return [row for row in self.rows.values() if row.get("job_id") == str(job_id)]
+    
+    async def get_completed_by_contents(self, content_ids, limit=20):
+        ids = {str(i) for i in content_ids}
+        return [row for row in self.rows.values() if row.get("content_id") in ids and row.get("status") == "completed"]
+    
+    async def create_many(self, records):
+        return records
+
+
+class FakeLLM:
+    """Answers analysis, revision and platform prompts; revisions restyle the prior insights"""
+    
+    def __init__(self):
+        self.stages = []
+    
+    async def complete(self, prompt, stage="default", **kwargs):
+        self.stages.append(stage)
+        if stage == "analysis" and "new revision" in prompt:
+            return json.dumps({"key_insights": [i.lower() + "." for i in INSIGHTS], "tone": "Professional"})
+        if stage == "analysis":
+            return json.dumps({"key_insights": INSIGHTS, "tone": "professional"})
+        if stage == "linkedin":
+            return json.dumps({"post": f"post {len(self.stages)}", "hashtags": ["#plans"]})
+        if stage == "twitter":
+            return json.dumps({"tweets": [{"number": 1, "text": f"tweet {len(self.stages)}"}]})
+        return json.dumps({"title": "Plans", "content": f"blog {len(self.stages)}"})
+    
+    def get_stats(self):
+        return {}
+
+
+def paragraph(part: int, index: int, edit: str = "") -> str:
+    return (
+        f"Part {part}, note {index}{edit}: teams that wrote their goals down before planning, "
+        f"shared them with every owner and reviewed them weekly saw fewer surprises, "
+        f"clearer priorities and meetings that ended on time, which is why part {part} matters."
+    ) * 2
+
+
+def document(edited_part: int = -1) -> str:
+    blocks = []
+    for part in range(8):
+        blocks.append(f"## Part {part}")
+        blocks += [paragraph(part, i, " (revised)" if part == edited_part and i == 0 else "") for i in range(2)]
+    return "\n\n".join(blocks)
+
+
+@pytest.fixture
+def processor():
+    processor = SimpleJobProcessor()
+    processor.job_repo = FakeRepo()
+    processor.content_repo = FakeRepo()
+    processor.output_repo = FakeRepo()
+    processor.usage_repo = FakeRepo()
+    processor.llm = FakeLLM()
+    return processor
+
+
+async def submit(processor, text, previous=None, regenerate="all"):
+    content = await processor.content_repo.create({
+        "user_id": str(uuid.uuid4()),
+        "original_text": text,
+        "content_hash": compute_content_hash(text),
+        "sections": split_sections(text),
+        "previous_revision_id": previous["id"] if previous else None
+    })
+    job = await processor.job_repo.create({
+        "content_id": content["id"],
+        "user_id": content["user_id"],
+        "platforms": PLATFORMS,
+        "user_preferences": {},
+        "regenerate": regenerate,
+        "status": "pending"
+    })
+    processor.llm.stages = []
+    await processor.process_job(dict(job))
+    assert processor.job_repo.rows[job["id"]]["status"] == "completed"
+    
+    outputs = {o["platform"]: o for o in await processor.output_repo.get_by_job(job["id"])}
+    return content, outputs
+
+
+def section_start(text: str, part: int) -> int:
+    return next(s["start"] for s in split_sections(text) if s["heading"] == f"Part {part}")
+
+
+def test_edit_between_platform_windows_reuses_unaffected_platforms(processor):
+    # Part 3 starts past the 2000 characters LinkedIn and Twitter read, within the blog's 3000
+    assert 2000 < section_start(document(), 3) < 3000
+    
+    async def run():
+        v1, _ = await submit(processor, document())
+        _, outputs = await submit(processor, document(edited_part=3), previous=v1, regenerate="changed")
+        return outputs
+    
+    outputs = asyncio.run(run())
+    assert processor.llm.stages == ["analysis", "blog"]
+    assert "reused_from_output" in outputs["linkedin"]["generation_metadata"]
+    assert "reused_from_output" in outputs["twitter"]["generation_metadata"]
+    assert "reused_from_output" not in outputs["blog"]["generation_metadata"]
+
+
+def test_edit_beyond_every_window_keeps_analysis_and_outputs(processor):
+    assert section_start(document(), 5) > 3000
+    
+    async def run():
+        v1, _ = await submit(processor, document())
+        v2, outputs = await submit(processor, document(edited_part=5), previous=v1, regenerate="changed")
+        return v1, v2, outputs
+    
+    v1, v2, outputs = asyncio.run(run())
+    assert processor.llm.stages == []
+    assert processor.content_repo.rows[v2["id"]]["analysis"] == processor.content_repo.rows[v1["id"]]["analysis"]
+    assert all("reused_from_output" in o["generation_metadata"] for o in outputs.values())
+
+
+def test_regenerate_all_regenerates_every_platform(processor):
+    async def run():
+        v1, _ = await submit(processor, document())
+        await submit(processor, document(edited_part=5), previous=v1)
+    
+    asyncio.run(run())
+    assert sorted(processor.llm.stages) == sorted(PLATFORMS)
+
+
+def test_reused_output_keeps_the_model_that_wrote_it(processor, monkeypatch):
+    async def run():
+        v1, outputs = await submit(processor, document())
+        monkeypatch.setitem(settings.LLM_MODEL_ROUTES, "linkedin", "rerouted-model")
+        source = outputs["linkedin"]
+        await processor.save_outputs(
+            {"id": str(uuid.uuid4()), "user_id": v1["user_id"]},
+            v1,
+            {"linkedin": source["content"]},
+            {"linkedin": processor._reused_output_metadata(source)}
+        )
+        return source
+    
+    source = asyncio.run(run())
+    reused = [o for o in processor.output_repo.rows.values() if o["generation_metadata"].get("reused_from_output")]
+    assert reused[0]["generation_metadata"]["model"] == source["generation_metadata"]["model"] != "rerouted-model"
@@ -0,0 +1,73 @@
+"""
+SingleFlight: collapsing concurrent calls and surviving a cancelled leader
+"""
+import asyncio
+
+import pytest
+
+from services.llm import SingleFlight
+
+
+def test_concurrent_calls_share_one_upstream_call():
+    async def run():
+        flight = SingleFlight()
+        calls = 0
+        
+        async def fn():
+            nonlocal calls
+            calls += 1
+            await asyncio.sleep(0.01)
+            return "result"
+        
+        results = await asyncio.gather(*(flight.do("key", fn) for _ in range(5)))
+        return results, calls, flight.get_stats()
+    
+    results, calls, stats = asyncio.run(run())
+    assert results == ["result"] * 5
+    assert calls == 1
+    assert stats["collapsed_calls"] == 4
+    assert stats["in_flight"] == 0
+
+
+def test_leader_cancellation_reelects_a_follower():
+    async def run():
+        flight = SingleFlight()
+        calls = 0
+        
+        async def fn():
+            nonlocal calls
+            calls += 1
+            await asyncio.sleep(0.05)
+            return f"call {calls}"
+        
+        leader = asyncio.create_task(flight.do("key", fn))
+        await asyncio.sleep(0)
+        followers = [asyncio.create_task(flight.do("key", fn)) for _ in range(3)]
+        await asyncio.sleep(0.01)
+        
+        leader.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await leader
+        
+        results = await asyncio.gather(*followers)
+        return results, calls, flight.get_stats()
+    
+    results, calls, stats = asyncio.run(run())
+    # One follower became the leader and the others joined its call
+    assert results == ["call 2"] * 3
+    assert calls == 2
+    assert stats["in_flight"] == 0
+
+
+def test_leader_exception_reaches_followers():
+    async def run():
+        flight = SingleFlight()
+        
+        async def fn():
+            await asyncio.sleep(0.01)
+            raise ValueError("upstream failed")
+        
+        return await asyncio.gather(*(flight.do("key", fn) for _ in range(3)), return_exceptions=True)
+    
+    results = asyncio.run(run())
+    assert all(isinstance(r, ValueError) for r in results)
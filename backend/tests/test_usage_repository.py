@@ -0,0 +1,53 @@
+"""
+UsageRepository: totals come from the llm_usage_totals function, not raw rows
+"""
+import asyncio
+from datetime import datetime
+from types import SimpleNamespace
+from uuid import uuid4
+
+from db.repositories import UsageRepository
+
+
+class FakeClient:
+    """Records RPC calls and answers them with canned rows"""
+    
+    def __init__(self, rows):
+        self.rows = rows
+        self.rpcs = []
+    
+    def table(self, name):
+        return None
+    
+    def rpc(self, name, params):
+        self.rpcs.append((name, params))
+        return SimpleNamespace(execute=lambda: SimpleNamespace(data=self.rows))
+
+
+def test_tokens_since_uses_database_aggregate():
+    client = FakeClient([{
+        "group_key": None, "calls": 5000, "prompt_tokens": 900000,
+        "completion_tokens": 100000, "total_tokens": 1000000, "latency_ms": 12
+    }])
+    used = asyncio.run(UsageRepository(client).get_tokens_since(uuid4(), datetime(2026, 1, 1)))
+    
+    assert used == 1000000
+    name, params = client.rpcs[0]
+    assert name == "llm_usage_totals"
+    assert params["p_group_by"] is None
+
+
+def test_totals_without_usage_are_zero():
+    totals = asyncio.run(UsageRepository(FakeClient([])).get_totals(uuid4(), datetime(2026, 1, 1)))
+    assert totals == {"calls": 0, "prompt_tokens": 0, "completion_tokens": 0, "total_tokens": 0, "latency_ms": 0}
+
+
+def test_grouped_totals_keep_database_order():
+    client = FakeClient([
+        {"group_key": "blog", "calls": 2, "prompt_tokens": 10, "completion_tokens": 5, "total_tokens": 15, "latency_ms": 1},
+        {"group_key": "analysis", "calls": 1, "prompt_tokens": 4, "completion_tokens": 1, "total_tokens": 5, "latency_ms": 1},
+    ])
+    by_stage = asyncio.run(UsageRepository(client).get_grouped_totals(uuid4(), datetime(2026, 1, 1), "stage"))
+    
+    assert list(by_stage) == ["blog", "analysis"]
+    assert by_stage["blog"]["total_tokens"] == 15
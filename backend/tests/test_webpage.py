@@ -0,0 +1,39 @@
+"""
+parse_html: pages wrapped in <form> and unknown server charsets
+"""
+from services.extraction.webpage import parse_html
+
+ARTICLE = "".join(
+    f"<p>Paragraph {i} explains, in some detail, why the quarterly plan changed and what teams should do next.</p>"
+    for i in range(6)
+)
+
+
+def test_page_wrapped_in_form_keeps_its_content():
+    html = f"""<html><head><title>WebForms page</title></head><body>
+    <form id="aspnetForm" method="post" action="./page.aspx">
+      <input type="hidden" name="__VIEWSTATE" value="abc">
+      <div id="content">{ARTICLE}</div>
+    </form></body></html>""".encode()
+    
+    result = parse_html(html, "utf-8", "https://example.com/page.aspx")
+    assert result["title"] == "WebForms page"
+    assert "Paragraph 5 explains" in result["text"]
+
+
+def test_small_control_forms_are_dropped():
+    html = f"""<html><body>
+    <form action="/search"><input name="q"><button>Search the site</button></form>
+    <article>{ARTICLE}</article></body></html>""".encode()
+    
+    result = parse_html(html, None, "https://example.com/")
+    assert "Search the site" not in result["text"]
+    assert "Paragraph 0 explains" in result["text"]
+
+
+def test_unknown_charset_falls_back_to_sniffing():
+    html = f"<html><head><meta charset='utf-8'><title>Café</title></head><body>{ARTICLE}</body></html>".encode()
+    
+    result = parse_html(html, "x-bogus", "https://example.com/")
+    assert result["title"] == "Café"
+    assert "Paragraph 3 explains" in result["text"]